@@ -0,0 +1 @@
+"""Benchmarks for jiragen. Run individual modules with ``python -m``."""
@@ -0,0 +1,129 @@
+"""Benchmark the BM25 lexical path used by hybrid retrieval.
+
+Indexes a synthetic corpus of code-like chunks (Zipf-distributed vocabulary
+plus unique identifiers and ticket keys) and reports the latency of
+lexical search and reciprocal rank fusion, i.e. what hybrid retrieval adds
+on top of the dense query.
+
+Usage:
+    python -m benchmarks.bench_lexical [--chunks 100000] [--queries 500]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from jiragen.services.lexical import BM25Index
+from jiragen.services.retrieval import reciprocal_rank_fusion
+
+VOCABULARY_SIZE = 20000
+WORDS_PER_CHUNK = 120
+
+
+def make_corpus(n_chunks: int, seed: int = 0):
+    """Return ``(doc_id, text)`` pairs and the identifiers of every chunk."""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(VOCABULARY_SIZE)]
+    cum_weights = list(
+        accumulate(1.0 / (rank + 1) for rank in range(VOCABULARY_SIZE))
+    )
+    identifiers = []
+    documents = []
+    for i in range(n_chunks):
+        identifier = f"handle_event_{i}"
+        ticket = f"PROJ-{i}"
+        words = rng.choices(
+            vocabulary, cum_weights=cum_weights, k=WORDS_PER_CHUNK
+        )
+        documents.append(
+            (
+                f"chunk-{i}",
+                f"def {identifier}(): # {ticket}\n" + " ".join(words),
+            )
+        )
+        identifiers.append((identifier, ticket))
+    return documents, identifiers
+
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(np.asarray(values) * 1000, q))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+    logger.remove()
+
+    documents, identifiers = make_corpus(args.chunks)
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = BM25Index(Path(tmp) / "bench.lexical.sqlite")
+
+        start = time.perf_counter()
+        for offset in range(0, len(documents), 1000):
+            index.add_many(documents[offset : offset + 1000])
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = BM25Index(Path(tmp) / "bench.lexical.sqlite")
+        load_seconds = time.perf_counter() - start
+        assert len(reopened) == len(index)
+        reopened.close()
+
+        search_times, fusion_times, hits = [], [], 0
+        for _ in range(args.queries):
+            target = rng.randrange(args.chunks)
+            identifier, ticket = identifiers[target]
+            query = (
+                f"Fix crash in {identifier} reported in {ticket} "
+                f"word{rng.randrange(200)} word{rng.randrange(5000)}"
+            )
+            start = time.perf_counter()
+            results = index.search(query, k=args.k)
+            search_times.append(time.perf_counter() - start)
+
+            dense_ids = [
+                f"chunk-{rng.randrange(args.chunks)}" for _ in range(args.k)
+            ]
+            start = time.perf_counter()
+            reciprocal_rank_fusion([dense_ids, [d for d, _ in results]])
+            fusion_times.append(time.perf_counter() - start)
+
+            hits += bool(results) and results[0][0] == f"chunk-{target}"
+
+    print(
+        json.dumps(
+            {
+                "chunks": args.chunks,
+                "queries": args.queries,
+                "build_seconds": build_seconds,
+                "load_seconds": load_seconds,
+                "search_ms": {
+                    "p50": percentile(search_times, 50),
+                    "p95": percentile(search_times, 95),
+                    "p99": percentile(search_times, 99),
+                },
+                "fusion_ms": {
+                    "p50": percentile(fusion_times, 50),
+                    "p99": percentile(fusion_times, 99),
+                },
+                "identifier_hit_rate": hits / args.queries,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Accuracy and latency of local metadata prediction against the LLM path.
+
+Writes a synthetic JIRA history in the layout ``jiragen fetch`` produces:
+markdown tickets with JSON sidecars whose type, priority, labels, components
+and story points follow from the ticket's wording, with some label noise.
+The training tickets are indexed through ``VectorStoreService``; held-out
+tickets are then classified by ``MetadataPredictor`` and, with ``--llm``, by
+``IssueMetadataExtractor`` for comparison.
+
+Usage:
+    python -m benchmarks.bench_metadata [--tickets 2000] [--test 200]
+        [--k 15] [--threshold 0.6] [--llm openai/gpt-4o-mini]
+        [--output results.json]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from loguru import logger
+
+from benchmarks.bench_retrieval import FILLER, percentiles
+from jiragen.core.generator import LLMConfig
+from jiragen.core.metadata import IssueMetadataExtractor, parse_metadata
+from jiragen.core.predictor import PREDICTED_FIELDS, MetadataPredictor
+from jiragen.services.embeddings import HASHING_MODEL_NAME
+from jiragen.services.vector_store import VectorStoreService
+
+ADD_BATCH_SIZE = 64
+NOISE = 0.1  # Share of fields replaced by a random value
+
+# Each area decides the component and labels, each kind the issue type
+AREAS = {
+    "checkout": ("Payments", ["backend", "billing"]),
+    "login": ("Auth", ["backend", "security"]),
+    "dashboard": ("UI", ["frontend"]),
+    "report": ("Reporting", ["backend", "data"]),
+    "upload": ("Storage", ["backend"]),
+    "settings": ("UI", ["frontend", "ux"]),
+    "search": ("Search", ["backend", "performance"]),
+    "notification": ("Messaging", ["backend"]),
+}
+KINDS = {
+    "Bug": ["crashes when", "returns an error for", "shows wrong totals in"],
+    "Story": ["should support", "needs a new view for", "lets users export"],
+    "Task": ["upgrade the library behind", "clean up logging in"],
+}
+SEVERITY = {
+    "Highest": "in production for every customer",
+    "High": "for enterprise customers",
+    "Medium": "",
+    "Low": "as a minor polish item",
+}
+SIZES = {1: "trivial change", 3: "small change", 5: "", 8: "large rework"}
+
+
+class ServiceStore:
+    """Exposes an in-process service as a ``VectorStoreClient``."""
+
+    def __init__(self, service: VectorStoreService, collection: str):
+        self.service = service
+        self.collection = collection
+
+    def query_similar(self, text, n_results=5, embedding=None, where=None):
+        params = {
+            "collection_name": self.collection,
+            "text": text,
+            "n_results": n_results,
+            "where": where,
+        }
+        if embedding is not None:
+            params["embedding"] = embedding
+        return self.service.handle_query_similar(params)["data"]
+
+
+def make_ticket(key: str, rng: random.Random) -> Dict:
+    """Return a ticket whose fields follow from its text, with some noise."""
+    area = rng.choice(list(AREAS))
+    issue_type = rng.choice(list(KINDS))
+    priority = rng.choice(list(SEVERITY))
+    story_points = rng.choice(list(SIZES))
+    component, labels = AREAS[area]
+    summary = (
+        f"{area.title()} {rng.choice(KINDS[issue_type])} "
+        f"{rng.choice(FILLER)} {SEVERITY[priority]} {SIZES[story_points]}"
+    ).strip()
+    fields = {
+        "issue_type": issue_type,
+        "priority": priority,
+        "labels": list(labels),
+        "components": [component],
+        "story_points": story_points,
+    }
+    # Real trackers are inconsistent, so some fields disagree with the text
+    if rng.random() < NOISE:
+        fields["issue_type"] = rng.choice(list(KINDS))
+    if rng.random() < NOISE:
+        fields["priority"] = rng.choice(list(SEVERITY))
+    if rng.random() < NOISE:
+        fields["story_points"] = rng.choice(list(SIZES))
+    description = (
+        f"{summary}. Seen in the {area} {component.lower()} area. "
+        + " ".join(rng.choices(FILLER, k=15))
+    )
+    return {
+        "key": key,
+        "summary": summary,
+        "description": description,
+        **fields,
+    }
+
+
+def write_ticket(root: Path, ticket: Dict) -> Path:
+    path = root / "jira" / "tickets" / f"{ticket['key']}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"# {ticket['key']}: {ticket['summary']}\n\n"
+        f"## Description\n{ticket['description']}\n"
+    )
+    path.with_suffix(".json").write_text(json.dumps(ticket))
+    return path
+
+
+def score(predicted: Dict, truth: Dict) -> Dict[str, float]:
+    """Exact match for single fields, Jaccard similarity for lists."""
+    scores = {}
+    for field in PREDICTED_FIELDS:
+        value, expected = predicted.get(field), truth[field]
+        if field in ("labels", "components"):
+            value, expected = set(value or []), set(expected)
+            union = value | expected
+            overlap = len(value & expected) / len(union) if union else 1.0
+            scores[field] = overlap
+        else:
+            if hasattr(value, "value"):
+                value = value.value
+            scores[field] = float(value == expected)
+    return scores
+
+
+def summarize(rows: List[Dict[str, float]], latencies: List[float]) -> Dict:
+    summary = {
+        field: round(sum(row[field] for row in rows) / len(rows), 4)
+        for field in PREDICTED_FIELDS
+    }
+    return {"accuracy": summary, **percentiles(latencies)}
+
+
+def evaluate_local(predictor, tests, threshold: float) -> Dict:
+    rows, confident_rows, latencies = [], [], []
+    confident = {field: 0 for field in PREDICTED_FIELDS}
+    for ticket, content in tests:
+        start = time.perf_counter()
+        prediction = predictor.predict(content)
+        latencies.append(time.perf_counter() - start)
+        row = score(prediction.values, ticket)
+        rows.append(row)
+        for field in prediction.confident_fields(threshold):
+            confident[field] += 1
+        if not prediction.uncertain_fields(threshold):
+            confident_rows.append(row)
+    report = summarize(rows, latencies)
+    report["confident"] = {
+        field: round(count / len(rows), 4)
+        for field, count in confident.items()
+    }
+    report["answered_locally"] = round(len(confident_rows) / len(rows), 4)
+    if confident_rows:
+        report["accuracy_when_confident"] = {
+            field: round(
+                sum(row[field] for row in confident_rows)
+                / len(confident_rows),
+                4,
+            )
+            for field in PREDICTED_FIELDS
+        }
+    return report
+
+
+def evaluate_llm(model: str, tests) -> Dict:
+    extractor = IssueMetadataExtractor(LLMConfig(model=model))
+    rows, latencies = [], []
+    for ticket, content in tests:
+        start = time.perf_counter()
+        metadata = parse_metadata(extractor.extract_metadata(content), content)
+        latencies.append(time.perf_counter() - start)
+        rows.append(score(metadata.model_dump(), ticket))
+    return summarize(rows, latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--test", type=int, default=200)
+    parser.add_argument("--k", type=int, default=15)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm", metavar="MODEL", help="Also evaluate an LLM")
+    parser.add_argument("--output", type=Path, help="Also write JSON here")
+    args = parser.parse_args()
+    logger.remove()
+
+    rng = random.Random(args.seed)
+    tickets = [
+        make_ticket(f"PROJ-{i + 1}", rng)
+        for i in range(args.tickets + args.test)
+    ]
+    train, test = tickets[: args.tickets], tickets[args.tickets :]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = [write_ticket(tmp / "repo", ticket) for ticket in train]
+        tests = [
+            (ticket, write_ticket(tmp / "held_out", ticket).read_text())
+            for ticket in test
+        ]
+
+        service = VectorStoreService(tmp / "bench.sock", tmp / "runtime")
+        logger.remove()  # Drop the service's debug log file sink
+        try:
+            service.initialize_store(
+                {
+                    "collection_name": "jira_content",
+                    "db_path": str(tmp / "vector_db"),
+                    "embedding_model": HASHING_MODEL_NAME,
+                }
+            )
+            for offset in range(0, len(paths), ADD_BATCH_SIZE):
+                service.handle_add_files(
+                    {
+                        "collection_name": "jira_content",
+                        "paths": [
+                            str(p)
+                            for p in paths[offset : offset + ADD_BATCH_SIZE]
+                        ],
+                        "root": str(tmp / "repo"),
+                    }
+                )
+
+            predictor = MetadataPredictor(
+                ServiceStore(service, "jira_content"), k=args.k
+            )
+            report = {
+                "corpus": {
+                    "train": len(train),
+                    "test": len(test),
+                    "noise": NOISE,
+                    "k": args.k,
+                    "threshold": args.threshold,
+                    "seed": args.seed,
+                },
+                "local": evaluate_local(predictor, tests, args.threshold),
+            }
+        finally:
+            service.cleanup()
+
+    if args.llm:
+        report["llm"] = evaluate_llm(args.llm, tests)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""End-to-end retrieval benchmark over a synthetic, labeled corpus.
+
+Generates a reproducible repository of code files plus JIRA-like markdown
+tickets, each built around a unique concept, and queries that paraphrase
+one concept. The corpus is ingested through ``VectorStoreService`` exactly
+as ``jiragen add`` would, then every query is run in each retrieval mode.
+
+Reports ingest throughput, recall@k, MRR, the content bytes returned per
+query and query latency percentiles as JSON. Uses the offline hashing embedding function, so it runs on a CPU-only
+machine without network access.
+
+Usage:
+    python -m benchmarks.bench_retrieval [--files 2000] [--tickets 500]
+        [--queries 200] [--k 5] [--output results.json]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+from jiragen.services.embeddings import HASHING_MODEL_NAME
+from jiragen.services.vector_store import VectorStoreService
+
+VERBS = [
+    "parse", "validate", "refresh", "render", "encode", "schedule",
+    "migrate", "export", "import", "resolve", "throttle", "retry",
+    "serialize", "index", "compress", "authorize", "notify", "merge",
+]  # fmt: skip
+NOUNS = [
+    "invoice", "token", "session", "report", "webhook", "thumbnail",
+    "ledger", "account", "payload", "manifest", "cursor", "quota",
+    "tenant", "schema", "snapshot", "receipt", "profile", "catalog",
+]  # fmt: skip
+QUALIFIERS = [
+    "cache", "batch", "stream", "queue", "handler", "client", "store",
+    "worker", "policy", "adapter", "pipeline", "registry",
+]  # fmt: skip
+MODULES = ["api", "billing", "core", "storage", "auth", "jobs", "ui", "utils"]
+FILLER = (
+    "the a of to in for with on by value result data item config state "
+    "error request response logger context options default"
+).split()
+
+ADD_BATCH_SIZE = 64
+MODES = {
+    "dense": {},
+    "hybrid": {"hybrid": True},
+    "hybrid_dedup": {"hybrid": True, "dedup_threshold": 0.95},
+    "hybrid_mmr": {"hybrid": True, "mmr": True, "dedup_threshold": 0.95},
+}
+
+
+def make_concepts(count: int, rng: random.Random) -> List[Tuple[str, ...]]:
+    """Return unique (verb, noun, qualifier, module) tuples."""
+    combos = [
+        (verb, noun, qualifier)
+        for verb in VERBS
+        for noun in NOUNS
+        for qualifier in QUALIFIERS
+    ]
+    rng.shuffle(combos)
+    return [(*combo, rng.choice(MODULES)) for combo in combos[:count]]
+
+
+def _filler(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(FILLER, k=words))
+
+
+def write_code_file(root: Path, concept, rng: random.Random) -> Path:
+    verb, noun, qualifier, module = concept
+    name = f"{noun}_{qualifier}"
+    path = root / "src" / module / f"{verb}_{name}.py"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    class_name = "".join(part.title() for part in (noun, qualifier))
+    path.write_text(
+        f'"""{verb.title()} {noun} objects for the {qualifier}."""\n\n'
+        "import logging\n\nlogger = logging.getLogger(__name__)\n\n\n"
+        f"class {class_name}:\n"
+        f'    """Keeps {noun} state for the {module} {qualifier}."""\n\n'
+        f"    def {verb}_{noun}(self, {noun}_id, options=None):\n"
+        f'        """{verb.title()} a {noun} by id. {_filler(rng, 12)}"""\n'
+        f"        logger.debug('{verb} {noun} %s', {noun}_id)\n"
+        f"        return self._{qualifier}.get({noun}_id)\n"
+    )
+    return path
+
+
+def write_ticket(root: Path, key: str, concept, rng: random.Random) -> Path:
+    verb, noun, qualifier, module = concept
+    path = root / "jira" / "tickets" / f"{key}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    status = rng.choice(["To Do", "In Progress", "Done"])
+    path.write_text(
+        f"# {key}: {verb.title()} {noun} fails in {qualifier}\n\n"
+        f"## Basic Information\n- Status: {status}\n"
+        f"- Components: {module}\n\n"
+        f"## Description\nWhen we {verb} a {noun} the {module} {qualifier} "
+        f"returns stale data. {_filler(rng, 20)}\n"
+    )
+    return path
+
+
+def build_corpus(root: Path, n_files: int, n_tickets: int, seed: int):
+    """Write the corpus.
+
+    Returns:
+        Every code file, the relevant documents per concept for the codebase
+        and JIRA collections, and the concepts themselves
+    """
+    rng = random.Random(seed)
+    concepts = make_concepts(max(n_files, n_tickets), rng)
+    code = [write_code_file(root, c, rng) for c in concepts[:n_files]]
+
+    # Vendored copies are near-duplicates competing for the same slots
+    # and count as equally relevant
+    vendored = []
+    code_relevant = [{str(path)} for path in code]
+    for i, path in enumerate(code[: n_files // 20]):
+        copy = root / "vendor" / path.relative_to(root)
+        copy.parent.mkdir(parents=True, exist_ok=True)
+        copy.write_text(path.read_text() + "# vendored\n")
+        vendored.append(copy)
+        code_relevant[i].add(str(copy))
+
+    tickets = [
+        write_ticket(root, f"PROJ-{i + 1}", concept, rng)
+        for i, concept in enumerate(concepts[:n_tickets])
+    ]
+    ticket_relevant = [{str(path)} for path in tickets]
+    return code + vendored, tickets, code_relevant, ticket_relevant, concepts
+
+
+def make_queries(
+    concepts, code_relevant, ticket_relevant, n_queries: int, seed: int
+):
+    """Return (text, collection, relevant paths) triples."""
+    rng = random.Random(seed + 1)
+    queries = []
+    for _ in range(n_queries):
+        if rng.random() < 0.5:
+            i = rng.randrange(len(code_relevant))
+            collection, relevant = "codebase_content", code_relevant[i]
+        else:
+            i = rng.randrange(len(ticket_relevant))
+            collection, relevant = "jira_content", ticket_relevant[i]
+        verb, noun, qualifier, module = concepts[i]
+        words = [verb, noun, qualifier, module, *rng.sample(FILLER, 3)]
+        rng.shuffle(words)
+        queries.append((" ".join(words), collection, relevant))
+    return queries
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies) * 1000
+    return {
+        f"p{q}_ms": round(float(np.percentile(values, q)), 3)
+        for q in (50, 95, 99)
+    }
+
+
+def ingest(service, collection: str, paths: List[Path], root: Path) -> Dict:
+    start = time.perf_counter()
+    for offset in range(0, len(paths), ADD_BATCH_SIZE):
+        service.handle_add_files(
+            {
+                "collection_name": collection,
+                "paths": [
+                    str(p) for p in paths[offset : offset + ADD_BATCH_SIZE]
+                ],
+                "root": str(root),
+            }
+        )
+    seconds = time.perf_counter() - start
+    return {
+        "documents": len(paths),
+        "seconds": round(seconds, 3),
+        "docs_per_second": round(len(paths) / seconds, 1),
+    }
+
+
+def evaluate(service, queries, k: int, options: Dict) -> Dict:
+    latencies, hits, reciprocal_ranks, returned_bytes = [], 0, [], []
+    for text, collection, relevant in queries:
+        start = time.perf_counter()
+        results = service.handle_query_similar(
+            {"collection_name": collection, "text": text, "n_results": k}
+            | options
+        )["data"]
+        latencies.append(time.perf_counter() - start)
+        returned_bytes.append(
+            sum(len(doc["content"].encode()) for doc in results)
+        )
+        paths = [doc["metadata"]["file_path"] for doc in results]
+        rank = next(
+            (i + 1 for i, path in enumerate(paths) if path in relevant), None
+        )
+        hits += rank is not None
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+    return {
+        f"recall@{k}": round(hits / len(queries), 4),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "content_bytes": round(float(np.mean(returned_bytes)), 1),
+        **percentiles(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write JSON here")
+    args = parser.parse_args()
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus = tmp / "repo"
+        code, tickets, code_relevant, ticket_relevant, concepts = build_corpus(
+            corpus, args.files, args.tickets, args.seed
+        )
+        queries = make_queries(
+            concepts, code_relevant, ticket_relevant, args.queries, args.seed
+        )
+
+        service = VectorStoreService(tmp / "bench.sock", tmp / "runtime")
+        logger.remove()  # Drop the service's debug log file sink
+        try:
+            report = {
+                "corpus": {
+                    "code_files": len(code),
+                    "tickets": len(tickets),
+                    "queries": len(queries),
+                    "embedding_model": HASHING_MODEL_NAME,
+                    "seed": args.seed,
+                },
+                "ingest": {},
+                "query": {},
+            }
+            for collection, paths in (
+                ("codebase_content", code),
+                ("jira_content", tickets),
+            ):
+                service.initialize_store(
+                    {
+                        "collection_name": collection,
+                        "db_path": str(tmp / "vector_db"),
+                        "embedding_model": HASHING_MODEL_NAME,
+                    }
+                )
+                report["ingest"][collection] = ingest(
+                    service, collection, paths, corpus
+                )
+            # BM25 indexes load in the background; wait before timing queries
+            for index in service.lexical_indexes.values():
+                len(index)
+
+            for mode, options in MODES.items():
+                report["query"][mode] = evaluate(
+                    service, queries, args.k, options
+                )
+        finally:
+            service.cleanup()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
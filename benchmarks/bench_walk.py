@@ -0,0 +1,94 @@
+"""Benchmark the gitignore-aware walker against a naive ``rglob`` scan.
+
+Builds a synthetic repository with a large ignored ``node_modules`` and
+``.venv`` next to a modest source tree, then times both strategies.
+
+Usage:
+    python -m benchmarks.bench_walk [--packages 2000] [--files-per-package 20]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import pathspec
+from loguru import logger
+
+from jiragen.utils.walker import iter_files
+
+
+def build_tree(root: Path, packages: int, files_per_package: int) -> int:
+    """Create the synthetic repository and return the number of source files."""
+    (root / ".gitignore").write_text("node_modules/\n.venv/\n*.log\n")
+    (root / ".git" / "info").mkdir(parents=True)
+    (root / ".git" / "info" / "exclude").write_text("build/\n")
+
+    source_files = 0
+    for pkg in range(50):
+        pkg_dir = root / "src" / f"module_{pkg}"
+        pkg_dir.mkdir(parents=True)
+        for i in range(10):
+            (pkg_dir / f"file_{i}.py").write_text(f"x = {i}\n")
+            source_files += 1
+        (pkg_dir / "debug.log").write_text("ignored\n")
+
+    for ignored in ("node_modules", ".venv", "build"):
+        for pkg in range(packages):
+            pkg_dir = root / ignored / f"pkg_{pkg}" / "lib"
+            pkg_dir.mkdir(parents=True)
+            for i in range(files_per_package):
+                (pkg_dir / f"index_{i}.js").write_text("module.exports={}\n")
+
+    return source_files
+
+
+def naive_collect(root: Path) -> int:
+    """The previous implementation: rglob everything, filter afterwards."""
+    lines = (root / ".gitignore").read_text().splitlines()
+    spec = pathspec.PathSpec.from_lines(
+        "gitwildmatch", lines + [".git", ".gitignore"]
+    )
+    count = 0
+    for item in root.rglob("*"):
+        if item.is_file() and not spec.match_file(str(item.relative_to(root))):
+            count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--packages", type=int, default=2000)
+    parser.add_argument("--files-per-package", type=int, default=20)
+    args = parser.parse_args()
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        expected = build_tree(root, args.packages, args.files_per_package)
+
+        start = time.perf_counter()
+        naive_count = naive_collect(root)
+        naive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        walker_count = sum(1 for _ in iter_files(root, [".", "src"]))
+        walker_time = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "source_files": expected,
+                "ignored_files": 3 * args.packages * args.files_per_package,
+                "naive": {"files": naive_count, "seconds": naive_time},
+                "walker": {"files": walker_count, "seconds": walker_time},
+                "speedup": naive_time / walker_time if walker_time else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,35 @@
 """CLI module for jiragen."""
 
 from .add import add_files_command
+from .batch import batch_generate_command
 from .clean import clean_command
 from .fetch import fetch_command
 from .generate import generate_issue
+from .index import (
+    index_export_command,
+    index_import_command,
+    index_tune_command,
+)
 from .init import init_command
 from .rm import rm_files_command
+from .stats import stats_command
 from .status import status_command
+from .sync import sync_command
 from .upload import upload_command
 
 __all__ = [
     "add_files_command",
+    "batch_generate_command",
     "clean_command",
     "rm_files_command",
     "init_command",
+    "stats_command",
     "status_command",
+    "sync_command",
     "fetch_command",
     "upload_command",
     "generate_issue",
+    "index_export_command",
+    "index_import_command",
+    "index_tune_command",
 ]
@@ -2,8 +2,9 @@
 
 import sys
 import time
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List
 
 from rich.console import Console
 from rich.progress import (
@@ -16,71 +17,55 @@ from rich.progress import (
 )
 from rich.tree import Tree
 
-from jiragen.utils.misc import read_gitignore
+from jiragen.utils.walker import iter_files
 
 console = Console()
 
+ADD_BATCH_SIZE = 64  # Files sent to the vector store per request
 
-def _collect_paths(cwd: Path, path_str: str, gitignore) -> List[Path]:
-    """Collect paths based on the given path string, respecting gitignore patterns.
+
+def _collect_paths(cwd: Path, paths: Iterable[str]) -> Iterator[Path]:
+    """Lazily collect files for the given path strings, respecting ignore files.
 
     Args:
         cwd (Path): The current working directory.
-        path_str (str): The path string to collect files from.
-        gitignore: The gitignore object to match files against.
+        paths (Iterable[str]): The path strings to collect files from.
 
     Returns:
-        List[Path]: A list of collected file paths.
+        Iterator[Path]: Deduplicated file paths, yielded as they are found.
     """
-    collected_paths = []
-
-    if path_str in (".", "**"):
-        # Recursively collect all files
-        for item in cwd.rglob("*"):
-            if item.is_file():  # Only add files, not directories
-                rel_path = item.relative_to(cwd)
-                if not gitignore.match_file(str(rel_path)):
-                    collected_paths.append(item)
-    elif path_str == "*":
-        # Only collect files in current directory
-        for item in cwd.glob("*"):
-            if item.is_file():  # Only add files, not directories
-                rel_path = item.relative_to(cwd)
-                if not gitignore.match_file(str(rel_path)):
-                    collected_paths.append(item)
-    else:
-        # Handle specific path
-        path = cwd / Path(path_str)
-        if path.exists():
-            if path.is_file():
-                rel_path = path.relative_to(cwd)
-                if not gitignore.match_file(str(rel_path)):
-                    collected_paths.append(path)
-            elif path.is_dir():
-                # If it's a directory, collect all files recursively
-                for item in path.rglob("*"):
-                    if item.is_file():  # Only add files, not directories
-                        rel_path = item.relative_to(cwd)
-                        if not gitignore.match_file(str(rel_path)):
-                            collected_paths.append(item)
-
-    return collected_paths
+    return iter_files(cwd, paths)
+
+
+def _batched(paths: Iterator[Path], size: int) -> Iterator[List[Path]]:
+    """Group an iterator of paths into lists of at most ``size`` items."""
+    while True:
+        batch = list(islice(paths, size))
+        if not batch:
+            return
+        yield batch
 
 
 def _process_files(progress, task, expanded_paths, store) -> None:
     """Process the collected files and add them to the store.
 
+    Files are sent in batches as the walker finds them, so ingestion starts
+    before the directory walk has finished.
+
     Args:
         progress: The progress object to update.
         task: The task object representing the current progress task.
-        expanded_paths: The list of file paths to process.
+        expanded_paths: An iterator of file paths to process.
         store: The store object to add files to.
     """
     start_time = time.time()
+    added_files = set()
 
-    if expanded_paths:
-        # Add files to store
-        added_files = store.add_files(expanded_paths)
+    for batch in _batched(iter(expanded_paths), ADD_BATCH_SIZE):
+        added_files.update(store.add_files(batch))
+        progress.update(task, completed=len(added_files))
+
+    if added_files:
         processed_count = len(added_files)
 
         elapsed_time = time.time() - start_time
@@ -88,7 +73,7 @@ def _process_files(progress, task, expanded_paths, store) -> None:
 
         # Create tree view of added files
         root = Tree("📁 Added Files")
-        for file in added_files:
+        for file in sorted(added_files):
             root.add(f"[green]{file}[/]")
 
         console.print("\n")
@@ -112,10 +97,6 @@ def add_files_command(store, paths: List[str]) -> None:
         paths (List[str]): A list of path strings to process.
     """
     cwd = Path.cwd().resolve()
-    expanded_paths = []
-
-    # Read .gitignore patterns
-    gitignore = read_gitignore(cwd)
 
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -129,14 +110,8 @@ def add_files_command(store, paths: List[str]) -> None:
         task = progress.add_task("Processing files...", total=None)
 
         try:
-            # Collect all paths
-            for path_str in paths:
-                expanded_paths.extend(_collect_paths(cwd, path_str, gitignore))
-
-            # Filter out directories, only keep files
-            expanded_paths = [p for p in expanded_paths if p.is_file()]
-
-            # Process the files
+            # Collect paths lazily and process them as they are found
+            expanded_paths = _collect_paths(cwd, paths)
             _process_files(progress, task, expanded_paths, store)
 
         except KeyboardInterrupt:
@@ -0,0 +1,298 @@
+"""Generate many JIRA tickets from a JSONL file of messages."""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    Progress,
+    SpinnerColumn,
+    TaskProgressColumn,
+    TextColumn,
+    TimeElapsedColumn,
+    TimeRemainingColumn,
+)
+
+from jiragen.cli.generate import _setup_generator
+from jiragen.core.client import VectorStoreClient
+from jiragen.core.generator import (
+    GeneratorConfig,
+    IssueGenerator,
+    open_retrieval_stores,
+)
+from jiragen.core.metadata import generate_with_metadata
+from jiragen.core.retry import retry_delay
+
+console = Console()
+
+DEFAULT_CONCURRENCY = 4
+# Items still rate limited after the client's own retries pause every
+# worker and start over
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 2.0  # Seconds before the first retry, doubled per attempt
+
+
+class _RateGate:
+    """Pauses every worker after any of them hits a provider rate limit.
+
+    Once stopped, workers no longer start or retry items.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._stopped = threading.Event()
+
+    def wait(self) -> bool:
+        """Wait until requests may be sent, False once the batch stopped."""
+        with self._lock:
+            delay = self._resume_at - time.time()
+        if delay > 0:
+            self._stopped.wait(delay)
+        return not self._stopped.is_set()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def back_off(self, delay: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + delay)
+
+
+def load_batch(path: Path) -> List[Dict[str, Any]]:
+    """Read batch items from a JSONL file.
+
+    Each line is an object with a 'message' and an optional 'id'; lines
+    without an id are identified by their line number.
+
+    Args:
+        path: JSONL file to read
+
+    Returns:
+        List[Dict[str, Any]]: Items with 'id' and 'message'
+
+    Raises:
+        ValueError: If a line is not valid JSON or has no message
+    """
+    items, seen = [], set()
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e}") from e
+            if not isinstance(item, dict) or not item.get("message"):
+                raise ValueError(f"{path}:{number}: missing 'message'")
+            item_id = str(item.get("id") or f"line-{number}")
+            if item_id in seen:
+                logger.warning(f"Skipping duplicate batch id {item_id}")
+                continue
+            seen.add(item_id)
+            items.append({"id": item_id, "message": item["message"]})
+    return items
+
+
+def load_completed(path: Path) -> set:
+    """Return the ids that already succeeded in an earlier run."""
+    if not path.exists():
+        return set()
+    status: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Line cut short by an interrupted run
+            status[record.get("id")] = record.get("status")
+    return {item_id for item_id, value in status.items() if value == "ok"}
+
+
+def _generate_item(
+    store: VectorStoreClient,
+    config: GeneratorConfig,
+    stores: Dict[str, VectorStoreClient],
+    item: Dict[str, Any],
+    gate: _RateGate,
+) -> Dict[str, Any]:
+    """Generate content and metadata for one item, retrying transient errors."""
+    record = {"id": item["id"], "message": item["message"]}
+    for attempt in range(MAX_ATTEMPTS):
+        if not gate.wait():
+            return {**record, "status": "cancelled", "attempts": attempt}
+        # Generators keep per-run timings, so every item gets its own
+        generator = IssueGenerator(store, config, stores)
+        try:
+            content, metadata = generate_with_metadata(
+                generator, item["message"]
+            )
+            return {
+                **record,
+                "status": "ok",
+                "content": content,
+                "metadata": metadata.model_dump(
+                    mode="json", exclude={"description"}
+                ),
+                "timings": generator.timings,
+                "attempts": attempt + 1,
+            }
+        except Exception as e:
+            delay = retry_delay(e, attempt, base=BACKOFF_BASE)
+            if delay is None or attempt + 1 == MAX_ATTEMPTS:
+                logger.error(f"Batch item {item['id']} failed: {e}")
+                return {
+                    **record,
+                    "status": "error",
+                    "error": str(e),
+                    "attempts": attempt + 1,
+                }
+            logger.warning(
+                f"Batch item {item['id']} hit a provider limit, "
+                f"retrying in {delay:.1f}s"
+            )
+            gate.back_off(delay)
+
+
+def batch_generate_command(
+    store: VectorStoreClient,
+    batch_path: str,
+    template_path: str,
+    output_path: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    rerank: bool = False,
+    scopes: Optional[List[str]] = None,
+    use_cache: bool = True,
+) -> None:
+    """Generate a ticket for every message in a JSONL file.
+
+    All items share one generator configuration and vector store session,
+    and up to ``concurrency`` of them are generated at a time. Results are
+    appended to the output JSONL as they finish. Running the same batch
+    again skips the items that already succeeded, so a partially failed
+    batch can simply be resumed.
+
+    Args:
+        store: Vector store client
+        batch_path: JSONL file with one {"id", "message"} object per line
+        template_path: Template used for every ticket
+        output_path: Results file, defaults to <batch>.results.jsonl
+        concurrency: Maximum number of tickets generated at once
+        model: LLM model override
+        temperature: Temperature override
+        max_tokens: Maximum tokens override
+        rerank: Re-rank retrieved context with a cross-encoder
+        scopes: Scopes restricting retrieved context
+        use_cache: Use the LLM response cache if it is enabled
+    """
+    try:
+        batch_file = Path(batch_path)
+        output = (
+            Path(output_path)
+            if output_path
+            else batch_file.with_suffix(".results.jsonl")
+        )
+        items = load_batch(batch_file)
+        completed = load_completed(output)
+        pending = [item for item in items if item["id"] not in completed]
+        if completed:
+            console.print(
+                f"Resuming batch: {len(items) - len(pending)} of "
+                f"{len(items)} items already done"
+            )
+        if not pending:
+            console.print("[green]✓[/] Nothing left to generate")
+            return
+
+        config, _, _ = _setup_generator(
+            store,
+            template_path,
+            model,
+            temperature,
+            max_tokens,
+            rerank,
+            scopes,
+            use_cache,
+        )
+        # Connected once, every item retrieves through the same clients
+        stores = open_retrieval_stores(store.config.db_path.parent.parent)
+        gate = _RateGate()
+        succeeded = failed = 0
+        start_time = time.time()
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+        try:
+            with (
+                open(output, "a", encoding="utf-8") as out,
+                Progress(
+                    SpinnerColumn(),
+                    TextColumn("[bold blue]{task.description}"),
+                    BarColumn(bar_width=40),
+                    TaskProgressColumn(),
+                    TextColumn("{task.completed}/{task.total}"),
+                    TimeElapsedColumn(),
+                    TimeRemainingColumn(),
+                    console=console,
+                ) as progress,
+            ):
+                task = progress.add_task(
+                    "Generating tickets", total=len(pending)
+                )
+                futures = [
+                    executor.submit(
+                        _generate_item, store, config, stores, item, gate
+                    )
+                    for item in pending
+                ]
+                for future in as_completed(futures):
+                    record = future.result()
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    if record["status"] == "ok":
+                        succeeded += 1
+                    else:
+                        failed += 1
+                        progress.console.print(
+                            f"[red]✗[/] {record['id']}: {record['error']}"
+                        )
+                    progress.advance(task)
+        except KeyboardInterrupt:
+            # Results are no longer written, so queued and retried items
+            # must not go on paying for LLM calls
+            gate.stop()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        elapsed = time.time() - start_time
+        console.print(
+            f"\n[green]✓[/] Generated {succeeded} tickets in {elapsed:.1f}s "
+            f"({failed} failed), results in {output}"
+        )
+        if config.response_cache is not None:
+            stats = config.response_cache.stats()
+            console.print(
+                f"[dim]LLM cache: {stats['hits']} hits, "
+                f"{stats['misses']} misses[/]"
+            )
+        if failed:
+            console.print(
+                "[yellow]Run the same command again to retry failed items[/]"
+            )
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Batch interrupted, run it again to resume[/]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/]")
+        sys.exit(1)
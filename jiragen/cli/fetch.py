@@ -17,9 +17,16 @@ from rich.progress import (
 from rich.table import Table
 from rich.text import Text
 
+from jiragen.cli.status import format_size
 from jiragen.core.client import VectorStoreClient, VectorStoreConfig
 from jiragen.core.config import ConfigManager
-from jiragen.services.jira import JiraConfig, JiraDataManager, JiraFetchConfig
+from jiragen.services.jira import (
+    DEFAULT_FETCH_WORKERS,
+    DEFAULT_PAGE_SIZE,
+    JiraConfig,
+    JiraDataManager,
+    JiraFetchConfig,
+)
 from jiragen.utils.data import get_runtime_dir
 
 console = Console()
@@ -41,14 +48,21 @@ def create_progress() -> Progress:
 
 
 def fetch_command(
-    config_manager: ConfigManager, query: str | None, types: List[str] | None
+    config_manager: ConfigManager,
+    query: str | None,
+    types: List[str] | None,
+    full: bool = False,
 ) -> None:
     """Fetch data from JIRA and store it in a separate vector store.
 
+    Only issues updated since the previous fetch are downloaded, unless
+    ``full`` is set.
+
     Args:
         config_manager: The configuration manager instance
         query: The JIRA query to fetch data. If None, fetches all data for specified types
         types: List of data types to fetch (epics, tickets, components)
+        full: Fetch everything again and delete items JIRA no longer has
     """
     try:
         start_time = time.time()
@@ -71,7 +85,15 @@ def fetch_command(
         jira_config = JiraConfig.from_config_manager(config_manager)
         runtime_dir = get_runtime_dir()
         fetch_config = JiraFetchConfig(
-            output_dir=runtime_dir / "jira_data" / "raw_data", data_types=types
+            output_dir=runtime_dir / "jira_data" / "raw_data",
+            data_types=types,
+            batch_size=config_manager.config.getint(
+                "JIRA", "page_size", fallback=DEFAULT_PAGE_SIZE
+            ),
+            workers=config_manager.config.getint(
+                "JIRA", "workers", fallback=DEFAULT_FETCH_WORKERS
+            ),
+            extra_fields=config_manager.get_fetch_fields(),
         )
 
         # Create output directory
@@ -81,6 +103,7 @@ def fetch_command(
         jira_store_config = VectorStoreConfig(
             collection_name="jira_content",
             db_path=runtime_dir / "jira_data" / "vector_db",
+            **config_manager.get_vector_store_settings("jira_content"),
         )
         jira_store = VectorStoreClient(jira_store_config)
 
@@ -117,7 +140,7 @@ def fetch_command(
             jira_manager.progress_callback = update_progress
 
             # Start fetching data
-            results = jira_manager.fetch_data(jira_store)
+            results = jira_manager.fetch_data(jira_store, full=full)
 
             # Update final status
             for data_type, count in results.items():
@@ -139,14 +162,49 @@ def fetch_command(
             header_style="bold magenta",
         )
         table.add_column("Data Type", style="cyan")
+        table.add_column("Mode", style="dim")
         table.add_column("Items Fetched", justify="right", style="green")
-
+        table.add_column("Changed", justify="right", style="yellow")
+        table.add_column("Unchanged", justify="right")
+        table.add_column("Removed", justify="right", style="red")
+        table.add_column("Items/s", justify="right", style="blue")
+        table.add_column("Requests", justify="right")
+        table.add_column("Throttled", justify="right", style="red")
+        table.add_column("Payload", justify="right")
+        table.add_column("Time", justify="right", style="blue")
+
+        counts = ("changed", "unchanged", "removed")
+        requests = ("requests", "throttled")
+        totals = dict.fromkeys(counts + requests + ("bytes",), 0)
         total_items = 0
         for data_type, count in results.items():
-            table.add_row(data_type.capitalize(), str(count))
+            stats = jira_manager.stats.get(data_type, {})
+            seconds = stats.get("seconds") or 0.0
+            table.add_row(
+                data_type.capitalize(),
+                "incremental" if stats.get("incremental") else "full",
+                str(count),
+                *(str(stats.get(key, 0)) for key in counts),
+                f"{stats.get('fetched', 0) / seconds:.1f}" if seconds else "-",
+                *(str(stats.get(key, 0)) for key in requests),
+                format_size(stats.get("bytes", 0)),
+                f"{seconds:.1f}s",
+            )
             total_items += count
-
-        table.add_row("Total", f"[bold]{total_items}[/bold]", style="bold")
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+
+        table.add_row(
+            "Total",
+            "",
+            f"[bold]{total_items}[/bold]",
+            *(str(totals[key]) for key in counts),
+            f"{total_items / duration:.1f}" if duration else "-",
+            *(str(totals[key]) for key in requests),
+            format_size(totals["bytes"]),
+            f"{duration:.1f}s",
+            style="bold",
+        )
 
         # Print summary
         console.print("\n")
@@ -1,18 +1,19 @@
 """Generate JIRA ticket content and metadata using AI."""
 
-import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
 
 from jiragen.cli.nvim import open_in_neovim, setup_nvim_environment
 from jiragen.cli.upload import upload_command
-from jiragen.core.client import VectorStoreClient
+from jiragen.core.cache import ResponseCache
+from jiragen.core.client import VectorStoreClient, VectorStoreConfig
 from jiragen.core.config import ConfigManager
 from jiragen.core.generator import GeneratorConfig, IssueGenerator, LLMConfig
 from jiragen.core.metadata import (
@@ -20,7 +21,12 @@ from jiragen.core.metadata import (
     IssueMetadataExtractor,
     IssuePriority,
     IssueType,
+    generate_with_metadata,
+    parse_metadata,
 )
+from jiragen.core.predictor import MetadataPredictor
+from jiragen.core.routing import ModelRouter
+from jiragen.services.filters import parse_scopes
 
 console = Console()
 
@@ -31,6 +37,9 @@ def _setup_generator(
     model: Optional[str] = None,
     temperature: Optional[float] = None,
     max_tokens: Optional[int] = None,
+    rerank: bool = False,
+    scopes: Optional[List[str]] = None,
+    use_cache: bool = True,
 ) -> tuple[GeneratorConfig, IssueGenerator, LLMConfig]:
     """Set up the generator with the given configuration."""
     template = Path(template_path)
@@ -63,10 +72,49 @@ def _setup_generator(
             max_tokens=int(llm_config_dict["max_tokens"]),
             api_base=llm_config_dict.get("api_base", ""),
             api_token=llm_config_dict.get("api_token", ""),
+            timeout=float(llm_config_dict.get("timeout") or 60),
+            max_retries=int(llm_config_dict.get("max_retries") or 3),
+            deadline=float(llm_config_dict["deadline"])
+            if llm_config_dict.get("deadline")
+            else None,
         )
         # logger.debug(f"LLM config During Setup: {llm_config}") # TODO: Remove this
 
-        config = GeneratorConfig(template_path=template, llm_config=llm_config)
+        scopes = scopes or []
+        parse_scopes(scopes)  # Fail early on malformed scopes
+
+        cache_settings = config_manager.get_cache_settings()
+        response_cache = None
+        if use_cache and cache_settings["enabled"]:
+            response_cache = ResponseCache(
+                ttl_seconds=cache_settings["ttl_seconds"],
+                max_bytes=cache_settings["max_bytes"],
+            )
+
+        metadata_settings = config_manager.get_metadata_settings()
+        predictor = None
+        if metadata_settings["local_prediction"]:
+            predictor = _setup_predictor(store, metadata_settings["neighbors"])
+
+        # A model given on the command line is used for every stage
+        router = (
+            None
+            if model is not None
+            else ModelRouter(config_manager.get_routes())
+        )
+
+        config = GeneratorConfig(
+            template_path=template,
+            llm_config=llm_config,
+            rerank=rerank,
+            scopes=scopes,
+            response_cache=response_cache,
+            metadata_predictor=predictor,
+            metadata_confidence_threshold=metadata_settings[
+                "confidence_threshold"
+            ],
+            router=router,
+        )
         generator = IssueGenerator(store, config)
         return config, generator, llm_config
     except ValueError as e:
@@ -75,12 +123,48 @@ def _setup_generator(
         raise KeyError(f"Missing required configuration key: {str(e)}") from e
 
 
+def _stream_content(generator: IssueGenerator, message: str) -> str:
+    """Generate issue content, rendering it live as tokens arrive."""
+    chunks: List[str] = []
+
+    def render() -> Panel:
+        return Panel(
+            "".join(chunks) or "[dim]Waiting for the model...[/]",
+            title="[bold]Generating JIRA Issue Content[/]",
+            border_style="blue",
+        )
+
+    with Live(
+        render(), console=console, refresh_per_second=10, transient=True
+    ) as live:
+
+        def on_token(token: str) -> None:
+            chunks.append(token)
+            live.update(render())
+
+        return generator.generate(message, on_token=on_token)
+
+
 def _generate_and_edit_content(
-    generator: IssueGenerator, message: str, yes: bool
-) -> Optional[str]:
-    """Generate issue content and optionally edit it."""
+    generator: IssueGenerator,
+    message: str,
+    yes: bool,
+    stream: bool = False,
+    combined: bool = False,
+) -> Optional[Tuple[str, Optional[IssueMetadata]]]:
+    """Generate issue content and optionally edit it.
+
+    Returns the final content, plus its metadata if it was generated along
+    with the content and the content was not edited afterwards.
+    """
     console.print("[bold]Generating issue content...[/]")
-    issue_content = generator.generate(message)
+    metadata = None
+    if stream:
+        issue_content = _stream_content(generator, message)
+    elif combined:
+        issue_content, metadata = generate_with_metadata(generator, message)
+    else:
+        issue_content = generator.generate(message)
     console.print("[green]✓[/] Issue generated successfully!")
 
     # Open in Neovim for editing if requested and not in auto mode
@@ -91,6 +175,8 @@ def _generate_and_edit_content(
             return None
     else:
         modified_content = issue_content
+    if modified_content != issue_content:
+        metadata = None  # Edited content needs fresh metadata
 
     # Display the final issue content
     console.print(
@@ -100,29 +186,43 @@ def _generate_and_edit_content(
             border_style="green",
         )
     )
-    return modified_content
+    return modified_content, metadata
+
+
+def _setup_predictor(
+    store: VectorStoreClient, neighbors: int
+) -> MetadataPredictor:
+    """Set up local metadata prediction from the fetched JIRA tickets."""
+    runtime_dir = store.config.db_path.parent.parent
+    jira_store = VectorStoreClient(
+        VectorStoreConfig(
+            collection_name="jira_content",
+            db_path=runtime_dir / "jira_data" / "vector_db",
+        )
+    )
+    return MetadataPredictor(jira_store, k=neighbors)
 
 
 def _extract_and_display_metadata(
-    content: str, llm_config: LLMConfig
+    content: str, generator: IssueGenerator
 ) -> IssueMetadata:
-    """Extract and display issue metadata."""
+    """Extract and display issue metadata.
+
+    The extraction shares the deadline of the generation run.
+    """
     console.print("[bold]Analyzing issue metadata...[/]")
-    extractor = IssueMetadataExtractor(llm_config)
-    metadata_json = extractor.extract_metadata(content)
+    extractor = IssueMetadataExtractor.from_config(generator.config)
+    metadata_json = extractor.extract_metadata(content, generator.deadline)
+    if extractor.model is not None:
+        generator.timings["metadata_model"] = extractor.model
     logger.info(f"Successfully extracted metadata: {metadata_json}")
+    metadata = parse_metadata(metadata_json, content)
+    _display_metadata(metadata)
+    return metadata
 
-    # Parse metadata from JSON string to IssueMetadata object
-    if isinstance(metadata_json, str):
-        metadata_dict = json.loads(metadata_json)
-        metadata = IssueMetadata(**metadata_dict)
-    else:
-        metadata = metadata_json
-
-    # Set the description field
-    metadata.description = content
 
-    # Display metadata in a nice format
+def _display_metadata(metadata: IssueMetadata) -> None:
+    """Display issue metadata in a nice format."""
     console.print("\n[bold]Generated Metadata:[/]")
     console.print(f"Issue Type: {metadata.issue_type}")
     console.print(f"Priority: {metadata.priority}")
@@ -130,8 +230,6 @@ def _extract_and_display_metadata(
     console.print(f"Story Points: {metadata.story_points}")
     console.print(f"Components: {', '.join(metadata.components)}")
 
-    return metadata
-
 
 def _modify_metadata(metadata: IssueMetadata) -> IssueMetadata:
     """Allow user to modify metadata interactively."""
@@ -209,6 +307,11 @@ def generate_issue(
     max_tokens: Optional[int] = None,
     upload: bool = False,
     yes: bool = False,
+    rerank: bool = False,
+    scopes: Optional[List[str]] = None,
+    stream: bool = False,
+    use_cache: bool = True,
+    separate_metadata: bool = False,
 ) -> Optional[Dict[str, Any]]:
     """Generate JIRA issue content and metadata using AI."""
     try:
@@ -217,16 +320,43 @@ def generate_issue(
 
         # Set up the generator
         config, generator, llm_config = _setup_generator(
-            store, template_path, model, temperature, max_tokens
+            store,
+            template_path,
+            model,
+            temperature,
+            max_tokens,
+            rerank,
+            scopes,
+            use_cache,
         )
 
         # Generate and edit content
-        content = _generate_and_edit_content(generator, message, yes)
-        if content is None:
+        # Streams are plain text, so streamed content gets metadata separately
+        result = _generate_and_edit_content(
+            generator, message, yes, stream, combined=not separate_metadata
+        )
+        if result is None:
             return None
+        content, metadata = result
 
         # Extract and process metadata
-        metadata = _extract_and_display_metadata(content, llm_config)
+        if metadata is None:
+            metadata = _extract_and_display_metadata(content, generator)
+        else:
+            _display_metadata(metadata)
+        models = [
+            f"{stage} {generator.timings[f'{stage}_model']}"
+            for stage in ("generate", "metadata")
+            if f"{stage}_model" in generator.timings
+        ]
+        if models:
+            console.print(f"[dim]Models: {', '.join(models)}[/]")
+        if config.response_cache is not None:
+            stats = config.response_cache.stats()
+            console.print(
+                f"[dim]LLM cache: {stats['hits']} hits, "
+                f"{stats['misses']} misses[/]"
+            )
 
         if upload:
             # Allow user to modify metadata if not in auto mode
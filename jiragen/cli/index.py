@@ -0,0 +1,246 @@
+"""Index snapshot commands for jiragen CLI."""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from jiragen.cli.status import format_size
+from jiragen.core.client import VectorStoreClient, VectorStoreConfig
+from jiragen.utils.data import get_runtime_dir
+
+console = Console()
+
+COLLECTIONS = {
+    "codebase": ("codebase_content", "codebase_data"),
+    "jira": ("jira_content", "jira_data"),
+}
+
+
+def get_collection_store(
+    collection: str, hnsw: Optional[Dict[str, int]] = None
+) -> VectorStoreClient:
+    """Create a store client for one of the named collections.
+
+    Args:
+        collection: Collection name ('codebase' or 'jira')
+        hnsw: Configured HNSW settings, used if the collection is created
+    """
+    collection_name, data_dir = COLLECTIONS[collection]
+    runtime_dir = get_runtime_dir()
+    return VectorStoreClient(
+        VectorStoreConfig(
+            collection_name=collection_name,
+            db_path=runtime_dir / data_dir / "vector_db",
+            **(hnsw or {}),
+        )
+    )
+
+
+def get_source_commit(cwd: Optional[Path] = None) -> Optional[str]:
+    """Return the current git commit of the working tree, if any."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=cwd or Path.cwd(),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except Exception as e:
+        logger.debug(f"Could not determine source commit: {e}")
+    return None
+
+
+def index_export_command(
+    path: Path, collection: str = "codebase", commit: Optional[str] = None
+) -> None:
+    """Export a collection to a portable snapshot bundle.
+
+    Args:
+        path: Destination file for the bundle
+        collection: Collection to export ('codebase' or 'jira')
+        commit: Source commit to record, defaults to the current git HEAD
+    """
+    try:
+        start_time = time.time()
+        store = get_collection_store(collection)
+        result = store.export_snapshot(
+            path, source_commit=commit or get_source_commit()
+        )
+
+        table = Table(
+            title="Snapshot Exported",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right", style="green")
+        table.add_row("Collection", store.config.collection_name)
+        table.add_row("Documents", str(result["count"]))
+        table.add_row("Bundle Size", format_size(result["size"]))
+        table.add_row("Path", result["path"])
+        table.add_row("Duration", f"{time.time() - start_time:.2f}s")
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]Error exporting snapshot: {str(e)}[/]")
+        sys.exit(1)
+
+
+def index_import_command(
+    path: Path,
+    collection: str = "codebase",
+    replace: bool = False,
+    force: bool = False,
+    hnsw: Optional[Dict[str, int]] = None,
+) -> None:
+    """Load a snapshot bundle into a collection without re-embedding.
+
+    Args:
+        path: Snapshot bundle to load
+        collection: Collection to import into ('codebase' or 'jira')
+        replace: Drop the existing collection contents first
+        force: Import even if the bundle used another embedding model
+        hnsw: Configured HNSW settings of the collection
+    """
+    try:
+        if not Path(path).is_file():
+            raise FileNotFoundError(f"Snapshot not found: {path}")
+
+        start_time = time.time()
+        store = get_collection_store(collection, hnsw)
+        result = store.import_snapshot(path, replace=replace, force=force)
+
+        table = Table(
+            title="Snapshot Imported",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right", style="green")
+        table.add_row("Collection", store.config.collection_name)
+        table.add_row("Documents", str(result["count"]))
+        table.add_row("Embedding Model", str(result["embedding_model"]))
+        table.add_row("Source Commit", str(result["source_commit"]))
+        table.add_row("Duration", f"{time.time() - start_time:.2f}s")
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]Error importing snapshot: {str(e)}[/]")
+        sys.exit(1)
+
+
+def _parse_int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of integers such as '8,16,32'."""
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError as e:
+        raise ValueError(f"Expected comma-separated integers: {value}") from e
+
+
+def index_tune_command(
+    collection: str = "codebase",
+    k: int = 10,
+    n_queries: int = 100,
+    m_values: str = "8,16,32",
+    construction_ef_values: str = "100,200",
+    search_ef_values: str = "10,50,100",
+    max_vectors: int = 20000,
+    target_recall: float = 0.95,
+) -> None:
+    """Measure recall and latency of HNSW settings on a collection.
+
+    Every combination is built as a throwaway index over the collection's own
+    embeddings and compared against exact search.
+
+    Args:
+        collection: Collection to tune ('codebase' or 'jira')
+        k: Neighbors per query for recall@k
+        n_queries: Number of sampled queries
+        m_values: Comma-separated ``M`` values
+        construction_ef_values: Comma-separated ``construction_ef`` values
+        search_ef_values: Comma-separated ``search_ef`` values
+        max_vectors: Maximum stored vectors to tune on
+        target_recall: Recall the recommended setting must reach
+    """
+    try:
+        start_time = time.time()
+        store = get_collection_store(collection)
+        with console.status("[bold blue]Building and measuring indexes..."):
+            result = store.tune_index(
+                k=k,
+                n_queries=n_queries,
+                m_values=_parse_int_list(m_values),
+                construction_ef_values=_parse_int_list(construction_ef_values),
+                search_ef_values=_parse_int_list(search_ef_values),
+                max_vectors=max_vectors,
+            )
+
+        rows = result["rows"]
+        current = result["current"]
+        keys = ("hnsw_m", "hnsw_construction_ef", "hnsw_search_ef")
+        eligible = [r for r in rows if r["recall"] >= target_recall]
+        recommended = (
+            min(eligible, key=lambda r: (r["p99_ms"], r["size"]))
+            if eligible
+            else max(rows, key=lambda r: r["recall"])
+        )
+
+        table = Table(
+            title=f"HNSW Tuning: {store.config.collection_name} "
+            f"({result['vectors']} of {result['total']} vectors, k={k})",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("M", justify="right", style="cyan")
+        table.add_column("construction_ef", justify="right", style="cyan")
+        table.add_column("search_ef", justify="right", style="cyan")
+        table.add_column(f"Recall@{k}", justify="right", style="green")
+        table.add_column("p50", justify="right")
+        table.add_column("p99", justify="right")
+        table.add_column("Index Size", justify="right")
+        table.add_column("Build", justify="right")
+        table.add_column("", style="yellow")
+        for row in rows:
+            notes = []
+            if all(row[key] == current[key] for key in keys):
+                notes.append("current")
+            if row is recommended:
+                notes.append("recommended")
+            table.add_row(
+                str(row["hnsw_m"]),
+                str(row["hnsw_construction_ef"]),
+                str(row["hnsw_search_ef"]),
+                f"{row['recall']:.3f}",
+                f"{row['p50_ms']:.2f}ms",
+                f"{row['p99_ms']:.2f}ms",
+                format_size(row["size"]),
+                f"{row['build_s']:.1f}s",
+                ", ".join(notes),
+            )
+        console.print(table)
+
+        if not eligible:
+            console.print(
+                f"[yellow]No setting reached recall {target_recall}; "
+                f"try larger M or search_ef values[/]"
+            )
+        section = escape(f"[vector_store.{store.config.collection_name}]")
+        settings = "\n".join(f"{key} = {recommended[key]}" for key in keys)
+        console.print(
+            f"\nTo apply, add to config.ini:\n[cyan]{section}\n{settings}[/]"
+        )
+        console.print(f"Duration: {time.time() - start_time:.2f}s")
+
+    except Exception as e:
+        console.print(f"[red]Error tuning index: {str(e)}[/]")
+        sys.exit(1)
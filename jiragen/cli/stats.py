@@ -0,0 +1,85 @@
+"""Stats command for jiragen CLI."""
+
+import sys
+import time
+from typing import List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from jiragen.core.ledger import GROUPINGS, get_ledger, summarize
+
+console = Console()
+
+DEFAULT_GROUPINGS = ["day", "model", "command"]
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return f"{value:.0f}ms" if value is not None else "-"
+
+
+def stats_command(
+    by: Optional[List[str]] = None,
+    days: Optional[float] = None,
+    kind: Optional[str] = None,
+) -> None:
+    """Show token, cost and latency statistics from the ledger.
+
+    Args:
+        by: Groupings to show a table for, defaults to day, model and command
+        days: Only include records from the last number of days
+        kind: Only include 'llm', 'retrieval' or 'ingest' records
+    """
+    try:
+        ledger = get_ledger()
+        since = time.time() - days * 86400 if days else None
+        entries = [
+            entry
+            for entry in ledger.read(since=since)
+            if kind is None or entry.get("kind") == kind
+        ]
+        if not entries:
+            console.print(f"[yellow]No records in {ledger.path}[/]")
+            return
+
+        for grouping in by or DEFAULT_GROUPINGS:
+            if grouping not in GROUPINGS:
+                raise ValueError(
+                    f"Cannot group by {grouping}, use one of "
+                    + ", ".join(GROUPINGS)
+                )
+            table = Table(
+                title=f"By {grouping}",
+                show_header=True,
+                header_style="bold magenta",
+            )
+            table.add_column(grouping.title(), style="cyan")
+            table.add_column("Calls", justify="right")
+            table.add_column("Errors", justify="right", style="red")
+            table.add_column("Cache Hits", justify="right", style="green")
+            table.add_column("Prompt Tokens", justify="right")
+            table.add_column("Completion Tokens", justify="right")
+            table.add_column("Cost", justify="right", style="yellow")
+            table.add_column("p50", justify="right")
+            table.add_column("p95", justify="right")
+            table.add_column("p99", justify="right")
+            for row in summarize(entries, by=grouping):
+                table.add_row(
+                    row[grouping],
+                    str(row["calls"]),
+                    str(row["errors"]),
+                    str(row["cache_hits"]),
+                    f"{row['prompt_tokens']:,}",
+                    f"{row['completion_tokens']:,}",
+                    f"${row['cost']:.4f}",
+                    _format_ms(row["p50_ms"]),
+                    _format_ms(row["p95_ms"]),
+                    _format_ms(row["p99_ms"]),
+                )
+            console.print(table)
+
+        console.print(f"[dim]{len(entries)} records from {ledger.path}[/]")
+
+    except Exception as e:
+        console.print(f"[red]Error reading statistics: {str(e)}[/]")
+        sys.exit(1)
@@ -0,0 +1,104 @@
+"""Sync command for jiragen CLI."""
+
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
+from rich.tree import Tree
+
+from jiragen.utils.walker import iter_files
+
+console = Console()
+
+
+def _scope(cwd: Path, path_str: str) -> Path:
+    """Return the part of the store a path argument mirrors.
+
+    Like the walker, ``*`` only covers the files directly in ``cwd``, which
+    the service matches as the ``cwd/*`` scope.
+    """
+    if path_str in (".", "**"):
+        return cwd
+    if path_str == "*":
+        return cwd / "*"
+    return (cwd / path_str).resolve()
+
+
+def _print_plan(plan, cwd: Path, dry_run: bool) -> None:
+    """Print the added, updated and deleted files of a sync plan."""
+    labels = [
+        ("added", "green", "+"),
+        ("updated", "yellow", "~"),
+        ("deleted", "red", "-"),
+    ]
+    title = "Planned changes" if dry_run else "Applied changes"
+    root = Tree(f"[bold]{title}")
+    for key, color, marker in labels:
+        for file in plan[key]:
+            try:
+                display = Path(file).relative_to(cwd)
+            except ValueError:
+                display = file
+            root.add(f"[{color}]{marker} {display}[/]")
+    if root.children:
+        console.print(root)
+
+
+def sync_command(store, paths: List[str], dry_run: bool = False) -> None:
+    """Mirror the working tree into the vector store.
+
+    New files are added, modified files re-embedded and files that were
+    deleted from disk (or are now ignored) are removed from the store. Only
+    the difference against the collection manifest is applied.
+
+    Args:
+        store: The store object to sync.
+        paths (List[str]): Path strings to mirror, defaults to ".".
+        dry_run (bool): Only show what would change.
+    """
+    cwd = Path.cwd().resolve()
+    paths = paths or ["."]
+
+    try:
+        start_time = time.time()
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            progress.add_task("Scanning working tree...", total=None)
+            files = list(iter_files(cwd, paths))
+            scopes = [_scope(cwd, p) for p in paths]
+
+            progress.add_task("Syncing vector store...", total=None)
+            plan = store.sync_files(files, scopes, dry_run=dry_run)
+
+        _print_plan(plan, cwd, dry_run)
+
+        table = Table(
+            title="Sync Summary", show_header=True, header_style="bold magenta"
+        )
+        table.add_column("Change", style="cyan")
+        table.add_column("Files", justify="right", style="green")
+        table.add_row("Added", str(len(plan["added"])))
+        table.add_row("Updated", str(len(plan["updated"])))
+        table.add_row("Deleted", str(len(plan["deleted"])))
+        table.add_row("Unchanged", str(plan["unchanged"]))
+        if plan.get("failed"):
+            table.add_row("Failed", f"[red]{len(plan['failed'])}[/]")
+        console.print(table)
+        console.print(
+            f"[green]Sync {'planned' if dry_run else 'completed'} in "
+            f"{time.time() - start_time:.2f} seconds[/]"
+        )
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Operation cancelled by user[/]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"\n[red]Error: {str(e)}[/]")
+        sys.exit(1)
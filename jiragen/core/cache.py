@@ -0,0 +1,186 @@
+"""On-disk cache of LLM responses keyed by a fingerprint of the request."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from jiragen.utils.data import get_data_dir
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_path() -> Path:
+    """Return the location of the response cache in the data directory."""
+    return get_data_dir() / "llm_cache.sqlite"
+
+
+def cache_key(
+    model: str,
+    params: Dict[str, Any],
+    prompt: str,
+    response_format: Optional[Any] = None,
+) -> str:
+    """Fingerprint a request.
+
+    Args:
+        model: Model the request is sent to
+        params: Request parameters such as temperature and max_tokens
+        prompt: Full prompt text
+        response_format: Pydantic model or JSON schema for structured output
+
+    Returns:
+        str: SHA-256 hex digest identifying the request
+    """
+    if isinstance(response_format, type) and issubclass(
+        response_format, BaseModel
+    ):
+        response_format = response_format.model_json_schema()
+    fingerprint = {
+        "model": model,
+        "params": {k: v for k, v in params.items() if k != "model"},
+        "response_format": response_format,
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+    }
+    payload = json.dumps(fingerprint, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed store of LLM responses with TTL and size limits.
+
+    Expired entries are dropped when they are read. After every write, the
+    least recently used entries are evicted until the cache fits in
+    ``max_bytes``.
+
+    Attributes:
+        path: SQLite file holding the cache
+        ttl_seconds: Age after which an entry is no longer served
+        max_bytes: Upper bound on the total size of stored responses
+        hits: Lookups answered from the cache since it was opened
+        misses: Lookups that found no usable entry since it was opened
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path) if path else default_cache_path()
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        logger.debug(f"Opened LLM response cache at {self.path}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, if present and fresh."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row and now - row[1] > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key = ?", (key,)
+                )
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response and evict old entries beyond the size limit."""
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug(f"Not caching response of {size} bytes")
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (now - self.ttl_seconds,),
+        )
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} LLM cache entries")
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counts plus the number and size of entries."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -2,6 +2,7 @@ import pickle
 import socket
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
@@ -9,12 +10,18 @@ from typing import Any, Dict, List, Optional, Set
 from loguru import logger
 from pydantic import BaseModel, ConfigDict
 
+from jiragen.core.ledger import record
 from jiragen.utils.data import get_runtime_dir
 
 MAX_RETRIES = 3
 SOCKET_TIMEOUT = 15  # 15 seconds timeout
 GET_FILES_TIMEOUT = 20  # 20 seconds for get_stored_files
 BUFFER_SIZE = 16384  # 16KB buffer size
+SNAPSHOT_TIMEOUT = 600  # Snapshots and syncs of large trees take a while
+TUNE_TIMEOUT = 1800  # Index tuning builds one index per setting
+
+# Clients connecting at the same time must not start the service twice
+_service_lock = threading.Lock()
 
 
 class VectorStoreConfig(BaseModel):
@@ -26,6 +33,12 @@ class VectorStoreConfig(BaseModel):
         device: Device to run embeddings on ('cpu' or 'cuda')
         socket_path: Unix socket path for client-service communication
         db_path: Path to the vector store database
+        hnsw_m: HNSW graph degree, higher improves recall at the cost of
+            memory; fixed once the collection is created
+        hnsw_construction_ef: Candidate list size while building the graph;
+            fixed once the collection is created
+        hnsw_search_ef: Candidate list size while querying, higher improves
+            recall at the cost of latency
     """
 
     collection_name: str = "repository_content"
@@ -33,6 +46,9 @@ class VectorStoreConfig(BaseModel):
     device: str = "cpu"  # Default to CPU for stability
     socket_path: Optional[Path] = None
     db_path: Optional[Path] = None
+    hnsw_m: Optional[int] = None
+    hnsw_construction_ef: Optional[int] = None
+    hnsw_search_ef: Optional[int] = None
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True, protected_namespaces=()
@@ -54,9 +70,32 @@ class VectorStoreConfig(BaseModel):
 
 
 class VectorStoreClient:
-    def __init__(self, config: VectorStoreConfig):
+    def __init__(self, config: VectorStoreConfig, connect: bool = True):
+        """Create a client, by default connecting it right away.
+
+        Args:
+            config: Vector store configuration
+            connect: Start the service and initialize the collection now;
+                if False, ``connect`` has to be called before the first use
+        """
         self.config = config
-        self.ensure_service_running()
+        self._local = threading.local()
+        if connect:
+            self.connect()
+
+    @property
+    def last_query_timings(self) -> Dict[str, float]:
+        """Service timings of the calling thread's last query."""
+        return getattr(self._local, "last_query_timings", {})
+
+    @last_query_timings.setter
+    def last_query_timings(self, timings: Dict[str, float]) -> None:
+        self._local.last_query_timings = timings
+
+    def connect(self) -> None:
+        """Ensure the service is running and initialize the collection."""
+        with _service_lock:
+            self.ensure_service_running()
         self.initialize_store()
 
     @property
@@ -248,6 +287,9 @@ class VectorStoreClient:
         1. Send initialize command with config
         2. Verify store accessibility through get_stored_files
         3. Confirm data structure integrity
+
+        HNSW settings are only sent when set on the config, the CLI resolves
+        them from the ``[vector_store]`` config sections.
         """
         try:
             config_dict = {
@@ -256,6 +298,9 @@ class VectorStoreClient:
                 "device": self.config.device,
                 "db_path": str(self.config.db_path),
             }
+            for key in ("hnsw_m", "hnsw_construction_ef", "hnsw_search_ef"):
+                if getattr(self.config, key) is not None:
+                    config_dict[key] = getattr(self.config, key)
             self.send_command("initialize", params=config_dict)
             logger.debug("Vector store initialized successfully")
         except Exception as e:
@@ -315,14 +360,24 @@ class VectorStoreClient:
             logger.exception(f"Failed to get stored files {str(e)}")
             return {"files": set(), "directories": set()}
 
-    def add_files(self, paths: List[Path]) -> Set[Path]:
-        """Add files to vector store"""
+    def add_files(
+        self, paths: List[Path], root: Optional[Path] = None
+    ) -> Set[Path]:
+        """Add files to vector store
+
+        Args:
+            paths: Files to add
+            root: Directory the stored path metadata is relative to,
+                defaults to the current directory
+        """
+        start_time = time.time()
         try:
             # logger.debug(f"Adding files: {paths}")
             response = self.send_command(
                 "add_files",
                 {
                     "paths": [str(p) for p in paths],
+                    "root": str(root or Path.cwd()),
                     "collection_name": self.config.collection_name,
                 },
                 timeout=60,
@@ -333,6 +388,14 @@ class VectorStoreClient:
 
             added_files = {Path(p) for p in response["data"]}
             logger.info(f"Successfully added {len(added_files)} files")
+            record(
+                "ingest",
+                operation="add",
+                collection=self.config.collection_name,
+                files=len(paths),
+                changed=len(added_files),
+                latency_ms=(time.time() - start_time) * 1000,
+            )
             return added_files
 
         except Exception as e:
@@ -362,24 +425,305 @@ class VectorStoreClient:
             logger.exception("Failed to remove files")
             raise Exception(f"Failed to remove files: {str(e)}") from e
 
-    def query_similar(
-        self, text: str, n_results: int = 5
-    ) -> List[Dict[str, Any]]:
-        """Query similar documents"""
+    def sync_files(
+        self,
+        paths: List[Path],
+        scopes: List[Path],
+        dry_run: bool = False,
+        root: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """Mirror the given working tree files into the vector store.
+
+        Args:
+            paths: Every file currently present under ``scopes``
+            scopes: Files or directories whose stale entries may be deleted,
+                a directory followed by ``*`` only covers its direct files
+            dry_run: Only compute the plan, do not modify the store
+            root: Directory the stored path metadata is relative to,
+                defaults to the current directory
+
+        Returns:
+            Dict[str, Any]: Lists of 'added', 'updated', 'deleted' and
+            'failed' paths and the number of 'unchanged' files
+        """
+        start_time = time.time()
         try:
             response = self.send_command(
-                "query_similar",
+                "sync",
                 {
-                    "text": text,
-                    "n_results": n_results,
+                    "paths": [str(p) for p in paths],
+                    "scopes": [str(s) for s in scopes],
+                    "dry_run": dry_run,
+                    "root": str(root or Path.cwd()),
                     "collection_name": self.config.collection_name,
                 },
-                timeout=60,
+                timeout=SNAPSHOT_TIMEOUT,
+                retries=1,
+            )
+
+            if not response or "data" not in response:
+                raise Exception("Invalid response from service")
+            data = response["data"]
+            if not dry_run:
+                record(
+                    "ingest",
+                    operation="sync",
+                    collection=self.config.collection_name,
+                    files=len(paths),
+                    changed=sum(
+                        len(data.get(k, ()))
+                        for k in ("added", "updated", "deleted")
+                    ),
+                    latency_ms=(time.time() - start_time) * 1000,
+                )
+            return data
+
+        except Exception as e:
+            logger.exception("Failed to sync files")
+            raise Exception(f"Failed to sync files: {str(e)}") from e
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query text with the collection's embedding model.
+
+        The vector can be passed to ``query_similar`` for any collection
+        served by the same service, so a message is embedded only once.
+
+        Args:
+            text: Query text
+
+        Returns:
+            List[float]: Query embedding
+        """
+        try:
+            response = self.send_command("embed_query", {"text": text})
+
+            if not response or "data" not in response:
+                raise Exception("Invalid response from service")
+            return response["data"]
+
+        except Exception as e:
+            logger.exception("Failed to embed query")
+            raise Exception(f"Failed to embed query: {str(e)}") from e
+
+    def query_similar(
+        self,
+        text: str,
+        n_results: int = 5,
+        hybrid: bool = False,
+        rerank: bool = False,
+        rerank_budget_ms: Optional[float] = None,
+        fetch_k: Optional[int] = None,
+        mmr: bool = False,
+        mmr_lambda: Optional[float] = None,
+        dedup_threshold: Optional[float] = None,
+        embedding: Optional[List[float]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        full_document: bool = False,
+        snippet_lines: Optional[int] = None,
+        max_snippets: Optional[int] = None,
+        snippet_scoring: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query similar documents
+
+        Per-stage service timings of the last query are kept in
+        ``last_query_timings``.
+
+        Args:
+            text: Query text
+            n_results: Number of documents to return
+            hybrid: Fuse vector results with the BM25 lexical index using
+                reciprocal rank fusion, so exact identifiers, error codes and
+                ticket keys in the query are matched
+            rerank: Over-fetch candidates and re-order them with a
+                cross-encoder before keeping the top ``n_results``
+            rerank_budget_ms: Time budget for re-ranking this request
+            fetch_k: Number of candidates to retrieve before fusion and
+                re-ranking
+            mmr: Pick results by maximal marginal relevance over the
+                over-fetched candidates instead of by relevance alone
+            mmr_lambda: MMR trade-off, 1.0 is pure relevance and 0.0 pure
+                diversity
+            dedup_threshold: Drop candidates whose cosine similarity to a
+                better ranked one exceeds this value
+            embedding: Precomputed query vector from ``embed_query``; the
+                text is then only used for lexical matching and re-ranking
+            where: Chroma metadata filter applied to every index, e.g.
+                ``{"language": "python"}`` or ``{"status": "Done"}``
+            full_document: Return whole documents instead of their best
+                matching line windows
+            snippet_lines: Lines per window
+            max_snippets: Maximum number of windows per document
+            snippet_scoring: 'lexical' (default) or 'embedding' scoring of
+                the windows against the query
+
+        Returns:
+            List[Dict[str, Any]]: Documents with their 'content', 'metadata'
+                and vector 'distance' to the query. Unless ``full_document``
+                is set, 'content' holds the selected windows back to back,
+                'snippets' their 'start_line', 'end_line' and 'score', and
+                'total_lines' the length of the whole document.
+        """
+        params = {
+            "text": text,
+            "n_results": n_results,
+            "hybrid": hybrid,
+            "rerank": rerank,
+            "mmr": mmr,
+            "collection_name": self.config.collection_name,
+        }
+        if rerank_budget_ms is not None:
+            params["rerank_budget_ms"] = rerank_budget_ms
+        if fetch_k is not None:
+            params["fetch_k"] = fetch_k
+        if mmr_lambda is not None:
+            params["mmr_lambda"] = mmr_lambda
+        if dedup_threshold is not None:
+            params["dedup_threshold"] = dedup_threshold
+        if embedding is not None:
+            params["embedding"] = embedding
+        if where:
+            params["where"] = where
+        if full_document:
+            params["full_document"] = True
+        if snippet_lines is not None:
+            params["snippet_lines"] = snippet_lines
+        if max_snippets is not None:
+            params["max_snippets"] = max_snippets
+        if snippet_scoring is not None:
+            params["snippet_scoring"] = snippet_scoring
+
+        try:
+            response = self.send_command(
+                "query_similar", params, timeout=60
             )  # Longer timeout for query operations
 
             if not response or "data" not in response:
                 raise Exception("Invalid response from service")
+            self.last_query_timings = response.get("timings", {})
             return response["data"]
         except Exception as e:
             logger.exception(f"Failed to query similar documents {str(e)}")
+            self.last_query_timings = {}
             return []
+
+    def export_snapshot(
+        self,
+        path: Path,
+        source_commit: Optional[str] = None,
+        root: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """Export the collection to a portable snapshot bundle.
+
+        Args:
+            path: Destination file for the bundle
+            source_commit: Commit the indexed content was built from
+            root: Repository root the stored paths are made relative to,
+                defaults to the current directory
+
+        Returns:
+            Dict[str, Any]: Bundle path, document count and size in bytes
+        """
+        try:
+            response = self.send_command(
+                "export_snapshot",
+                {
+                    "path": str(Path(path).resolve()),
+                    "source_commit": source_commit,
+                    "root": str(root or Path.cwd()),
+                    "collection_name": self.config.collection_name,
+                },
+                timeout=SNAPSHOT_TIMEOUT,
+                retries=1,
+            )
+            if not response or "data" not in response:
+                raise Exception("Invalid response from service")
+            return response["data"]
+        except Exception as e:
+            logger.exception("Failed to export snapshot")
+            raise Exception(f"Failed to export snapshot: {str(e)}") from e
+
+    def import_snapshot(
+        self,
+        path: Path,
+        replace: bool = False,
+        force: bool = False,
+        root: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """Load a snapshot bundle into the collection without re-embedding.
+
+        Args:
+            path: Snapshot bundle to load
+            replace: Drop the existing collection contents first
+            force: Import even if the snapshot used another embedding model
+            root: Repository root the bundle's relative paths are placed
+                under, defaults to the current directory
+
+        Returns:
+            Dict[str, Any]: Imported count, embedding model and source commit
+        """
+        try:
+            response = self.send_command(
+                "import_snapshot",
+                {
+                    "path": str(Path(path).resolve()),
+                    "replace": replace,
+                    "force": force,
+                    "root": str(root or Path.cwd()),
+                    "collection_name": self.config.collection_name,
+                },
+                timeout=SNAPSHOT_TIMEOUT,
+                retries=1,
+            )
+            if not response or "data" not in response:
+                raise Exception("Invalid response from service")
+            return response["data"]
+        except Exception as e:
+            logger.exception("Failed to import snapshot")
+            raise Exception(f"Failed to import snapshot: {str(e)}") from e
+
+    def tune_index(
+        self,
+        k: Optional[int] = None,
+        n_queries: Optional[int] = None,
+        m_values: Optional[List[int]] = None,
+        construction_ef_values: Optional[List[int]] = None,
+        search_ef_values: Optional[List[int]] = None,
+        max_vectors: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Measure HNSW settings on a sample of the collection.
+
+        Args:
+            k: Neighbors per query for recall@k
+            n_queries: Number of sampled queries
+            m_values: ``M`` values to try
+            construction_ef_values: ``construction_ef`` values to try
+            search_ef_values: ``search_ef`` values to try
+            max_vectors: Maximum number of stored vectors to tune on
+
+        Returns:
+            Dict[str, Any]: Result 'rows', the 'current' settings and the
+            number of sampled 'vectors' out of the 'total'
+        """
+        try:
+            response = self.send_command(
+                "tune_index",
+                {
+                    "k": k,
+                    "n_queries": n_queries,
+                    "m_values": m_values,
+                    "construction_ef_values": construction_ef_values,
+                    "search_ef_values": search_ef_values,
+                    "max_vectors": max_vectors,
+                    "collection_name": self.config.collection_name,
+                },
+                timeout=TUNE_TIMEOUT,
+                retries=1,
+            )
+
+            if not response or "data" not in response:
+                raise Exception("Invalid response from service")
+            return response["data"]
+
+        except Exception as e:
+            logger.exception("Failed to tune index")
+            raise Exception(f"Failed to tune index: {str(e)}") from e
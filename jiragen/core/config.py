@@ -2,10 +2,12 @@
 
 import configparser
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from jiragen.core.cache import DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS
+from jiragen.core.routing import STAGES, StageRoute
 from jiragen.utils.data import get_config_dir
 
 DEFAULT_CONFIG = {
@@ -15,6 +17,36 @@ DEFAULT_CONFIG = {
         "api_token": "",
         "default_project": "",
         "default_assignee": "",
+        "page_size": "100",  # Issues per search request when fetching
+        "workers": "4",  # Concurrent requests per data type when fetching
+        # Comma-separated issue fields to fetch on top of those jiragen
+        # uses, e.g. "customfield_10020", stored in custom_fields
+        "epics_fields": "",
+        "tickets_fields": "",
+    },
+    "vector_store": {
+        # HNSW index settings, empty uses Chroma's defaults. Override per
+        # collection in a [vector_store.<collection_name>] section.
+        "hnsw_m": "",
+        "hnsw_construction_ef": "",
+        "hnsw_search_ef": "",
+    },
+    "cache": {
+        # Opt-in cache of LLM responses, disable per run with --no-cache
+        "enabled": "false",
+        "ttl_hours": "168",
+        "max_size_mb": "64",
+    },
+    "metadata": {
+        # Vote metadata from similar fetched tickets, asking the LLM only
+        # for fields below the confidence threshold
+        "local_prediction": "false",
+        "neighbors": "15",
+        "confidence_threshold": "0.6",
+    },
+    "ledger": {
+        # Record LLM calls, retrievals and ingest runs for `jiragen stats`
+        "enabled": "true",
     },
     "llm": {
         "model": "openai/gpt-4o",
@@ -22,6 +54,18 @@ DEFAULT_CONFIG = {
         "max_tokens": "2000",
         "api_base": "",  # Base URL for API endpoint
         "api_token": "",  # API token for authentication
+        "timeout": "60",  # Seconds per request
+        "max_retries": "3",  # Retries on rate limits and 5xx responses
+        "deadline": "",  # Seconds for all LLM calls of a run, empty for none
+        # Per-stage models, empty uses "model". Fallbacks are comma-separated
+        # models tried in order when a call fails or the preferred model's
+        # p95 latency over recent calls exceeds the stage's budget.
+        "generate_model": "",
+        "generate_fallback": "",
+        "generate_budget_ms": "",
+        "metadata_model": "",
+        "metadata_fallback": "",
+        "metadata_budget_ms": "",
     },
 }
 
@@ -95,3 +139,148 @@ class ConfigManager:
         with open(self.config_path, "w") as f:
             self.config.write(f)
         logger.info("Configuration updated and saved successfully")
+
+    def get_vector_store_settings(
+        self, collection_name: str
+    ) -> Dict[str, int]:
+        """Return the HNSW settings configured for a collection.
+
+        Values in ``[vector_store.<collection_name>]`` override those in
+        ``[vector_store]``; empty values are left out.
+
+        Args:
+            collection_name: Vector store collection, e.g. 'codebase_content'
+
+        Returns:
+            Dict[str, int]: Configured ``hnsw_*`` settings
+        """
+        settings = {}
+        for section in ("vector_store", f"vector_store.{collection_name}"):
+            if not self.config.has_section(section):
+                continue
+            for key in ("hnsw_m", "hnsw_construction_ef", "hnsw_search_ef"):
+                value = self.config.get(section, key, fallback="").strip()
+                if value:
+                    try:
+                        settings[key] = int(value)
+                    except ValueError:
+                        logger.warning(
+                            f"Ignoring invalid {section}.{key} = {value}"
+                        )
+        return settings
+
+    def get_cache_settings(self) -> Dict[str, Any]:
+        """Return the LLM response cache settings.
+
+        Returns:
+            Dict[str, Any]: 'enabled', 'ttl_seconds' and 'max_bytes'
+        """
+        section = "cache"
+        settings = {
+            "enabled": False,
+            "ttl_seconds": DEFAULT_TTL_SECONDS,
+            "max_bytes": DEFAULT_MAX_BYTES,
+        }
+        if not self.config.has_section(section):
+            return settings
+        try:
+            settings["enabled"] = self.config.getboolean(
+                section, "enabled", fallback=False
+            )
+            ttl_hours = self.config.get(section, "ttl_hours", fallback="")
+            if ttl_hours.strip():
+                settings["ttl_seconds"] = float(ttl_hours) * 3600
+            max_size_mb = self.config.get(section, "max_size_mb", fallback="")
+            if max_size_mb.strip():
+                settings["max_bytes"] = int(float(max_size_mb) * 1024 * 1024)
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid cache setting: {e}")
+        return settings
+
+    def get_metadata_settings(self) -> Dict[str, Any]:
+        """Return the local metadata prediction settings.
+
+        Returns:
+            Dict[str, Any]: 'local_prediction', 'neighbors' and
+            'confidence_threshold'
+        """
+        defaults = DEFAULT_CONFIG["metadata"]
+        section = "metadata"
+        settings = {
+            "local_prediction": False,
+            "neighbors": int(defaults["neighbors"]),
+            "confidence_threshold": float(defaults["confidence_threshold"]),
+        }
+        if not self.config.has_section(section):
+            return settings
+        try:
+            settings["local_prediction"] = self.config.getboolean(
+                section, "local_prediction", fallback=False
+            )
+            settings["neighbors"] = self.config.getint(
+                section, "neighbors", fallback=settings["neighbors"]
+            )
+            settings["confidence_threshold"] = self.config.getfloat(
+                section,
+                "confidence_threshold",
+                fallback=settings["confidence_threshold"],
+            )
+        except ValueError as e:
+            logger.warning(f"Ignoring invalid metadata setting: {e}")
+        return settings
+
+    def get_fetch_fields(self) -> Dict[str, List[str]]:
+        """Return the extra fields configured for each fetched issue type.
+
+        Returns:
+            Dict[str, List[str]]: Comma-separated ``<data_type>_fields`` of
+            the JIRA section, per data type that has any
+        """
+        fields = {}
+        for data_type in ("epics", "tickets"):
+            value = self.config.get("JIRA", f"{data_type}_fields", fallback="")
+            names = [name.strip() for name in value.split(",") if name.strip()]
+            if names:
+                fields[data_type] = names
+        return fields
+
+    def get_routes(self) -> Dict[str, StageRoute]:
+        """Return the models configured for each generation stage.
+
+        A stage uses ``<stage>_model``, or ``model`` if empty, followed by
+        the comma-separated ``<stage>_fallback`` models, and prefers the
+        next model once one's p95 latency exceeds ``<stage>_budget_ms``.
+
+        Returns:
+            Dict[str, StageRoute]: Route per stage in ``STAGES``
+        """
+        section = "llm"
+        default_model = self.config.get(
+            section, "model", fallback=DEFAULT_CONFIG["llm"]["model"]
+        )
+        routes = {}
+        for stage in STAGES:
+            model = self.config.get(
+                section, f"{stage}_model", fallback=""
+            ).strip()
+            fallback = self.config.get(
+                section, f"{stage}_fallback", fallback=""
+            )
+            models = [model or default_model] + [
+                name.strip() for name in fallback.split(",") if name.strip()
+            ]
+            budget = self.config.get(
+                section, f"{stage}_budget_ms", fallback=""
+            ).strip()
+            try:
+                budget_ms = float(budget) if budget else None
+            except ValueError:
+                logger.warning(
+                    f"Ignoring invalid {section}.{stage}_budget_ms = {budget}"
+                )
+                budget_ms = None
+            # Keep the order but try every model only once
+            routes[stage] = StageRoute(
+                models=list(dict.fromkeys(models)), budget_ms=budget_ms
+            )
+        return routes
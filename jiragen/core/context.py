@@ -0,0 +1,180 @@
+"""Token-aware packing of retrieved documents into the prompt context."""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import litellm
+from loguru import logger
+
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+MIN_TRUNCATED_TOKENS = 64  # Don't bother adding fragments smaller than this
+
+
+@lru_cache(maxsize=32)
+def get_context_window(model: str) -> Optional[int]:
+    """Return the model's input context window in tokens, if litellm knows it."""
+    try:
+        info = litellm.get_model_info(model)
+        return info.get("max_input_tokens") or info.get("max_tokens")
+    except Exception as e:
+        logger.debug(f"Unknown context window for {model}: {e}")
+        return None
+
+
+def format_document(doc: Dict[str, Any]) -> str:
+    """Format a retrieved document for the prompt.
+
+    Documents cut down to their best matching line windows carry the ranges
+    under 'snippets', with the windows' text back to back in 'content'. Each
+    window is then shown with its line range.
+    """
+    path = doc["metadata"].get("file_path")
+    snippets = doc.get("snippets")
+    whole = not snippets or (
+        len(snippets) == 1
+        and snippets[0]["start_line"] == 1
+        and snippets[0]["end_line"] >= doc.get("total_lines", 0)
+    )
+    if whole:
+        return f"File: {path}\n{doc['content']}"
+    lines = doc["content"].splitlines(keepends=True)
+    parts, offset = [], 0
+    for snippet in snippets:
+        count = snippet["end_line"] - snippet["start_line"] + 1
+        text = "".join(lines[offset : offset + count]).rstrip("\n")
+        offset += count
+        parts.append(
+            f"File: {path} (lines {snippet['start_line']}-"
+            f"{snippet['end_line']})\n{text}"
+        )
+    return "\n\n".join(parts)
+
+
+class ContextPacker:
+    """Fits retrieved documents into a token budget.
+
+    Documents are chosen greedily by relevance per token, where relevance is
+    the reciprocal of the document's rank in its result list, so one huge
+    file no longer crowds out several better ones. A document that does not
+    fit whole is truncated at a line boundary to fill the remaining budget.
+
+    Attributes:
+        model: Model whose tokenizer is used for counting
+        max_context_length: Most tokens of context packed into a prompt,
+            also the window assumed when the model's is unknown
+    """
+
+    def __init__(self, model: str, max_context_length: int = 128000):
+        self.model = model
+        self.max_context_length = max_context_length
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with the model's tokenizer."""
+        if not text:
+            return 0
+        try:
+            return litellm.token_counter(model=self.model, text=text)
+        except Exception as e:
+            logger.debug(f"Token counting failed for {self.model}: {e}")
+            return len(text) // 4 + 1
+
+    def budget(self, prompt_tokens: int, completion_tokens: int) -> int:
+        """Return the tokens left for context, at most ``max_context_length``.
+
+        Args:
+            prompt_tokens: Tokens used by the prompt without any context
+            completion_tokens: Tokens reserved for the completion
+        """
+        window = get_context_window(self.model) or self.max_context_length
+        left = window - prompt_tokens - completion_tokens
+        return max(0, min(left, self.max_context_length))
+
+    def _truncate(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """Cut text at the last line boundary that fits in ``max_tokens``."""
+        lines = text.splitlines(keepends=True)
+        low, high = 0, len(lines)
+        # Binary search on the number of whole lines kept
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count_tokens("".join(lines[:mid])) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        truncated = "".join(lines[:low])
+        return truncated, self.count_tokens(truncated)
+
+    def pack(
+        self, sections: Dict[str, List[Dict[str, Any]]], budget: int
+    ) -> Dict[str, str]:
+        """Select and format documents from several result lists.
+
+        Args:
+            sections: Ranked documents ('content' and 'metadata', and
+                'snippets' if cut down to line windows) per section
+            budget: Total tokens available for all sections
+
+        Returns:
+            Formatted context per section, documents kept in rank order
+        """
+        candidates = []
+        for section, docs in sections.items():
+            for rank, doc in enumerate(docs or []):
+                content = doc.get("content")
+                metadata = doc.get("metadata")
+                if content is None or metadata is None:
+                    logger.warning(f"Skipping invalid document: {doc}")
+                    continue
+                text = format_document(doc)
+                tokens = self.count_tokens(text) + 1
+                candidates.append(
+                    {
+                        "section": section,
+                        "rank": rank,
+                        "text": text,
+                        "tokens": tokens,
+                        "relevance": 1.0 / (rank + 1),
+                    }
+                )
+
+        candidates.sort(
+            key=lambda c: c["relevance"] / c["tokens"], reverse=True
+        )
+        separator_tokens = self.count_tokens(CONTEXT_SEPARATOR)
+        remaining = budget
+        selected = []
+        truncated = skipped = 0
+        for candidate in candidates:
+            cost = candidate["tokens"] + separator_tokens
+            if cost <= remaining:
+                selected.append(candidate)
+                remaining -= cost
+                continue
+            available = remaining - separator_tokens
+            if available >= MIN_TRUNCATED_TOKENS:
+                text, tokens = self._truncate(candidate["text"], available)
+                if tokens:
+                    selected.append({**candidate, "text": text})
+                    remaining -= tokens + separator_tokens
+                    truncated += 1
+                    continue
+            skipped += 1
+
+        if truncated or skipped:
+            logger.info(
+                f"Context budget of {budget} tokens: truncated {truncated} "
+                f"and skipped {skipped} documents"
+            )
+        logger.debug(f"Packed context uses {budget - remaining} tokens")
+
+        packed = {}
+        for section in sections:
+            chosen = sorted(
+                (c for c in selected if c["section"] == section),
+                key=lambda c: c["rank"],
+            )
+            packed[section] = (
+                CONTEXT_SEPARATOR.join(c["text"] for c in chosen)
+                if chosen
+                else "No relevant context found"
+            )
+        return packed
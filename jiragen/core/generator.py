@@ -1,12 +1,31 @@
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
+import httpx
+import litellm
 from litellm import completion
 from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from jiragen.core.cache import ResponseCache, cache_key
 from jiragen.core.client import VectorStoreClient, VectorStoreConfig
+from jiragen.core.context import ContextPacker, get_context_window
+from jiragen.core.ledger import estimate_cost, record
+from jiragen.core.retry import Deadline, retry_delay
+from jiragen.core.routing import ModelRouter
+from jiragen.services.filters import parse_scopes
+
+# Template, LLM warm-up and the store for each collection
+GENERATE_WORKERS = 4
+# Idle provider connections kept open by the shared HTTP client
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 120.0
+
+STRUCTURED_INSTRUCTIONS = """Respond with a JSON object. Put the complete ticket, following the template, in "content" as markdown.
+Classify the ticket in the remaining fields: issue_type, priority, labels (technical tags such as "frontend" or "database"), story_points (Fibonacci number from 1 to 13, or null) and components (affected system components or modules)."""
 
 
 class LLMConfig(BaseModel):
@@ -20,6 +39,9 @@ class LLMConfig(BaseModel):
     max_tokens: int = 2000
     temperature: float = 0.7
     top_p: float = 0.95
+    timeout: float = 60.0  # Seconds per request
+    max_retries: int = 3  # Retries on rate limits and 5xx responses
+    deadline: Optional[float] = None  # Seconds for all calls of a run
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True, extra="allow", validate_assignment=True
@@ -38,10 +60,28 @@ class LLMConfig(BaseModel):
                 self.api_base = "http://localhost:11434"
         return self
 
+    def for_model(self, model: str) -> "LLMConfig":
+        """Return this configuration for another model.
+
+        The API base and token belong to the configured provider, so they
+        are only kept for models of the same provider.
+        """
+        if model == self.model:
+            return self
+        values = self.model_dump()
+        values["model"] = model
+        if model.split("/")[0] != self.model.split("/")[0]:
+            values["api_base"] = None
+            values["api_token"] = None
+        return LLMConfig(**values)
+
     def to_request_params(self) -> Dict[str, Any]:
         params = self.model_dump()
         params.pop("api_base", None)
         params.pop("api_token", None)  # Remove API token from params
+        # Client behaviour, not part of the request or its cache key
+        for name in ("timeout", "max_retries", "deadline"):
+            params.pop(name, None)
         logger.debug(f"LLM parameters: {params}")
         return params
 
@@ -49,24 +89,195 @@ class LLMConfig(BaseModel):
 class GeneratorConfig(BaseModel):
     template_path: Path
     llm_config: LLMConfig
-    max_context_length: int = 128000
+    max_context_length: int = 128000  # Tokens of context, not characters
+    n_results: int = 5
+    hybrid_search: bool = True
+    rerank: bool = False
+    rerank_fetch_k: int = 50
+    rerank_budget_ms: float = 250
+    mmr: bool = False  # Opt-in, costs recall on the retrieval benchmark
+    mmr_lambda: float = 0.5
+    dedup_threshold: Optional[float] = 0.95
+    full_documents: bool = False  # Otherwise only the best line windows
+    snippet_lines: int = 40
+    max_snippets: int = 3
+    snippet_scoring: str = "lexical"  # Or "embedding"
+    scopes: List[str] = Field(default_factory=list)
+    response_cache: Optional[ResponseCache] = None
+    metadata_predictor: Optional[Any] = None  # MetadataPredictor
+    metadata_confidence_threshold: float = 0.6
+    router: Optional[ModelRouter] = None  # Per-stage models and fallbacks
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+def stage_llm_configs(
+    config: LLMConfig, router: Optional[ModelRouter], stage: str
+) -> List[LLMConfig]:
+    """Return the LLM configurations to try for a stage, in order.
+
+    Args:
+        config: Configured LLM settings, used as is without a route
+        router: Router choosing the stage's models
+        stage: 'generate' or 'metadata'
+
+    Returns:
+        List[LLMConfig]: Preferred configuration followed by its fallbacks
+    """
+    if router is None or stage not in router.routes:
+        return [config]
+    return [config.for_model(model) for model in router.candidates(stage)]
+
+
+def open_retrieval_stores(
+    runtime_dir: Path, connect: bool = True
+) -> Dict[str, VectorStoreClient]:
+    """Return clients of the JIRA and codebase collections.
+
+    Args:
+        runtime_dir: Runtime directory holding both vector databases
+        connect: Connect the clients now, otherwise the caller has to
+
+    Returns:
+        Dict[str, VectorStoreClient]: Clients keyed by 'jira' and 'codebase'
+    """
+    return {
+        "jira": VectorStoreClient(
+            VectorStoreConfig(
+                collection_name="jira_content",
+                db_path=runtime_dir / "jira_data" / "vector_db",
+            ),
+            connect=connect,
+        ),
+        "codebase": VectorStoreClient(
+            VectorStoreConfig(
+                collection_name="codebase_content",
+                db_path=runtime_dir / "codebase_data" / "vector_db",
+            ),
+            connect=connect,
+        ),
+    }
+
+
+_clients: Dict[str, "LiteLLMClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(
+    config: LLMConfig, cache: Optional[ResponseCache] = None
+) -> "LiteLLMClient":
+    """Return the process-wide client for an LLM configuration.
+
+    Clients are reused across generations, metadata extraction and batch
+    items, and all of them send requests through one pooled HTTP client, so
+    provider connections stay open between calls.
+
+    Args:
+        config: LLM configuration
+        cache: Response cache used by the client
+
+    Returns:
+        LiteLLMClient: Shared client
+    """
+    key = f"{config.model_dump_json()}:{id(cache)}"
+    with _clients_lock:
+        if litellm.client_session is None:
+            litellm.client_session = httpx.Client(
+                # Requests pass their own timeout, see LLMConfig.timeout
+                timeout=None,
+                limits=httpx.Limits(
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            )
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = LiteLLMClient(config, cache)
+        return client
+
+
 class LiteLLMClient:
-    def __init__(self, config: LLMConfig):
+    """Client for any model supported by LiteLLM.
+
+    Requests time out after ``config.timeout`` seconds and rate limits and
+    5xx responses are retried up to ``config.max_retries`` times with
+    exponential backoff and jitter. Calls given a ``Deadline`` never wait
+    or retry past it. Use ``get_llm_client`` to share clients.
+    """
+
+    def __init__(
+        self, config: LLMConfig, cache: Optional[ResponseCache] = None
+    ):
         self.config = config
         self.api_base = config.api_base
         self.api_token = config.api_token
+        self.cache = cache
+        self._local = threading.local()
 
         logger.info(
             f"Initialized LiteLLM client with model: {config.model} at {config.api_base}"
         )
 
+    @property
+    def last_call(self) -> Dict[str, Any]:
+        """Ledger fields of this thread's last call."""
+        return getattr(self._local, "last_call", {})
+
+    @property
+    def stream_stats(self) -> Dict[str, float]:
+        """Statistics of this thread's last stream."""
+        return getattr(self._local, "stream_stats", {})
+
+    @stream_stats.setter
+    def stream_stats(self, value: Dict[str, float]) -> None:
+        self._local.stream_stats = value
+
+    def _completion(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+        **kwargs,
+    ):
+        """Send a request, retrying rate limits and transient errors.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before a response
+        """
+        deadline = deadline or Deadline(self.config.deadline)
+        attempt = self._local.retries = 0
+        while True:
+            try:
+                return completion(
+                    messages=[{"role": "user", "content": prompt}],
+                    api_base=self.api_base,
+                    api_key=self.api_token,
+                    timeout=deadline.timeout(self.config.timeout),
+                    **params,
+                    **kwargs,
+                )
+            except Exception as e:
+                delay = retry_delay(e, attempt)
+                remaining = deadline.remaining()
+                if (
+                    delay is None
+                    or attempt >= self.config.max_retries
+                    or (remaining is not None and delay >= remaining)
+                ):
+                    raise
+                attempt = self._local.retries = attempt + 1
+                logger.warning(
+                    f"LLM request to {self.config.model} failed ({e}), "
+                    f"retry {attempt}/{self.config.max_retries} "
+                    f"in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
     def generate(
         self,
         prompt: str,
         response_format: Optional[BaseModel] = None,
+        deadline: Optional[Deadline] = None,
+        stage: Optional[str] = None,
         **kwargs,
     ) -> str:
         start_time = time.time()
@@ -83,23 +294,206 @@ class LiteLLMClient:
             else:
                 pass
 
-            response = completion(
-                messages=[{"role": "user", "content": prompt}],
-                api_base=self.api_base,
-                api_key=self.api_token,
-                **params,
-            )
+            key = self._cache_key(prompt, params, response_format)
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._record(start_time, cache_hit=True, stage=stage)
+                return cached
+
+            response = self._completion(prompt, params, deadline)
 
             generation_time = time.time() - start_time
             logger.info(f"Generated response in {generation_time:.2f} seconds")
 
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            if key and content is not None:
+                self.cache.set(key, content)
+            usage = getattr(response, "usage", None)
+            self._record(
+                start_time,
+                prompt_tokens=getattr(usage, "prompt_tokens", None),
+                completion_tokens=getattr(usage, "completion_tokens", None),
+                stage=stage,
+            )
+            return content
 
         except Exception as e:
+            self._record(start_time, status="error", stage=stage)
             error_msg = f"LiteLLM API request failed: {str(e)}"
             logger.error(error_msg, exc_info=True)
             raise RuntimeError(error_msg) from e
 
+    def _record(
+        self,
+        start_time: float,
+        status: str = "ok",
+        cache_hit: bool = False,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        **fields,
+    ) -> None:
+        """Add the call to the ledger with its tokens and estimated cost."""
+        cost = None
+        if prompt_tokens is not None and completion_tokens is not None:
+            cost = estimate_cost(
+                self.config.model, prompt_tokens, completion_tokens
+            )
+        retries = 0 if cache_hit else getattr(self._local, "retries", 0)
+        self._local.last_call = {
+            "model": self.config.model,
+            "status": status,
+            "cache_hit": cache_hit,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost": cost,
+            "latency_ms": (time.time() - start_time) * 1000,
+            "retries": retries,
+            **fields,
+        }
+        record("llm", **self._local.last_call)
+
+    def _cache_key(
+        self,
+        prompt: str,
+        params: Dict[str, Any],
+        response_format: Optional[BaseModel] = None,
+    ) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return cache_key(self.config.model, params, prompt, response_format)
+
+    def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        cached = self.cache.get(key)
+        logger.info(
+            f"LLM response cache {'hit' if cached is not None else 'miss'} "
+            f"for {self.config.model}"
+        )
+        return cached
+
+    def generate_stream(
+        self,
+        prompt: str,
+        deadline: Optional[Deadline] = None,
+        stage: Optional[str] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """Generate a response, yielding text chunks as they arrive.
+
+        Joining the yielded chunks gives the same string ``generate`` returns.
+        A cached response is yielded as a single chunk.
+        Time to first token and throughput are logged once the stream ends
+        and kept in ``stream_stats``. Only opening the stream is retried,
+        never a stream that already produced output.
+
+        Args:
+            prompt: Prompt sent as the user message
+            deadline: Time budget shared with the other calls of the run
+            stage: Stage of the run the call is recorded under
+            **kwargs: Overrides for the configured request parameters
+
+        Yields:
+            str: Non-empty pieces of the response content
+
+        Raises:
+            RuntimeError: If the request or the stream fails
+        """
+        start_time = time.time()
+        self.stream_stats = {}
+
+        params = self.config.to_request_params()
+        if kwargs:
+            logger.debug(f"Overriding default parameters with: {kwargs}")
+            params.update(kwargs)
+
+        key = self._cache_key(prompt, params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.stream_stats = {"ttft_ms": (time.time() - start_time) * 1000}
+            self._record(start_time, cache_hit=True, stream=True, stage=stage)
+            yield cached
+            return
+
+        first_token_time = None
+        chunks: List[str] = []
+        try:
+            response = self._completion(prompt, params, deadline, stream=True)
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if not text:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.time()
+                chunks.append(text)
+                yield text
+        except Exception as e:
+            self._record(start_time, status="error", stream=True, stage=stage)
+            error_msg = f"LiteLLM API request failed: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            raise RuntimeError(error_msg) from e
+
+        generation_time = time.time() - start_time
+        if first_token_time is None:
+            logger.warning("Stream ended without any content")
+            self._record(start_time, stream=True, stage=stage)
+            return
+        if key:
+            self.cache.set(key, "".join(chunks))
+        try:
+            tokens = litellm.token_counter(
+                model=self.config.model, text="".join(chunks)
+            )
+        except Exception:
+            tokens = len(chunks)
+        ttft = first_token_time - start_time
+        decode_time = generation_time - ttft
+        self.stream_stats = {
+            "ttft_ms": ttft * 1000,
+            "tokens": tokens,
+            "tokens_per_second": tokens / decode_time if decode_time else 0.0,
+        }
+        logger.info(
+            f"Streamed {tokens} tokens in {generation_time:.2f} seconds "
+            f"(first token after {ttft:.2f}s, "
+            f"{self.stream_stats['tokens_per_second']:.1f} tokens/s)"
+        )
+        try:
+            prompt_tokens = litellm.token_counter(
+                model=self.config.model, text=prompt
+            )
+        except Exception:
+            prompt_tokens = None
+        self._record(
+            start_time,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=tokens,
+            ttft_ms=ttft * 1000,
+            stream=True,
+            stage=stage,
+        )
+
+    def warm_up(self) -> None:
+        """Do the client-side setup of a first request ahead of time.
+
+        Resolves the provider and loads the model's tokenizer and context
+        window, which prompt packing and the first request would otherwise
+        pay for on the critical path. Failures are logged and ignored.
+        """
+        start_time = time.time()
+        try:
+            litellm.get_llm_provider(self.config.model, api_base=self.api_base)
+            get_context_window(self.config.model)
+            litellm.token_counter(model=self.config.model, text="warm up")
+        except Exception as e:
+            logger.debug(f"LLM warm-up failed for {self.config.model}: {e}")
+            return
+        logger.debug(
+            f"Warmed up LLM client in {time.time() - start_time:.2f}s"
+        )
+
     def __enter__(self):
         return self
 
@@ -116,67 +510,203 @@ class IssueGenerator:
     Attributes:
         vector_store: Vector store client for retrieving similar documents
         config: Generator configuration
+        timings: Per-stage durations in milliseconds of the last generation,
+            and the model that generated it under 'generate_model'
+        query_embedding: Embedding of the last message, reused for every
+            lookup made while generating it
+        deadline: Time budget of the LLM calls of the last generation
+        stores: Connected JIRA and codebase clients to retrieve from, by
+            default every generation opens its own
     """
 
     def __init__(
         self,
         vector_store: "VectorStoreClient",
         config: GeneratorConfig,  # noqa: F821
+        stores: Optional[Dict[str, VectorStoreClient]] = None,
     ) -> None:
         self.vector_store = vector_store
         self.config = config
+        self.stores = stores
+        self.timings: Dict[str, Any] = {}
+        self.query_embedding: Optional[List[float]] = None
+        self.deadline = Deadline(config.llm_config.deadline)
         logger.info(f"Initialized IssueGenerator with config: {config}")
 
-    def _prepare_context(
-        self, similar_docs: List[Dict[str, Any]], context_type: str
+    def _timed(self, stage: str, func: Callable[..., Any], *args, **kwargs):
+        """Call ``func`` and record its duration under ``stage``."""
+        start_time = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.timings[stage] = (time.time() - start_time) * 1000
+
+    def _call_llm(
+        self,
+        configs: List[LLMConfig],
+        prompt: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        response_format: Optional[type[BaseModel]] = None,
     ) -> str:
-        """Prepare context from similar documents with length limit.
+        """Send the prompt to the stage's models in order until one succeeds.
+
+        A model is only given up on if it has not streamed anything yet and
+        the deadline leaves time for the next one.
 
         Args:
-            similar_docs: List of similar documents with their content and metadata
-            context_type: Type of context being prepared ('JIRA' or 'codebase')
+            configs: Configurations from ``stage_llm_configs``
+            prompt: Complete prompt
+            on_token: Callback receiving streamed chunks
+            response_format: Structured response to ask for
 
         Returns:
-            Formatted string containing the context with file paths and content
+            Response of the first model that succeeded
         """
-        contexts = []
-        total_length = 0
-        skipped_docs = 0
-
-        if similar_docs is None:
-            logger.debug(f"No relevant {context_type} context found")
-            return "No relevant context found"
+        router = self.config.router
+        for i, llm_config in enumerate(configs):
+            llm = get_llm_client(llm_config, self.config.response_cache)
+            self.timings["generate_model"] = llm_config.model
+            chunks: List[str] = []
+            try:
+                with llm:
+                    if on_token is None:
+                        content = llm.generate(
+                            prompt,
+                            response_format=response_format,
+                            deadline=self.deadline,
+                            stage="generate",
+                            temperature=llm_config.temperature,
+                            max_tokens=llm_config.max_tokens,
+                        )
+                    else:
+                        for chunk in llm.generate_stream(
+                            prompt,
+                            deadline=self.deadline,
+                            stage="generate",
+                            temperature=llm_config.temperature,
+                            max_tokens=llm_config.max_tokens,
+                        ):
+                            chunks.append(chunk)
+                            on_token(chunk)
+                        content = "".join(chunks)
+                        if "ttft_ms" in llm.stream_stats:
+                            self.timings["ttft_ms"] = llm.stream_stats[
+                                "ttft_ms"
+                            ]
+            except Exception as e:
+                if (
+                    chunks
+                    or i + 1 == len(configs)
+                    or self.deadline.remaining() == 0
+                ):
+                    raise
+                logger.warning(
+                    f"{llm_config.model} failed ({e}), falling back to "
+                    f"{configs[i + 1].model}"
+                )
+                continue
+            if router is not None:
+                router.observe(
+                    "generate",
+                    llm_config.model,
+                    llm.last_call.get("latency_ms", 0.0),
+                    cache_hit=llm.last_call.get("cache_hit", False),
+                )
+            return content
+        raise RuntimeError("No model configured")  # configs is never empty
 
-        logger.debug(
-            f"Preparing {context_type} context from {len(similar_docs)} documents"
-        )
+    def _retrieve(
+        self,
+        store: VectorStoreClient,
+        message: str,
+        context_type: str,
+        embedding: Optional[List[float]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query a store and record its retrieval timings.
 
-        for doc in similar_docs:
-            logger.debug(f"Simlar doc for {context_type} is : {doc}")
-            content = doc.get("content")
-            metadata = doc.get("metadata")
+        Args:
+            store: Store to query
+            message: User's request for the ticket
+            context_type: Prefix for the recorded timings ('jira' or 'codebase')
+            embedding: Precomputed embedding of the message
+            where: Metadata filter restricting the search
 
-            if content is None or metadata is None:
-                logger.warning(f"Skipping invalid document: {doc}")
-                continue
+        Returns:
+            List of similar documents
+        """
+        start_time = time.time()
+        docs = store.query_similar(
+            message,
+            n_results=self.config.n_results,
+            hybrid=self.config.hybrid_search,
+            rerank=self.config.rerank,
+            rerank_budget_ms=self.config.rerank_budget_ms,
+            fetch_k=self.config.rerank_fetch_k if self.config.rerank else None,
+            mmr=self.config.mmr,
+            mmr_lambda=self.config.mmr_lambda,
+            dedup_threshold=self.config.dedup_threshold,
+            embedding=embedding,
+            where=where,
+            full_document=self.config.full_documents,
+            snippet_lines=self.config.snippet_lines,
+            max_snippets=self.config.max_snippets,
+            snippet_scoring=self.config.snippet_scoring,
+        )
+        self.timings[f"{context_type}_retrieval_ms"] = (
+            time.time() - start_time
+        ) * 1000
+        record(
+            "retrieval",
+            collection=store.config.collection_name,
+            results=len(docs),
+            latency_ms=self.timings[f"{context_type}_retrieval_ms"],
+        )
+        for stage, duration in store.last_query_timings.items():
+            self.timings[f"{context_type}_{stage}"] = duration
+        return docs
 
-            if total_length + len(content) > self.config.max_context_length:
-                skipped_docs += 1
-                logger.debug(
-                    f"Skipped document due to length limit: {metadata['file_path']}"
-                )
-                continue
+    def _prepare_context(
+        self,
+        message: str,
+        jira_docs: List[Dict[str, Any]],
+        codebase_docs: List[Dict[str, Any]],
+        template: str,
+        structured: bool = False,
+        model: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Pack JIRA and codebase documents into the model's token budget.
 
-            contexts.append(f"File: {metadata['file_path']}\n{content}")
-            total_length += len(content)
-            logger.debug(f"Added content from: {metadata['file_path']}")
+        The budget is the model's context window minus the prompt without
+        context and the tokens reserved for the completion.
 
-        if skipped_docs:
-            logger.info(
-                f"Skipped {skipped_docs} documents due to context length limit"
-            )
+        Args:
+            message: User's request for the ticket
+            jira_docs: Ranked similar JIRA documents
+            codebase_docs: Ranked similar codebase documents
+            template: Template to follow for ticket generation
+            structured: Whether the prompt asks for a structured response
+            model: Model the prompt is sent to, by default the configured one
 
-        return "\n\n---\n\n".join(contexts)
+        Returns:
+            Formatted context keyed by 'jira' and 'codebase'
+        """
+        packer = ContextPacker(
+            model or self.config.llm_config.model,
+            self.config.max_context_length,
+        )
+        prompt_tokens = packer.count_tokens(
+            self._create_prompt(message, "", "", template, structured)
+        )
+        budget = packer.budget(
+            prompt_tokens, self.config.llm_config.max_tokens
+        )
+        logger.debug(
+            f"Context budget: {budget} tokens ({prompt_tokens} prompt tokens)"
+        )
+        return packer.pack(
+            {"jira": jira_docs, "codebase": codebase_docs}, budget
+        )
 
     def _create_prompt(
         self,
@@ -184,6 +714,7 @@ class IssueGenerator:
         jira_context: str,
         codebase_context: str,
         template: str,
+        structured: bool = False,
     ) -> str:
         """Create a prompt incorporating both JIRA and codebase context.
 
@@ -192,6 +723,8 @@ class IssueGenerator:
             jira_context: Relevant context from JIRA history
             codebase_context: Relevant context from the codebase
             template: Template to follow for ticket generation
+            structured: Ask for the ticket and its metadata as JSON instead
+                of the bare ticket
 
         Returns:
             Complete prompt for the LLM to generate a ticket
@@ -221,12 +754,18 @@ Instructions:
 Using the previous context, generate a JIRA ticket for the following Issue:
 {message}
 
-Generated ticket:"""
+{STRUCTURED_INSTRUCTIONS if structured else "Generated ticket:"}"""
 
         logger.debug(f"Created prompt of length: {len(prompt)}")
         return prompt
 
-    def generate(self, message: str) -> str:
+    def generate(
+        self,
+        message: str,
+        on_token: Optional[Callable[[str], None]] = None,
+        response_format: Optional[type[BaseModel]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> str:
         """Generate a JIRA ticket using RAG and template-guided generation.
 
         Retrieves relevant context from both JIRA history and codebase,
@@ -234,59 +773,142 @@ Generated ticket:"""
 
         Args:
             message: User's request for the ticket
+            on_token: If given, the response is streamed and each chunk is
+                passed to this callback as it arrives
+            response_format: Model with a 'content' field for the ticket and
+                further fields to fill in; the response is returned as JSON
+            deadline: Time budget to share with earlier calls of the run,
+                by default a new one of ``llm_config.deadline`` seconds
 
         Returns:
-            Generated ticket content following the template
+            Generated ticket content following the template, or the JSON
+            response if ``response_format`` is given
 
         Raises:
             RuntimeError: If ticket generation fails
         """
+        if on_token is not None and response_format is not None:
+            raise ValueError("Structured responses cannot be streamed")
         logger.info(f"Generating ticket for message: {message}")
         start_time = time.time()
+        self.timings = {}
+        self.query_embedding = None
+        self.deadline = deadline or Deadline(self.config.llm_config.deadline)
 
         try:
-            template = self.config.template_path.read_text(encoding="utf-8")
-            logger.debug(f"Loaded template of length: {len(template)}")
-
-            runtime_dir = self.vector_store.config.db_path.parent.parent
+            stores = self.stores
+            if stores is None:
+                runtime_dir = self.vector_store.config.db_path.parent.parent
+                stores = open_retrieval_stores(runtime_dir, connect=False)
+            jira_store, codebase_store = stores["jira"], stores["codebase"]
+            filters = parse_scopes(self.config.scopes)
+            llm_configs = stage_llm_configs(
+                self.config.llm_config, self.config.router, "generate"
+            )
+            # Only the preferred model is warmed up, fallbacks are rare
+            llm = get_llm_client(llm_configs[0], self.config.response_cache)
+
+            # Template loading, LLM warm-up, connecting both stores and both
+            # retrievals overlap; only the query embedding has to precede
+            # the two searches
+            with ThreadPoolExecutor(max_workers=GENERATE_WORKERS) as executor:
+                template_future = executor.submit(
+                    self._timed,
+                    "template_ms",
+                    self.config.template_path.read_text,
+                    encoding="utf-8",
+                )
+                warm_up_future = executor.submit(
+                    self._timed, "llm_warm_up_ms", llm.warm_up
+                )
+                jira_init = codebase_init = None
+                if self.stores is None:
+                    jira_init = executor.submit(
+                        self._timed, "jira_init_ms", jira_store.connect
+                    )
+                    codebase_init = executor.submit(
+                        self._timed, "codebase_init_ms", codebase_store.connect
+                    )
+
+                if jira_init is not None:
+                    jira_init.result()
+                # Both collections share one embedding model, embed only once
+                embed_start = time.time()
+                try:
+                    self.query_embedding = jira_store.embed_query(message)
+                except Exception as e:
+                    logger.warning(f"Falling back to text queries: {e}")
+                    self.query_embedding = None
+                self.timings["embed_ms"] = (time.time() - embed_start) * 1000
+
+                jira_future = executor.submit(
+                    self._retrieve,
+                    jira_store,
+                    message,
+                    "jira",
+                    self.query_embedding,
+                    filters["jira"],
+                )
+                if codebase_init is not None:
+                    codebase_init.result()
+                codebase_future = executor.submit(
+                    self._retrieve,
+                    codebase_store,
+                    message,
+                    "codebase",
+                    self.query_embedding,
+                    filters["codebase"],
+                )
 
-            jira_store = VectorStoreClient(
-                VectorStoreConfig(
-                    collection_name="jira_content",
-                    db_path=runtime_dir / "jira_data" / "vector_db",
+                template = template_future.result()
+                logger.debug(f"Loaded template of length: {len(template)}")
+                jira_docs = jira_future.result()
+                logger.info(
+                    f"Retrieved {len(jira_docs)} similar JIRA documents"
                 )
-            )
-            jira_store.initialize_store()  # Ensure collection is initialized
-            jira_docs = jira_store.query_similar(message)
-            logger.info(f"Retrieved {len(jira_docs)} similar JIRA documents")
-            jira_context = self._prepare_context(jira_docs, "JIRA")
-
-            codebase_store = VectorStoreClient(
-                VectorStoreConfig(
-                    collection_name="codebase_content",
-                    db_path=runtime_dir / "codebase_data" / "vector_db",
+                codebase_docs = codebase_future.result()
+                logger.info(
+                    f"Retrieved {len(codebase_docs)} similar codebase documents"
                 )
+                warm_up_future.result()
+            self.timings["gather_ms"] = (time.time() - start_time) * 1000
+
+            context_start = time.time()
+            structured = response_format is not None
+            context = self._prepare_context(
+                message,
+                jira_docs,
+                codebase_docs,
+                template,
+                structured,
+                llm_configs[0].model,
             )
-            codebase_store.initialize_store()  #
-            codebase_docs = codebase_store.query_similar(message)
-            logger.info(
-                f"Retrieved {len(codebase_docs)} similar codebase documents"
-            )
-            codebase_context = self._prepare_context(codebase_docs, "codebase")
+            self.timings["context_ms"] = (time.time() - context_start) * 1000
 
             prompt = self._create_prompt(
-                message, jira_context, codebase_context, template
+                message,
+                context["jira"],
+                context["codebase"],
+                template,
+                structured,
             )
-            llm_config = self.config.llm_config
-            with LiteLLMClient(llm_config) as llm:
-                ticket_content = llm.generate(
-                    prompt,
-                    temperature=llm_config.temperature,
-                    max_tokens=llm_config.max_tokens,
-                )
+            llm_start = time.time()
+            self.timings["time_to_llm_ms"] = (llm_start - start_time) * 1000
+            ticket_content = self._call_llm(
+                llm_configs, prompt, on_token, response_format
+            )
+            self.timings["llm_ms"] = (time.time() - llm_start) * 1000
 
             generation_time = time.time() - start_time
+            self.timings["total_ms"] = generation_time * 1000
             logger.info(f"Generated ticket in {generation_time:.2f} seconds")
+            logger.info(
+                "Generation timings: "
+                + ", ".join(
+                    f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                    for k, v in self.timings.items()
+                )
+            )
 
             return ticket_content
 
@@ -0,0 +1,188 @@
+"""Append-only ledger of LLM calls, retrievals and ingest runs."""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import litellm
+import numpy as np
+from loguru import logger
+
+from jiragen.utils.data import get_data_dir
+
+GROUPINGS = ("day", "model", "command", "kind")
+
+
+def default_ledger_path() -> Path:
+    """Return the location of the ledger in the data directory."""
+    return get_data_dir() / "ledger.jsonl"
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int
+) -> Optional[float]:
+    """Return the price of a call in USD, None if litellm has no pricing."""
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
+
+
+class Ledger:
+    """JSON Lines file with one record per measured operation.
+
+    Every record has the 'time' it was written, the CLI 'command' running
+    and its 'kind' ('llm', 'retrieval' or 'ingest'), followed by the fields
+    of that kind such as 'model', token counts, 'cost', 'latency_ms' and
+    'cache_hit'. Records are only ever appended.
+
+    Attributes:
+        path: File the records are appended to
+        enabled: Whether records are written at all
+        command: CLI command stored with every record
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        enabled: bool = True,
+        command: str = "",
+    ):
+        self.path = Path(path) if path else default_ledger_path()
+        self.enabled = enabled
+        self.command = command
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, **fields: Any) -> None:
+        """Append a record. Failures are logged and never raised."""
+        if not self.enabled:
+            return
+        entry = {
+            "time": time.time(),
+            "command": self.command,
+            "kind": kind,
+            **fields,
+        }
+        try:
+            line = json.dumps(entry, default=str) + "\n"
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except Exception as e:
+            logger.debug(f"Failed to write ledger record: {e}")
+
+    def read(self, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records, oldest first.
+
+        Args:
+            since: Only yield records written at or after this timestamp
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Line cut short by an interrupted write
+                if since is None or entry.get("time", 0) >= since:
+                    yield entry
+
+
+_ledger = Ledger(enabled=False)
+
+
+def get_ledger() -> Ledger:
+    """Return the process-wide ledger, disabled until configured."""
+    return _ledger
+
+
+def configure_ledger(
+    command: str, enabled: bool = True, path: Optional[Path] = None
+) -> Ledger:
+    """Start recording to the ledger for a CLI command.
+
+    Args:
+        command: Name of the running command
+        enabled: Whether to record anything
+        path: Ledger file, defaults to the data directory
+
+    Returns:
+        Ledger: The process-wide ledger
+    """
+    global _ledger
+    _ledger = Ledger(path, enabled=enabled, command=command)
+    return _ledger
+
+
+def record(kind: str, **fields: Any) -> None:
+    """Append a record to the process-wide ledger."""
+    _ledger.record(kind, **fields)
+
+
+def _group_key(entry: Dict[str, Any], by: str) -> str:
+    if by == "day":
+        return time.strftime("%Y-%m-%d", time.localtime(entry["time"]))
+    # Retrievals and ingest runs have no model, keep them apart by kind
+    return str(entry.get(by) or f"({entry.get('kind', '-')})")
+
+
+def summarize(
+    entries: List[Dict[str, Any]], by: str = "day"
+) -> List[Dict[str, Any]]:
+    """Aggregate records per day, model, command or kind.
+
+    Args:
+        entries: Ledger records
+        by: One of ``GROUPINGS``
+
+    Returns:
+        List[Dict[str, Any]]: Per group, sorted by group: the number of
+        'calls', 'errors' and 'cache_hits', summed tokens and 'cost', and
+        p50/p95/p99 of 'latency_ms'
+    """
+    if by not in GROUPINGS:
+        raise ValueError(f"Cannot group by {by}, use one of {GROUPINGS}")
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for entry in entries:
+        groups[_group_key(entry, by)].append(entry)
+
+    rows = []
+    for key in sorted(groups):
+        group = groups[key]
+        latencies = [
+            e["latency_ms"] for e in group if e.get("latency_ms") is not None
+        ]
+        p50, p95, p99 = (
+            np.percentile(latencies, [50, 95, 99]).tolist()
+            if latencies
+            else (None, None, None)
+        )
+        rows.append(
+            {
+                by: key,
+                "calls": len(group),
+                "errors": sum(e.get("status") == "error" for e in group),
+                "cache_hits": sum(bool(e.get("cache_hit")) for e in group),
+                "prompt_tokens": sum(
+                    e.get("prompt_tokens") or 0 for e in group
+                ),
+                "completion_tokens": sum(
+                    e.get("completion_tokens") or 0 for e in group
+                ),
+                "cost": sum(e.get("cost") or 0.0 for e in group),
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "p99_ms": p99,
+            }
+        )
+    return rows
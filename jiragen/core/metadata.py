@@ -1,10 +1,23 @@
+import json
+import re
+import time
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import litellm
 from loguru import logger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
-from .generator import LiteLLMClient, LLMConfig
+from .cache import ResponseCache
+from .generator import (
+    GeneratorConfig,
+    IssueGenerator,
+    LLMConfig,
+    get_llm_client,
+    stage_llm_configs,
+)
+from .retry import Deadline
+from .routing import ModelRouter
 
 
 class IssueType(str, Enum):
@@ -44,13 +57,133 @@ class IssueMetadata(BaseModel):
     )
 
 
+class GeneratedIssue(BaseModel):
+    """Ticket content and its metadata returned by a single LLM call."""
+
+    content: str = Field(
+        ..., description="Complete ticket following the template, in markdown"
+    )
+    issue_type: IssueType = Field(..., description="Type of the issue")
+    priority: IssuePriority = Field(
+        ..., description="Priority level of the issue"
+    )
+    labels: List[str] = Field(
+        default_factory=list, description="Labels/tags for the issue"
+    )
+    story_points: Optional[int] = Field(
+        None, description="Story points estimation"
+    )
+    components: List[str] = Field(
+        default_factory=list, description="Affected components/modules"
+    )
+
+    def to_metadata(self) -> IssueMetadata:
+        """Return the metadata with the content as description."""
+        return IssueMetadata(
+            **self.model_dump(exclude={"content"}), description=self.content
+        )
+
+
+def parse_metadata(response: Any, content: str) -> IssueMetadata:
+    """Build IssueMetadata from an extractor response.
+
+    Args:
+        response: JSON string or IssueMetadata returned by the LLM
+        content: Ticket content, stored as the description
+    """
+    if isinstance(response, str):
+        metadata = IssueMetadata(**json.loads(response))
+    else:
+        metadata = response
+    metadata.description = content
+    return metadata
+
+
+# Start of the content string of a combined response, up to where it ends
+_CONTENT_PREFIX = re.compile(r'"content"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+
+def _salvage_content(response: Any) -> str:
+    """Return the ticket content of a combined response that failed validation.
+
+    The content of a response whose metadata is invalid is used as is. If
+    the response was cut short, the part of the content it holds is used,
+    and a response that is not JSON at all is taken as the content.
+    """
+    data = response
+    if isinstance(response, str):
+        try:
+            data = json.loads(response)
+        except ValueError:
+            data = None
+    if isinstance(data, dict) and isinstance(data.get("content"), str):
+        return data["content"]
+    if not isinstance(response, str):
+        return str(response)
+    match = _CONTENT_PREFIX.search(response)
+    if match:
+        partial = match.group(1)
+        # The response may have been cut in the middle of a unicode escape
+        for text in (partial, re.sub(r"\\u[0-9a-fA-F]{0,3}$", "", partial)):
+            try:
+                return json.loads(f'"{text}"')
+            except ValueError:
+                continue
+    return response
+
+
+def supports_structured_output(model: str) -> bool:
+    """Whether litellm knows the model to accept a JSON schema response."""
+    try:
+        return litellm.supports_response_schema(
+            model=model, custom_llm_provider=None
+        )
+    except Exception as e:
+        logger.debug(
+            f"Could not check response schema support for {model}: {e}"
+        )
+        return False
+
+
 class IssueMetadataExtractor:
-    """Extracts metadata from issue content using LLM analysis."""
+    """Extracts metadata from issue content using LLM analysis.
+
+    With a ``predictor``, fields are first voted on by similar tickets from
+    the JIRA history and the LLM is only asked if any field is predicted
+    with less than ``confidence_threshold`` confidence; confident local
+    predictions then take precedence over the LLM's answer.
+
+    With a ``router``, the metadata stage's models are tried in order and
+    the one that answered is kept in ``model``.
+    """
 
-    def __init__(self, llm_config: LLMConfig):
+    def __init__(
+        self,
+        llm_config: LLMConfig,
+        response_cache: Optional[ResponseCache] = None,
+        predictor: Optional["MetadataPredictor"] = None,  # noqa: F821
+        confidence_threshold: float = 0.6,
+        router: Optional[ModelRouter] = None,
+    ):
         self.llm_config = llm_config
+        self.response_cache = response_cache
+        self.predictor = predictor
+        self.confidence_threshold = confidence_threshold
+        self.router = router
+        self.model: Optional[str] = None
         logger.info("Initialized IssueMetadataExtractor")
 
+    @classmethod
+    def from_config(cls, config: GeneratorConfig) -> "IssueMetadataExtractor":
+        """Create an extractor sharing a generator's LLM setup."""
+        return cls(
+            config.llm_config,
+            config.response_cache,
+            config.metadata_predictor,
+            config.metadata_confidence_threshold,
+            config.router,
+        )
+
     def _create_analysis_prompt(self, content: str) -> str:
         """Creates a structured prompt for the LLM to analyze JIRA issue content."""
 
@@ -103,33 +236,168 @@ class IssueMetadataExtractor:
         {content}
 
         JSON Response:
-        """.strip()
+        """.strip().replace(
+            "{content}", content
+        )
+
+    def _call_llm(self, prompt: str, deadline: Optional[Deadline]) -> Any:
+        """Ask the metadata stage's models in order until one answers.
+
+        Models without structured output only get the prompt, which asks
+        for the same JSON.
+        """
+        configs = stage_llm_configs(self.llm_config, self.router, "metadata")
+        for i, llm_config in enumerate(configs):
+            self.model = llm_config.model
+            llm = get_llm_client(llm_config, self.response_cache)
+            response_format = (
+                IssueMetadata
+                if supports_structured_output(llm_config.model)
+                else None
+            )
+            try:
+                with llm:
+                    metadata = llm.generate(
+                        prompt,
+                        response_format=response_format,
+                        deadline=deadline,
+                        stage="metadata",
+                        temperature=0.3,
+                    )
+            except Exception as e:
+                if i + 1 == len(configs) or (
+                    deadline is not None and deadline.remaining() == 0
+                ):
+                    raise
+                logger.warning(
+                    f"{llm_config.model} failed ({e}), falling back to "
+                    f"{configs[i + 1].model}"
+                )
+                continue
+            if self.router is not None:
+                self.router.observe(
+                    "metadata",
+                    llm_config.model,
+                    llm.last_call.get("latency_ms", 0.0),
+                    cache_hit=llm.last_call.get("cache_hit", False),
+                )
+            return metadata
 
-    def extract_metadata(self, content: str) -> IssueMetadata:
+    def extract_metadata(
+        self, content: str, deadline: Optional[Deadline] = None
+    ) -> IssueMetadata:
         """
         Analyzes the issue content and extracts relevant metadata.
 
         Args:
             content: The generated issue content to analyze
+            deadline: Time budget shared with the generation of the content
 
         Returns:
             IssueMetadata object containing the extracted metadata
         """
         logger.info("Extracting metadata from issue content")
 
+        confident: Dict[str, Any] = {}
+        if self.predictor is not None:
+            try:
+                prediction = self.predictor.predict(content)
+                threshold = self.confidence_threshold
+                uncertain = prediction.uncertain_fields(threshold)
+                if not uncertain:
+                    logger.info(
+                        f"Predicted metadata locally in "
+                        f"{prediction.latency_ms:.0f}ms: {prediction.confidence}"
+                    )
+                    return prediction.to_metadata()
+                confident = {
+                    field: prediction.values[field]
+                    for field in prediction.confident_fields(threshold)
+                }
+                logger.info(
+                    "Asking the LLM for low-confidence fields: "
+                    + ", ".join(uncertain)
+                )
+            except Exception as e:
+                logger.warning(f"Local metadata prediction failed: {e}")
+
         try:
             # Generate analysis using LLM with structured output
             prompt = self._create_analysis_prompt(content)
             logger.debug(f"Created analysis prompt of length: {len(prompt)}")
-            with LiteLLMClient(self.llm_config) as llm:
-                metadata = llm.generate(
-                    prompt, response_format=IssueMetadata, temperature=0.3
-                )
+            metadata = self._call_llm(prompt, deadline)
 
-                logger.info(f"Successfully extracted metadata: {metadata}")
-                logger.info(f"Metadata type: {type(metadata)}")
-                return metadata
+            logger.info(f"Successfully extracted metadata: {metadata}")
+            logger.info(f"Metadata type: {type(metadata)}")
+            if confident:
+                metadata = parse_metadata(metadata, content)
+                # Validated so predicted values become enums like the rest
+                metadata = IssueMetadata.model_validate(
+                    {**metadata.model_dump(), **confident}
+                )
+            return metadata
 
         except Exception as e:
             logger.error("Failed to extract metadata", exc_info=True)
             raise RuntimeError(f"Metadata extraction failed: {e}") from e
+
+
+def generate_with_metadata(
+    generator: IssueGenerator, message: str
+) -> Tuple[str, IssueMetadata]:
+    """Generate a ticket and its metadata, in one LLM call where possible.
+
+    Models with structured output return the content and metadata together
+    as a ``GeneratedIssue``. For other models the content is generated
+    first and the metadata extracted from it with a second call, as it is
+    from the content of a combined response whose metadata is unusable.
+    With a local metadata predictor configured, only the content is
+    generated and the LLM is asked for metadata only when the prediction is
+    not confident. All calls share one deadline.
+
+    Args:
+        generator: Generator holding the retrieval and LLM configuration
+        message: User's request for the ticket
+
+    Returns:
+        Tuple[str, IssueMetadata]: Ticket content and its metadata
+    """
+    llm_config = generator.config.llm_config
+    router = generator.config.router
+    model = router.select("generate") if router else llm_config.model
+    deadline = Deadline(llm_config.deadline)
+    content = None
+    if generator.config.metadata_predictor is not None:
+        logger.info("Predicting metadata locally instead of a combined call")
+    elif supports_structured_output(model):
+        response = generator.generate(
+            message, response_format=GeneratedIssue, deadline=deadline
+        )
+        try:
+            if isinstance(response, str):
+                issue = GeneratedIssue.model_validate_json(response)
+            else:
+                issue = GeneratedIssue.model_validate(response)
+            return issue.content, issue.to_metadata()
+        except ValidationError as e:
+            logger.warning(
+                f"Invalid combined response, extracting metadata separately: {e}"
+            )
+            content = _salvage_content(response)
+    else:
+        logger.info(
+            f"{model} has no structured output support, "
+            "extracting metadata separately"
+        )
+
+    if content is None:
+        content = generator.generate(message, deadline=deadline)
+    metadata_start = time.time()
+    extractor = IssueMetadataExtractor.from_config(generator.config)
+    metadata = parse_metadata(
+        extractor.extract_metadata(content, deadline), content
+    )
+    generator.timings["metadata_ms"] = (time.time() - metadata_start) * 1000
+    if extractor.model is not None:
+        generator.timings["metadata_model"] = extractor.model
+    return content, metadata
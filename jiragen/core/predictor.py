@@ -0,0 +1,208 @@
+"""Predict issue metadata from similar tickets in the indexed JIRA history."""
+
+import math
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from jiragen.core.metadata import IssueMetadata, IssuePriority, IssueType
+
+DEFAULT_NEIGHBORS = 15
+DEFAULT_CONFIDENCE_THRESHOLD = 0.6
+# Extra distance, beyond the nearest neighbor's, over which a vote loses ~63%
+# of its weight; squared L2 distances are packed closely so it is small
+DISTANCE_SCALE = 0.1
+
+# JIRA documents that carry ticket fields, components describe themselves
+TICKET_TYPES = ["ticket", "epic"]
+REQUIRED_FIELDS = ("issue_type", "priority")
+PREDICTED_FIELDS = (
+    "issue_type",
+    "priority",
+    "labels",
+    "story_points",
+    "components",
+)
+
+
+class MetadataPrediction(BaseModel):
+    """Metadata voted by similar tickets.
+
+    Attributes:
+        values: Predicted value per field, None where no neighbor had one
+        confidence: Weighted share of the neighbors agreeing, per field
+        neighbors: Number of neighbors that voted
+        latency_ms: Time taken by the prediction
+    """
+
+    values: Dict[str, Any] = Field(default_factory=dict)
+    confidence: Dict[str, float] = Field(default_factory=dict)
+    neighbors: int = 0
+    latency_ms: float = 0.0
+
+    def confident_fields(self, threshold: float) -> List[str]:
+        """Return fields predicted with at least ``threshold`` confidence."""
+        return [
+            field
+            for field in PREDICTED_FIELDS
+            if self.values.get(field) is not None
+            and self.confidence.get(field, 0.0) >= threshold
+        ]
+
+    def uncertain_fields(self, threshold: float) -> List[str]:
+        """Return the fields that need another source of truth.
+
+        Optional fields none of the neighbors had (usually story points) are
+        left empty rather than counted as uncertain.
+        """
+        confident = self.confident_fields(threshold)
+        return [
+            field
+            for field in PREDICTED_FIELDS
+            if field not in confident
+            and (
+                field in REQUIRED_FIELDS or self.values.get(field) is not None
+            )
+        ]
+
+    def to_metadata(self) -> Optional[IssueMetadata]:
+        """Return the prediction as IssueMetadata, if type and priority set."""
+        if any(not self.values.get(field) for field in REQUIRED_FIELDS):
+            return None
+        return IssueMetadata(
+            **{k: v for k, v in self.values.items() if v is not None}
+        )
+
+
+def _weights(neighbors: List[Dict[str, Any]]) -> List[float]:
+    """Weight neighbors by their distance relative to the nearest one.
+
+    Lexical-only hits have no distance and count as the farthest dense hit.
+    """
+    distances = [
+        doc["distance"] for doc in neighbors if doc.get("distance") is not None
+    ]
+    if not distances:
+        return [1.0] * len(neighbors)
+    nearest, farthest = min(distances), max(distances)
+    weights = []
+    for doc in neighbors:
+        distance = doc.get("distance")
+        if distance is None:
+            distance = farthest
+        weights.append(math.exp(-(distance - nearest) / DISTANCE_SCALE))
+    return weights
+
+
+def _vote_single(votes: Dict[Any, float], total: float):
+    if not votes or total <= 0:
+        return None, 0.0
+    value, weight = max(votes.items(), key=lambda item: item[1])
+    return value, weight / total
+
+
+def _vote_multi(votes: Dict[str, float], total: float):
+    """Keep values with half the weight; confidence is the closest call."""
+    if total <= 0:
+        return None, 0.0
+    shares = {value: weight / total for value, weight in votes.items()}
+    chosen = sorted(
+        (v for v, share in shares.items() if share >= 0.5),
+        key=lambda v: -shares[v],
+    )
+    confidence = min(
+        (max(share, 1.0 - share) for share in shares.values()), default=1.0
+    )
+    return chosen, confidence
+
+
+class MetadataPredictor:
+    """k-nearest-neighbor voting over fetched JIRA tickets.
+
+    The ticket content is embedded and its nearest tickets and epics in the
+    ``jira_content`` collection vote on each field, weighted down the
+    farther each neighbor is compared to the nearest one.
+    Single-valued fields take the heaviest value; labels and components keep
+    every value backed by at least half of the weight. Confidence is the
+    winning share of the weight among neighbors that have the field.
+
+    Attributes:
+        store: Client of the ``jira_content`` collection
+        k: Number of neighbors consulted
+    """
+
+    def __init__(self, store, k: int = DEFAULT_NEIGHBORS):
+        self.store = store
+        self.k = k
+
+    def predict(
+        self,
+        content: str,
+        embedding: Optional[List[float]] = None,
+        exclude_key: Optional[str] = None,
+    ) -> MetadataPrediction:
+        """Predict metadata for ticket content.
+
+        Args:
+            content: Ticket content to classify
+            embedding: Precomputed embedding of the content
+            exclude_key: Ticket key left out of the vote, for evaluation
+
+        Returns:
+            MetadataPrediction: Values and confidence per field
+        """
+        start_time = time.time()
+        where: Dict[str, Any] = {"type": {"$in": TICKET_TYPES}}
+        if exclude_key:
+            where = {"$and": [where, {"key": {"$ne": exclude_key}}]}
+        # Only the metadata is voted on, skip snippet extraction
+        neighbors = self.store.query_similar(
+            content,
+            n_results=self.k,
+            embedding=embedding,
+            where=where,
+            full_document=True,
+        )
+
+        single = {field: defaultdict(float) for field in PREDICTED_FIELDS}
+        totals = defaultdict(float)
+        valid = {
+            "issue_type": {t.value for t in IssueType},
+            "priority": {p.value for p in IssuePriority},
+        }
+        for doc, weight in zip(neighbors, _weights(neighbors), strict=True):
+            metadata = doc.get("metadata") or {}
+            for field in PREDICTED_FIELDS:
+                value = metadata.get(field)
+                if field in ("labels", "components"):
+                    # Absent lists are an answer too: "no labels"
+                    totals[field] += weight
+                    for item in set(value or []):
+                        single[field][item] += weight
+                    continue
+                if value is None or value not in valid.get(field, {value}):
+                    continue
+                if field == "story_points":
+                    value = int(round(value))
+                single[field][value] += weight
+                totals[field] += weight
+
+        prediction = MetadataPrediction(neighbors=len(neighbors))
+        for field in PREDICTED_FIELDS:
+            vote = (
+                _vote_multi
+                if field in ("labels", "components")
+                else _vote_single
+            )
+            value, confidence = vote(single[field], totals[field])
+            prediction.values[field] = value
+            prediction.confidence[field] = round(confidence, 4)
+        prediction.latency_ms = (time.time() - start_time) * 1000
+        logger.debug(
+            f"Predicted metadata from {len(neighbors)} neighbors: "
+            f"{prediction.values} (confidence {prediction.confidence})"
+        )
+        return prediction
@@ -0,0 +1,88 @@
+"""Backoff and deadlines for calls to LLM providers."""
+
+import random
+import time
+from typing import Optional
+
+import litellm
+
+BACKOFF_BASE = 1.0  # Seconds before the first retry, doubled per attempt
+BACKOFF_MAX = 60.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a run has no time left for another LLM call."""
+
+
+def retry_delay(
+    error: BaseException,
+    attempt: int,
+    base: float = BACKOFF_BASE,
+    maximum: float = BACKOFF_MAX,
+) -> Optional[float]:
+    """Return how long to wait before retrying, or None if it's pointless.
+
+    Rate limits and transient provider errors, anywhere in the exception's
+    cause chain, are retried with exponential backoff and jitter, honouring
+    a Retry-After header when one is sent.
+
+    Args:
+        error: Exception raised by the failed attempt
+        attempt: Number of the failed attempt, starting at 0
+        base: Delay before the first retry
+        maximum: Longest delay returned
+
+    Returns:
+        Optional[float]: Seconds to wait, None if the error is permanent
+    """
+    while error is not None:
+        status = getattr(error, "status_code", None)
+        if isinstance(error, litellm.RateLimitError) or status in (
+            RETRYABLE_STATUS
+        ):
+            headers = getattr(getattr(error, "response", None), "headers", {})
+            try:
+                return min(maximum, float(headers.get("retry-after")))
+            except (TypeError, ValueError):
+                pass
+            delay = min(maximum, base * 2**attempt)
+            return delay * random.uniform(0.5, 1.0)
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class Deadline:
+    """Time budget shared by every LLM call of one run.
+
+    Attributes:
+        seconds: Total budget, None for no deadline
+        expires_at: ``time.monotonic()`` value at which the budget runs out
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = (
+            time.monotonic() + seconds if seconds is not None else None
+        )
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left, None if there is no deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """Cap a request timeout by the time left.
+
+        Raises:
+            DeadlineExceeded: If no time is left
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded(
+                f"LLM deadline of {self.seconds:.0f}s exceeded"
+            )
+        return min(timeout, remaining) if timeout else remaining
@@ -0,0 +1,157 @@
+"""Per-stage model selection with fallbacks and latency budgets."""
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from jiragen.core.ledger import get_ledger
+
+STAGES = ("generate", "metadata")
+RECENT_CALLS = 20  # Calls per stage and model the p95 is computed over
+RECENT_SECONDS = 7 * 24 * 3600  # Older ledger records are ignored
+MIN_CALLS = 3  # Fewer recent calls than this don't judge a model
+PROBE_SECONDS = 600  # A model over budget is tried again after this long
+
+
+class StageRoute(BaseModel):
+    """Models to use for one stage.
+
+    Attributes:
+        models: Preferred model followed by its fallbacks
+        budget_ms: p95 latency above which the next model is preferred
+    """
+
+    models: List[str] = Field(min_length=1)
+    budget_ms: Optional[float] = None
+
+
+class ModelRouter:
+    """Chooses the model for each stage of ticket generation.
+
+    Every stage has a chain of models. Models whose p95 latency over their
+    recent calls exceeds the stage's budget move behind the ones within it,
+    so the next model in the chain is used until the slow one recovers.
+    To find out whether it did, a model over budget is tried first again
+    once ``PROBE_SECONDS`` passed since its last call; a call within the
+    budget starts its latency history over. The chain is also the order
+    in which models are tried when a call fails. Recent latencies come from
+    the ledger and from the calls made since the router was created.
+
+    Attributes:
+        routes: Route per stage
+    """
+
+    def __init__(self, routes: Dict[str, StageRoute]):
+        self.routes = routes
+        self._lock = threading.Lock()
+        self._latencies: Optional[Dict[Tuple[str, str], Deque[float]]] = None
+        self._last_called: Dict[Tuple[str, str], float] = {}
+
+    def _load(self) -> Dict[Tuple[str, str], Deque[float]]:
+        """Read recent successful LLM call latencies from the ledger."""
+        latencies: Dict[Tuple[str, str], Deque[float]] = defaultdict(
+            lambda: deque(maxlen=RECENT_CALLS)
+        )
+        try:
+            since = time.time() - RECENT_SECONDS
+            for entry in get_ledger().read(since=since):
+                if (
+                    entry.get("kind") == "llm"
+                    and entry.get("stage")
+                    and entry.get("status", "ok") == "ok"
+                    and not entry.get("cache_hit")
+                    and entry.get("latency_ms") is not None
+                ):
+                    key = (entry["stage"], entry.get("model"))
+                    latencies[key].append(entry["latency_ms"])
+                    self._last_called[key] = max(
+                        self._last_called.get(key, 0.0), entry.get("time", 0.0)
+                    )
+        except Exception as e:
+            logger.debug(f"Could not read latencies from the ledger: {e}")
+        return latencies
+
+    def p95(self, stage: str, model: str) -> Optional[float]:
+        """Return the p95 latency of recent calls, None if too few."""
+        with self._lock:
+            if self._latencies is None:
+                self._latencies = self._load()
+            recent = list(self._latencies.get((stage, model), ()))
+        if len(recent) < MIN_CALLS:
+            return None
+        return float(np.percentile(recent, 95))
+
+    def observe(
+        self,
+        stage: str,
+        model: str,
+        latency_ms: float,
+        cache_hit: bool = False,
+    ) -> None:
+        """Take a call made in this process into account.
+
+        Cached responses say nothing about the model's latency and are
+        ignored. A call within the stage's budget by a model that was over
+        it drops the model's earlier latencies, so it is preferred again.
+        """
+        if cache_hit:
+            return
+        route = self.routes.get(stage)
+        p95 = self.p95(stage, model)
+        with self._lock:
+            recent = self._latencies[(stage, model)]
+            if (
+                route is not None
+                and route.budget_ms is not None
+                and p95 is not None
+                and p95 > route.budget_ms >= latency_ms
+            ):
+                logger.info(f"{model} is back within the {stage} budget")
+                recent.clear()
+            recent.append(latency_ms)
+            self._last_called[(stage, model)] = time.time()
+
+    def candidates(self, stage: str, claim_probe: bool = True) -> List[str]:
+        """Return the stage's models in the order they should be tried.
+
+        Args:
+            stage: Stage to order the models of
+            claim_probe: Count a model put first to probe it as called, so
+                the following calls don't probe it too
+        """
+        route = self.routes[stage]
+        if route.budget_ms is None:
+            return list(route.models)
+        within, over, probes = [], [], []
+        now = time.time()
+        for model in route.models:
+            p95 = self.p95(stage, model)
+            if p95 is None or p95 <= route.budget_ms:
+                within.append(model)
+                continue
+            with self._lock:
+                last_called = self._last_called.get((stage, model), 0.0)
+                # One model at a time is probed
+                probe = not probes and now - last_called >= PROBE_SECONDS
+                if probe and claim_probe:
+                    # Concurrent calls must not all probe the same model
+                    self._last_called[(stage, model)] = now
+            if probe:
+                logger.info(f"Probing {model}, over the {stage} budget")
+                probes.append(model)
+            else:
+                logger.info(
+                    f"{model} is over the {stage} latency budget "
+                    f"(p95 {p95:.0f}ms > {route.budget_ms:.0f}ms)"
+                )
+                over.append((p95, model))
+        return probes + within + [model for _, model in sorted(over)]
+
+    def select(self, stage: str) -> str:
+        """Return the model the next call of a stage will use."""
+        return self.candidates(stage, claim_probe=False)[0]
@@ -8,28 +8,39 @@ import litellm
 from rich.console import Console
 
 from jiragen.cli.add import add_files_command
+from jiragen.cli.batch import batch_generate_command
 from jiragen.cli.clean import clean_command
 from jiragen.cli.fetch import fetch_command
 from jiragen.cli.generate import generate_issue
+from jiragen.cli.index import (
+    COLLECTIONS,
+    index_export_command,
+    index_import_command,
+    index_tune_command,
+)
 from jiragen.cli.init import init_command
 from jiragen.cli.kill import kill_command
 from jiragen.cli.restart import restart_command
 from jiragen.cli.rm import rm_files_command
+from jiragen.cli.stats import stats_command
 from jiragen.cli.status import status_command
+from jiragen.cli.sync import sync_command
 from jiragen.cli.upload import upload_command
 from jiragen.core.client import VectorStoreClient, VectorStoreConfig
 from jiragen.core.config import ConfigManager
+from jiragen.core.ledger import GROUPINGS, configure_ledger
 from jiragen.utils.data import get_data_dir, get_runtime_dir
 from jiragen.utils.logger import logger, setup_logging
 
 console = Console()
 
 
-def get_vector_store() -> VectorStoreClient:
+def get_vector_store(config_manager: ConfigManager) -> VectorStoreClient:
     runtime_dir = get_runtime_dir()
     store_config = VectorStoreConfig(
         collection_name="codebase_content",
         db_path=runtime_dir / "codebase_data" / "vector_db",
+        **config_manager.get_vector_store_settings("codebase_content"),
     )
     return VectorStoreClient(store_config)
 
@@ -39,31 +50,80 @@ def main():
     try:
         parser = create_parser()
         args = parser.parse_args()
+        if args.command == "generate" and bool(args.message) == bool(
+            args.batch
+        ):
+            parser.error("generate needs either a message or --batch FILE")
 
         log_file_path = get_data_dir() / "jiragen.log"
         setup_logging(args.verbose, log_file_path)
         litellm.set_verbose = args.verbose
 
         config_manager = ConfigManager()
+        command = args.command
+        if command == "index":
+            command = f"index {args.index_command}"
+        elif command == "generate" and args.batch:
+            command = "generate --batch"
+        configure_ledger(
+            command,
+            enabled=config_manager.config.getboolean(
+                "ledger", "enabled", fallback=True
+            ),
+        )
 
         if args.command == "init":
             init_command(args.config)
         elif args.command == "kill":
             kill_command()
+        elif args.command == "stats":
+            stats_command(by=args.by, days=args.days, kind=args.kind)
+        elif args.command == "index":
+            if args.index_command == "export":
+                index_export_command(
+                    args.path, collection=args.collection, commit=args.commit
+                )
+            elif args.index_command == "import":
+                index_import_command(
+                    args.path,
+                    collection=args.collection,
+                    replace=args.replace,
+                    force=args.force,
+                    hnsw=config_manager.get_vector_store_settings(
+                        COLLECTIONS[args.collection][0]
+                    ),
+                )
+            elif args.index_command == "tune":
+                index_tune_command(
+                    collection=args.collection,
+                    k=args.k,
+                    n_queries=args.queries,
+                    m_values=args.m,
+                    construction_ef_values=args.construction_ef,
+                    search_ef_values=args.search_ef,
+                    max_vectors=args.max_vectors,
+                    target_recall=args.target_recall,
+                )
         else:
-            store = get_vector_store()
+            store = get_vector_store(config_manager)
 
             if args.command == "add":
                 add_files_command(store, [str(f) for f in args.files])
             elif args.command == "rm":
                 rm_files_command(store, [str(f) for f in args.files])
+            elif args.command == "sync":
+                sync_command(
+                    store, [str(f) for f in args.paths], dry_run=args.dry_run
+                )
             elif args.command == "clean":
                 clean_command()
             elif args.command == "fetch":
                 if not hasattr(args, "types") or args.types is None:
                     args.types = []
                 query = getattr(args, "query", None)
-                fetch_command(config_manager, query, args.types)
+                fetch_command(
+                    config_manager, query, args.types, full=args.full
+                )
             elif args.command == "status":
                 status_command(store, compact=args.compact)
             elif args.command == "restart":
@@ -73,19 +133,39 @@ def main():
                     Path(__file__).parent / "templates" / "default.md"
                 )
 
-                result = generate_issue(
-                    store=store,
-                    message=args.message,
-                    template_path=template_path,
-                    model=args.model,
-                    temperature=args.temperature,
-                    max_tokens=args.max_tokens,
-                    upload=args.upload,
-                    yes=args.yes,
-                )
-                logger.success(
-                    f"Issue generated successfully : {type(result)}"
-                )
+                if args.batch:
+                    batch_generate_command(
+                        store=store,
+                        batch_path=args.batch,
+                        template_path=template_path,
+                        output_path=args.output,
+                        concurrency=args.concurrency,
+                        model=args.model,
+                        temperature=args.temperature,
+                        max_tokens=args.max_tokens,
+                        rerank=args.rerank,
+                        scopes=args.scope,
+                        use_cache=not args.no_cache,
+                    )
+                else:
+                    result = generate_issue(
+                        store=store,
+                        message=args.message,
+                        template_path=template_path,
+                        model=args.model,
+                        temperature=args.temperature,
+                        max_tokens=args.max_tokens,
+                        upload=args.upload,
+                        yes=args.yes,
+                        rerank=args.rerank,
+                        scopes=args.scope,
+                        stream=args.stream,
+                        use_cache=not args.no_cache,
+                        separate_metadata=args.separate_metadata,
+                    )
+                    logger.success(
+                        f"Issue generated successfully : {type(result)}"
+                    )
 
             elif args.command == "upload":
                 upload_command(
@@ -151,6 +231,24 @@ def create_parser() -> argparse.ArgumentParser:
         "files", nargs="+", type=Path, help="Files to remove"
     )
 
+    sync_parser = subparsers.add_parser(
+        "sync",
+        help="Mirror the working tree into the vector store",
+        parents=[parent_parser],
+    )
+    sync_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Files or directories to mirror (default: current directory)",
+    )
+    sync_parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="Show what would change without modifying the store",
+    )
+
     clean_parser = subparsers.add_parser(
         "clean",
         help="Remove all files from the vector store",
@@ -173,6 +271,12 @@ def create_parser() -> argparse.ArgumentParser:
         nargs="+",
         help="Filter by file types (e.g., epics, tickets, components). If not provided, fetches all types",
     )
+    fetch_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Fetch every issue instead of those updated since the last "
+        "fetch, and delete the ones JIRA no longer returns",
+    )
 
     status_parser = subparsers.add_parser(
         "status",
@@ -195,13 +299,135 @@ def create_parser() -> argparse.ArgumentParser:
         parents=[parent_parser],
     )
 
+    stats_parser = subparsers.add_parser(
+        "stats",
+        help="Show token, cost and latency statistics",
+        parents=[parent_parser],
+    )
+    stats_parser.add_argument(
+        "--by",
+        nargs="+",
+        choices=GROUPINGS,
+        help="Group by day, model, command and/or kind "
+        "(default: day model command)",
+    )
+    stats_parser.add_argument(
+        "--days",
+        type=float,
+        help="Only include the last number of days",
+    )
+    stats_parser.add_argument(
+        "--kind",
+        choices=["llm", "retrieval", "ingest"],
+        help="Only include one kind of record",
+    )
+
+    index_parser = subparsers.add_parser(
+        "index",
+        help="Export, import or tune vector store indexes",
+        parents=[parent_parser],
+    )
+    index_subparsers = index_parser.add_subparsers(
+        dest="index_command", required=True
+    )
+
+    index_export_parser = index_subparsers.add_parser(
+        "export",
+        help="Export a collection to a snapshot bundle",
+        parents=[parent_parser],
+    )
+    index_export_parser.add_argument(
+        "path", type=Path, help="Destination snapshot file"
+    )
+    index_export_parser.add_argument(
+        "--collection",
+        choices=["codebase", "jira"],
+        default="codebase",
+        help="Collection to export (default: codebase)",
+    )
+    index_export_parser.add_argument(
+        "--commit",
+        help="Source commit to record (default: current git HEAD)",
+    )
+
+    index_import_parser = index_subparsers.add_parser(
+        "import",
+        help="Load a snapshot bundle without re-embedding",
+        parents=[parent_parser],
+    )
+    index_import_parser.add_argument(
+        "path", type=Path, help="Snapshot file to load"
+    )
+    index_import_parser.add_argument(
+        "--collection",
+        choices=["codebase", "jira"],
+        default="codebase",
+        help="Collection to import into (default: codebase)",
+    )
+    index_import_parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Drop existing collection contents before importing",
+    )
+    index_import_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Import even if the snapshot used another embedding model",
+    )
+
+    index_tune_parser = index_subparsers.add_parser(
+        "tune",
+        help="Measure recall and latency of HNSW settings on a collection",
+        parents=[parent_parser],
+    )
+    index_tune_parser.add_argument(
+        "--collection",
+        choices=["codebase", "jira"],
+        default="codebase",
+        help="Collection to tune (default: codebase)",
+    )
+    index_tune_parser.add_argument(
+        "-k", type=int, default=10, help="Neighbors for recall@k (default: 10)"
+    )
+    index_tune_parser.add_argument(
+        "--queries",
+        type=int,
+        default=100,
+        help="Number of sampled queries (default: 100)",
+    )
+    index_tune_parser.add_argument(
+        "--m", default="8,16,32", help="M values to try (default: 8,16,32)"
+    )
+    index_tune_parser.add_argument(
+        "--construction-ef",
+        default="100,200",
+        help="construction_ef values to try (default: 100,200)",
+    )
+    index_tune_parser.add_argument(
+        "--search-ef",
+        default="10,50,100",
+        help="search_ef values to try (default: 10,50,100)",
+    )
+    index_tune_parser.add_argument(
+        "--max-vectors",
+        type=int,
+        default=20000,
+        help="Maximum stored vectors to tune on (default: 20000)",
+    )
+    index_tune_parser.add_argument(
+        "--target-recall",
+        type=float,
+        default=0.95,
+        help="Recall the recommendation must reach (default: 0.95)",
+    )
+
     generate_parser = subparsers.add_parser(
         "generate",
         help="Generate a JIRA ticket",
         parents=[parent_parser],
     )
     generate_parser.add_argument(
-        "message", help="Description of the ticket to generate"
+        "message", nargs="?", help="Description of the ticket to generate"
     )
     generate_parser.add_argument(
         "-t", "--template", help="Path to template file"
@@ -231,6 +457,50 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip all confirmations and use defaults",
     )
+    generate_parser.add_argument(
+        "--rerank",
+        action="store_true",
+        help="Re-rank retrieved context with a cross-encoder",
+    )
+    generate_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Show the issue content live as the model writes it",
+    )
+    generate_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM, even if the response cache is enabled",
+    )
+    generate_parser.add_argument(
+        "--separate-metadata",
+        action="store_true",
+        help="Extract metadata with a second LLM call instead of generating "
+        "it together with the content",
+    )
+    generate_parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help='Generate a ticket for every {"id", "message"} line of a JSONL file',
+    )
+    generate_parser.add_argument(
+        "-o",
+        "--output",
+        help="Results file for --batch (default: <batch>.results.jsonl)",
+    )
+    generate_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Tickets generated at once with --batch (default: 4)",
+    )
+    generate_parser.add_argument(
+        "--scope",
+        action="append",
+        metavar="KEY=VALUE",
+        help="Restrict retrieved context, e.g. path=src/api, language=python, "
+        "status=Done, component=Backend or since=2024-01-01 (repeatable)",
+    )
 
     upload_parser = subparsers.add_parser(
         "upload",
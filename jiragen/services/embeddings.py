@@ -0,0 +1,63 @@
+"""Offline embedding function for benchmarks and air-gapped use."""
+
+import zlib
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+from jiragen.services.lexical import tokenize
+
+HASHING_MODEL_NAME = "hashing"
+HASHING_DIMENSIONS = 384
+
+
+class HashingEmbeddingFunction(EmbeddingFunction):
+    """Embeds text by feature hashing its terms into a fixed-size vector.
+
+    Needs no model download and gives identical vectors on every machine,
+    which makes benchmark results reproducible. Similarity is lexical, so
+    it is no substitute for a sentence transformer in normal use.
+
+    Select it with ``embedding_model = "hashing"``.
+
+    Attributes:
+        dimensions: Length of the produced vectors
+    """
+
+    def __init__(self, dimensions: int = HASHING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    @staticmethod
+    def name() -> str:
+        return HASHING_MODEL_NAME
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        terms = tokenize(text or "")
+        if not terms:
+            return vector
+        hashes = np.fromiter(
+            (zlib.crc32(term.encode("utf-8")) for term in terms),
+            dtype=np.uint32,
+            count=len(terms),
+        )
+        # The top bit picks the sign so colliding terms tend to cancel out
+        signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dimensions, signs)
+        # Dampen frequent terms, then normalize for cosine-like L2 distances
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return [self._embed(text) for text in input]
+
+    def embed_query(self, input: Documents) -> Embeddings:
+        return self(input)
+
+    def get_config(self) -> dict:
+        return {"dimensions": self.dimensions}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "HashingEmbeddingFunction":
+        return HashingEmbeddingFunction(**config)
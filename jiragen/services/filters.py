@@ -0,0 +1,208 @@
+"""Filterable metadata stored with documents and the scopes that query it."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+MAX_PATH_DEPTH = 8  # Path segments stored as path_0 .. path_7
+
+LANGUAGES = {
+    ".c": "c",
+    ".cc": "cpp",
+    ".cpp": "cpp",
+    ".cs": "csharp",
+    ".css": "css",
+    ".go": "go",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".html": "html",
+    ".java": "java",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".json": "json",
+    ".kt": "kotlin",
+    ".lua": "lua",
+    ".md": "markdown",
+    ".php": "php",
+    ".py": "python",
+    ".rb": "ruby",
+    ".rs": "rust",
+    ".scala": "scala",
+    ".sh": "shell",
+    ".sql": "sql",
+    ".swift": "swift",
+    ".toml": "toml",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+# JIRA data directories written by ``jiragen fetch`` and their document type
+JIRA_TYPES = {"epics": "epic", "tickets": "ticket", "components": "component"}
+
+CODEBASE_SCOPES = {"path", "language", "extension"}
+JIRA_SCOPES = {"type", "status", "component", "priority", "since"}
+
+
+def parse_jira_date(value: str) -> Optional[float]:
+    """Convert a JIRA timestamp such as ``2024-01-31T10:00:00.000+0000``."""
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _jira_metadata(path: Path) -> Dict[str, Any]:
+    """Read filterable fields from the JSON saved next to a JIRA document."""
+    doc_type = JIRA_TYPES.get(path.parent.name)
+    json_path = path.with_suffix(".json")
+    if doc_type is None or not json_path.is_file():
+        return {}
+
+    metadata: Dict[str, Any] = {"type": doc_type}
+    try:
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read JIRA metadata from {json_path}: {e}")
+        return metadata
+
+    for field in ("key", "status", "priority", "issue_type"):
+        if isinstance(data.get(field), str):
+            metadata[field] = data[field]
+    if doc_type == "epic":
+        metadata["issue_type"] = "Epic"
+    if doc_type == "component" and data.get("name"):
+        metadata["components"] = [data["name"]]
+    elif data.get("components"):
+        metadata["components"] = [str(c) for c in data["components"]]
+    if data.get("labels"):
+        metadata["labels"] = [str(label) for label in data["labels"]]
+    story_points = data.get("story_points")
+    if isinstance(story_points, (int, float)) and not isinstance(
+        story_points, bool
+    ):
+        metadata["story_points"] = float(story_points)
+    updated = parse_jira_date(data.get("updated"))
+    if updated is not None:
+        metadata["updated"] = updated
+    return metadata
+
+
+def document_metadata(
+    path: Path, root: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Build the metadata stored with an indexed file.
+
+    Code files get their language, extension and path segments relative to
+    ``root``; JIRA documents additionally get type, issue type, status,
+    priority, components, labels, story points and last update time from
+    their JSON sidecar.
+
+    Args:
+        path: Indexed file
+        root: Directory the path segments are relative to
+
+    Returns:
+        Dict[str, Any]: Metadata accepted by Chroma ``where`` filters
+    """
+    metadata: Dict[str, Any] = {"file_path": str(path)}
+    suffix = path.suffix.lower()
+    if suffix:
+        metadata["extension"] = suffix.lstrip(".")
+    if suffix in LANGUAGES:
+        metadata["language"] = LANGUAGES[suffix]
+
+    try:
+        parts = path.relative_to(root).parts if root else path.parts[1:]
+    except ValueError:
+        parts = path.parts[1:]
+    for i, part in enumerate(parts[:MAX_PATH_DEPTH]):
+        metadata[f"path_{i}"] = part
+
+    metadata.update(_jira_metadata(path))
+    return metadata
+
+
+def _combine(conditions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def _any(conditions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
+
+def parse_scopes(scopes: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Turn ``key=value`` scopes into ``where`` filters per collection.
+
+    Path, language and extension scopes restrict the codebase; type, status,
+    component, priority and since (a ``YYYY-MM-DD`` date) restrict JIRA
+    documents. Repeating a key matches any of its values.
+
+    Args:
+        scopes: Scope expressions such as ``path=src/api`` or ``status=Done``
+
+    Returns:
+        Dict with 'codebase' and 'jira' filters, None where unrestricted
+
+    Raises:
+        ValueError: If a scope is malformed or uses an unknown key
+    """
+    values: Dict[str, List[str]] = {}
+    for scope in scopes:
+        key, sep, value = scope.partition("=")
+        key, value = key.strip().lower(), value.strip()
+        if not sep or not value:
+            raise ValueError(f"Invalid scope '{scope}', expected key=value")
+        if key not in CODEBASE_SCOPES | JIRA_SCOPES:
+            raise ValueError(
+                f"Unknown scope '{key}', expected one of: "
+                + ", ".join(sorted(CODEBASE_SCOPES | JIRA_SCOPES))
+            )
+        values.setdefault(key, []).append(value)
+
+    codebase, jira = [], []
+    for key, options in values.items():
+        if key == "path":
+            codebase.append(
+                _any(
+                    [
+                        _combine(
+                            [
+                                {f"path_{i}": part}
+                                for i, part in enumerate(
+                                    Path(option).parts[:MAX_PATH_DEPTH]
+                                )
+                            ]
+                        )
+                        for option in options
+                    ]
+                )
+            )
+        elif key == "since":
+            timestamp = parse_jira_date(max(options))
+            if timestamp is None:
+                raise ValueError(f"Invalid date '{max(options)}'")
+            jira.append({"updated": {"$gte": timestamp}})
+        elif key == "component":
+            jira.append(
+                _any([{"components": {"$contains": o}} for o in options])
+            )
+        else:
+            condition = (
+                {key: options[0]}
+                if len(options) == 1
+                else {key: {"$in": options}}
+            )
+            (codebase if key in CODEBASE_SCOPES else jira).append(condition)
+
+    return {"codebase": _combine(codebase), "jira": _combine(jira)}
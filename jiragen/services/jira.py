@@ -5,15 +5,69 @@ Handles epics, tickets, and components with comprehensive error handling and log
 
 
 import json
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from jira import JIRA
 from loguru import logger
 from pydantic import BaseModel, ConfigDict
 
+from jiragen.services.rate_limit import AdaptiveRateLimiter
+
 FILTER_CUSTOM_FIELD_LENGTH = 5  # Minimum length for custom field content
+DEFAULT_PAGE_SIZE = 100  # Issues per search request, JIRA Cloud's maximum
+DEFAULT_FETCH_WORKERS = 4  # Concurrent requests per data type
+# JQL dates are read in the user's time zone, which may lie up to 14 hours
+# from the offsets in issue timestamps. Incremental fetches reach back this
+# far and skip the issues that turn out unchanged.
+WATERMARK_OVERLAP = timedelta(hours=14)
+WATERMARKS_FILE = "watermarks.json"
+
+
+def parse_jira_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a JIRA timestamp such as '2024-01-15T10:30:00.000+0100'."""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    logger.warning(f"Could not parse JIRA timestamp: {value}")
+    return None
+
+
+def watermark_jql(watermark: str) -> Optional[str]:
+    """Return the JQL date to fetch the issues updated since a watermark.
+
+    Args:
+        watermark: Latest 'updated' timestamp of an earlier fetch
+
+    Returns:
+        Optional[str]: Date in the 'yyyy/MM/dd HH:mm' format of JQL, None
+        if the watermark is unreadable
+    """
+    updated = parse_jira_datetime(watermark)
+    if updated is None:
+        return None
+    since = updated.astimezone(timezone.utc) - WATERMARK_OVERLAP
+    return since.strftime("%Y/%m/%d %H:%M")
 
 
 class JiraConfig(BaseModel):
@@ -46,27 +100,165 @@ class JiraFetchConfig(BaseModel):
 
     output_dir: Path
     data_types: List[str]
-    batch_size: int = 100
-    max_results: int = 1000
+    batch_size: int = DEFAULT_PAGE_SIZE  # Issues per search request
+    max_results: Optional[int] = None  # Issues per data type, None for all
+    workers: int = DEFAULT_FETCH_WORKERS  # Concurrent requests per data type
+    # Fields requested per data type on top of those the fetcher needs
+    extra_fields: Dict[str, List[str]] = {}
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 class JiraDataFetcher(ABC):
-    """Abstract base class for JIRA data fetchers."""
+    """Abstract base class for JIRA data fetchers.
+
+    Every request goes through a rate limiter, which may be shared with the
+    fetchers of other data types. Pages and items are fetched concurrently
+    by up to ``workers`` threads. Searches only ask for the ``fields`` and
+    ``expand`` the fetcher declares, plus the configured extra fields.
+
+    Attributes:
+        data_type: Name of the fetched data, requests are counted under it
+        fields: Issue fields processing and markdown conversion read
+        expand: Expansions processing reads
+        jira: Connected JIRA client
+        project_key: Key of the project to fetch from
+        page_size: Issues requested per search request
+        max_results: Stop after this many items, None for all of them
+        limiter: Rate limiter the requests are sent through
+        workers: Concurrent requests
+        extra_fields: Further fields to request, stored as custom fields
+        total: Number of items the running fetch yields, known once its
+            first page has arrived
+    """
 
-    def __init__(self, jira: JIRA, project_key: str):
+    data_type = ""
+    fields: Tuple[str, ...] = ()
+    expand: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        jira: JIRA,
+        project_key: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_results: Optional[int] = None,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        workers: int = DEFAULT_FETCH_WORKERS,
+        extra_fields: Optional[List[str]] = None,
+    ):
         self.jira = jira
         self.project_key = project_key
+        self.page_size = page_size
+        self.max_results = max_results
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.workers = max(1, workers)
+        self.extra_fields = list(extra_fields or [])
+        self.total: Optional[int] = None
         logger.debug(
             f"Initialized {self.__class__.__name__} for project: {project_key}"
         )
 
+    def requested_fields(self) -> List[str]:
+        """Return the declared fields followed by the extra ones."""
+        return list(dict.fromkeys([*self.fields, *self.extra_fields]))
+
     @abstractmethod
-    def fetch(self) -> List[Dict[str, Any]]:
-        """Fetch data from JIRA."""
+    def fetch(
+        self, updated_since: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Fetch data from JIRA, yielding items as they are processed.
+
+        Args:
+            updated_since: JQL date, only issues updated since then are
+                fetched if the data type records updates
+        """
         pass
 
+    def _request(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Send a JIRA request through the rate limiter."""
+        return self.limiter.call(func, *args, label=self.data_type, **kwargs)
+
+    def _search(self, jql: str) -> Iterator[Any]:
+        """Yield every issue matching a query, walking its pages.
+
+        The first page tells how many issues there are. The later pages
+        are then downloaded concurrently, a few ahead of the caller, while
+        it processes the issues of earlier ones.
+
+        Args:
+            jql: JQL query
+
+        Yields:
+            Issues with the requested fields, in the order JIRA returns them
+        """
+        self.total = None
+        expand = ",".join(self.expand) or None
+
+        def get_page(start: int, size: int):
+            return self._request(
+                self.jira.search_issues,
+                jql,
+                startAt=start,
+                maxResults=size,
+                # The client rewrites the list it is given, pass a new one
+                fields=self.requested_fields(),
+                expand=expand,
+            )
+
+        size = self.page_size
+        if self.max_results is not None:
+            size = min(size, self.max_results)
+        first = get_page(0, size)
+        end = getattr(first, "total", None)
+        if end is None:
+            end = len(first)
+        if self.max_results is not None:
+            end = min(end, self.max_results)
+        self.total = end
+        # JIRA may return fewer issues per page than requested
+        step = len(first) if 0 < len(first) < min(size, end) else size
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            next_start = len(first) if len(first) else end
+
+            def fill() -> None:
+                nonlocal next_start
+                while next_start < end and len(pending) < 2 * self.workers:
+                    size = min(step, end - next_start)
+                    future = executor.submit(get_page, next_start, size)
+                    pending.append((next_start, size, future))
+                    next_start += size
+
+            fill()
+            yield from first
+            while pending:
+                start, size, future = pending.popleft()
+                page = future.result()
+                if 0 < len(page) < size:
+                    # Cut short, fetch the rest before the later pages
+                    rest, missing = start + len(page), size - len(page)
+                    future = executor.submit(get_page, rest, missing)
+                    pending.appendleft((rest, missing, future))
+                fill()
+                logger.debug(
+                    f"Fetched {start + len(page)}/{end} issues for: {jql}"
+                )
+                yield from page
+
+    def _map(
+        self, func: Callable[[Any], Dict[str, Any]], items: Iterable[Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Process items on the worker threads, yielding them in order."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     @abstractmethod
     def to_markdown(self, data: Dict[str, Any]) -> str:
         """Convert data to markdown format."""
@@ -76,20 +268,39 @@ class JiraDataFetcher(ABC):
 class EpicFetcher(JiraDataFetcher):
     """Fetches and processes JIRA epics."""
 
-    def fetch(self) -> List[Dict[str, Any]]:
+    data_type = "epics"
+    fields = (
+        "summary",
+        "description",
+        "status",
+        "created",
+        "updated",
+        "assignee",
+        "reporter",
+        "priority",
+        "labels",
+        "components",
+        "comment",
+        "attachment",
+        "issuelinks",
+    )
+
+    def fetch(
+        self, updated_since: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
         excluded_statuses = ["Product team Backlog", "Epic Done"]
         status_list = '", "'.join(excluded_statuses)
         jql_query = f'project = "{self.project_key}" AND issuetype = Epic AND status NOT IN ("{status_list}")'
+        if updated_since:
+            jql_query += f' AND updated >= "{updated_since}"'
 
         logger.info(f"Fetching epics with JQL: {jql_query}")
         try:
-            epics = self.jira.search_issues(
-                jql_query,
-                maxResults=1000,
-                expand="changelog,renderedFields,names,schema,transitions,editmeta,changelog",
-            )
-            logger.success(f"Successfully fetched {len(epics)} epics")
-            return [self._process_epic(epic) for epic in epics]
+            count = 0
+            for epic in self._map(self._process_epic, self._search(jql_query)):
+                yield epic
+                count += 1
+            logger.success(f"Successfully fetched {count} epics")
         except Exception as e:
             logger.error(f"Error fetching epics: {str(e)}")
             raise
@@ -99,7 +310,7 @@ class EpicFetcher(JiraDataFetcher):
         logger.debug(f"Processing epic: {epic.key}")
         try:
             # Get all linked issues
-            links = self.jira.remote_links(epic)
+            links = self._request(self.jira.remote_links, epic)
             # TODO : implementation of linked issues by epic
             logger.warning(f"Links not taken into account: {links}")
             linked_issues = []
@@ -274,18 +485,30 @@ class EpicFetcher(JiraDataFetcher):
 class TicketFetcher(JiraDataFetcher):
     """Fetches and processes JIRA tickets with comprehensive metadata."""
 
-    def fetch(self) -> List[Dict[str, Any]]:
+    data_type = "tickets"
+    fields = EpicFetcher.fields + (
+        "issuetype",
+        "resolution",
+        "customfield_10002",  # Story points, adjust field ID as needed
+        "customfield_10014",  # Epic link, adjust field ID as needed
+    )
+
+    def fetch(
+        self, updated_since: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
         jql_query = f'project = "{self.project_key}" AND issuetype = Story'
+        if updated_since:
+            jql_query += f' AND updated >= "{updated_since}"'
 
         logger.info(f"Fetching tickets with JQL: {jql_query}")
         try:
-            tickets = self.jira.search_issues(
-                jql_query,
-                maxResults=1000,
-                expand="changelog,renderedFields,names,schema,transitions,editmeta,changelog",
-            )
-            logger.success(f"Successfully fetched {len(tickets)} tickets")
-            return [self._process_ticket(ticket) for ticket in tickets]
+            count = 0
+            for ticket in self._map(
+                self._process_ticket, self._search(jql_query)
+            ):
+                yield ticket
+                count += 1
+            logger.success(f"Successfully fetched {count} tickets")
         except Exception as e:
             logger.error(f"Error fetching tickets: {str(e)}")
             raise
@@ -394,6 +617,9 @@ class TicketFetcher(JiraDataFetcher):
                 "priority": ticket.fields.priority.name
                 if hasattr(ticket.fields.priority, "name")
                 else "None",
+                "issue_type": ticket.fields.issuetype.name
+                if hasattr(ticket.fields, "issuetype")
+                else None,
                 "labels": ticket.fields.labels,
                 "components": [comp.name for comp in ticket.fields.components]
                 if hasattr(ticket.fields, "components")
@@ -413,7 +639,8 @@ class TicketFetcher(JiraDataFetcher):
                 if ticket.fields.resolution
                 else None,
                 "watchers": [
-                    w.displayName for w in self.jira.watchers(ticket).watchers
+                    w.displayName
+                    for w in self._request(self.jira.watchers, ticket).watchers
                 ]
                 if hasattr(ticket, "watchers")
                 else [],
@@ -531,16 +758,25 @@ class TicketFetcher(JiraDataFetcher):
 class ComponentFetcher(JiraDataFetcher):
     """Fetches and processes JIRA components."""
 
-    def fetch(self) -> List[Dict[str, Any]]:
+    data_type = "components"
+
+    def fetch(
+        self, updated_since: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # Components have no update time, they are always fetched entirely
         logger.info(f"Fetching components for project: {self.project_key}")
         try:
-            components = self.jira.project_components(self.project_key)
+            components = self._request(
+                self.jira.project_components, self.project_key
+            )
+            if self.max_results is not None:
+                components = components[: self.max_results]
+            self.total = len(components)
             logger.success(
                 f"Successfully fetched {len(components)} components"
             )
-            return [
-                self._process_component(component) for component in components
-            ]
+            for component in components:
+                yield self._process_component(component)
         except Exception as e:
             logger.error(f"Error fetching components: {str(e)}")
             raise
@@ -573,15 +809,46 @@ class ComponentFetcher(JiraDataFetcher):
 
 
 class JiraDataManager:
-    """Manages JIRA data fetching and storage."""
+    """Manages JIRA data fetching and storage.
+
+    Fetches are incremental: the latest 'updated' timestamp seen for each
+    project and data type is kept as a watermark in ``watermarks.json`` of
+    the output directory, and later fetches only ask for issues updated
+    since then. Issues whose data did not change are neither rewritten nor
+    re-embedded.
+
+    Data types are fetched concurrently, and all their requests share one
+    rate limiter that slows down when JIRA answers 429.
+
+    Attributes:
+        limiter: Rate limiter shared by the fetchers
+        stats: Per data type counts of the last fetch: 'fetched', 'changed',
+            'unchanged' and 'removed' items, whether it was 'incremental',
+            its duration in 'seconds', the 'requests', 'throttled' and
+            'retries' of the rate limiter and the 'bytes' of payload received
+    """
+
+    def __init__(
+        self,
+        jira_config: JiraConfig,
+        fetch_config: JiraFetchConfig,
+        jira: Optional[JIRA] = None,
+    ):
+        """Initialize the JIRA data manager with configuration.
 
-    def __init__(self, jira_config: JiraConfig, fetch_config: JiraFetchConfig):
-        """Initialize the JIRA data manager with configuration."""
+        Args:
+            jira_config: Connection settings
+            fetch_config: What to fetch and where to store it
+            jira: Connected client to use instead of connecting
+        """
         logger.info("Initializing JiraDataManager")
         try:
-            self.jira = JIRA(
+            # Rate limits are retried by the shared limiter, which honours
+            # Retry-After, instead of by each request on its own
+            self.jira = jira or JIRA(
                 server=jira_config.url,
                 basic_auth=(jira_config.username, jira_config.api_token),
+                max_retries=0,
             )
             logger.success("Successfully connected to JIRA")
         except Exception as e:
@@ -597,17 +864,44 @@ class JiraDataManager:
 
         self.project_key = project_key
         self.config = fetch_config
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.limiter = AdaptiveRateLimiter()
+        self._count_payload()
+        self._store_lock = threading.Lock()
+        self._watermark_lock = threading.Lock()
 
         # Initialize fetchers
         self.fetchers = {
-            "epics": EpicFetcher(self.jira, self.project_key),
-            "tickets": TicketFetcher(self.jira, self.project_key),
-            "components": ComponentFetcher(self.jira, self.project_key),
+            name: fetcher_class(
+                self.jira,
+                self.project_key,
+                page_size=fetch_config.batch_size,
+                max_results=fetch_config.max_results,
+                limiter=self.limiter,
+                workers=fetch_config.workers,
+                extra_fields=fetch_config.extra_fields.get(name),
+            )
+            for name, fetcher_class in (
+                ("epics", EpicFetcher),
+                ("tickets", TicketFetcher),
+                ("components", ComponentFetcher),
+            )
         }
         logger.debug(
             f"Initialized fetchers for types: {list(self.fetchers.keys())}"
         )
 
+    def _count_payload(self) -> None:
+        """Count the size of every JIRA response in the limiter's stats."""
+        session = getattr(self.jira, "_session", None)
+        if session is None:
+            return
+
+        def on_response(response, *args, **kwargs):
+            self.limiter.record_bytes(len(response.content or b""))
+
+        session.hooks.setdefault("response", []).append(on_response)
+
     def _ensure_directory(self, directory: Union[str, Path]) -> Path:
         """
         Ensure a directory exists and create it if it doesn't.
@@ -669,12 +963,119 @@ class JiraDataManager:
             logger.error(f"Error saving markdown to {filepath}: {str(e)}")
             raise
 
-    def fetch_data(self, vector_store=None) -> Dict[str, int]:
+    @property
+    def watermarks_path(self) -> Path:
+        """File holding the watermarks of every project."""
+        return self.config.output_dir / WATERMARKS_FILE
+
+    def load_watermarks(self) -> Dict[str, str]:
+        """Return the watermark per data type of the project."""
+        try:
+            with open(self.watermarks_path, encoding="utf-8") as f:
+                return json.load(f).get(self.project_key, {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable watermarks: {e}")
+            return {}
+
+    def _save_watermark(self, data_type: str, watermark: str) -> None:
+        """Record the latest update fetched for a data type."""
+        with self._watermark_lock:
+            try:
+                with open(self.watermarks_path, encoding="utf-8") as f:
+                    watermarks = json.load(f)
+            except (OSError, ValueError):
+                watermarks = {}
+            watermarks.setdefault(self.project_key, {})[data_type] = watermark
+            self._ensure_directory(self.watermarks_path.parent)
+            tmp_path = self.watermarks_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(watermarks, f, indent=2)
+            tmp_path.replace(self.watermarks_path)
+        logger.debug(f"Saved {data_type} watermark: {watermark}")
+
+    def _is_unchanged(self, item: Dict[str, Any], json_path: Path) -> bool:
+        """Whether the item was already saved with the same data."""
+        try:
+            with open(json_path, encoding="utf-8") as f:
+                return json.load(f) == json.loads(json.dumps(item))
+        except (OSError, ValueError):
+            return False
+
+    def _remove_stale(
+        self, data_dir: Path, seen: set, vector_store=None
+    ) -> int:
+        """Delete the saved items a complete fetch did not return."""
+        stale = [
+            path for path in data_dir.glob("*.json") if path.stem not in seen
+        ]
+        md_paths = [path.with_suffix(".md") for path in stale]
+        for path in stale + md_paths:
+            path.unlink(missing_ok=True)
+        if vector_store is not None and md_paths:
+            try:
+                with self._store_lock:
+                    vector_store.remove_files(md_paths)
+            except Exception as e:
+                logger.error(f"Failed to remove files from vector store: {e}")
+        if stale:
+            logger.info(f"Removed {len(stale)} stale items from {data_dir}")
+        return len(stale)
+
+    def _add_to_store(
+        self, vector_store, pending: Dict[Path, Dict[str, Any]]
+    ) -> bool:
+        """Add markdown files to the vector store, then save their JSON.
+
+        The JSON of an item is only saved once it is indexed, so items that
+        failed to index are not taken as unchanged by the next fetch.
+
+        Args:
+            vector_store: Vector store instance, None to only save the JSON
+            pending: Items to save, by the path of their markdown file
+
+        Returns:
+            bool: False if the vector store failed
+        """
+        paths = list(pending)
+        items = list(pending.values())
+        pending.clear()
+        if vector_store is not None and paths:
+            jira_paths = [path for path in paths if self._is_jira_file(path)]
+            for path in set(paths) - set(jira_paths):
+                logger.warning(f"Skipping non-JIRA file: {path}")
+            try:
+                # One store request at a time across the data types
+                with self._store_lock:
+                    vector_store.add_files(jira_paths)
+            except Exception as e:
+                logger.error(f"Failed to add files to vector store: {e}")
+                return False
+        for path, item in zip(paths, items, strict=True):
+            self._save_json(item, path.with_suffix(".json"))
+        return True
+
+    def fetch_data(
+        self,
+        vector_store=None,
+        page_size: Optional[int] = None,
+        full: bool = False,
+    ) -> Dict[str, int]:
         """
         Fetch and store JIRA data.
 
+        Issues are fetched page by page and each item is written as soon as
+        it is processed, while the next page downloads. Written files are
+        added to the vector store a page at a time. Only issues updated
+        since the data type's watermark are fetched, unless ``full`` is set.
+
         Args:
             vector_store: Optional vector store instance for storing processed data
+            page_size: Issues per search request, defaults to the configured
+                ``batch_size``
+            full: Ignore the watermarks, rewrite every item and delete the
+                items JIRA no longer returns
 
         Returns:
             Dict[str, int]: Count of processed items for each data type
@@ -688,87 +1089,164 @@ class JiraDataManager:
         logger.debug(f"Processing data types: {data_types}")
 
         results = {}
+        self.stats = {}
         progress_callback = getattr(self, "progress_callback", None)
+        watermarks = {} if full else self.load_watermarks()
 
+        known = []
         for data_type in data_types:
             if data_type not in self.fetchers:
                 logger.warning(f"Skipping unknown data type: {data_type}")
                 continue
+            known.append(data_type)
+
+        # Data types are fetched side by side, sharing the rate limiter
+        with ThreadPoolExecutor(max_workers=max(1, len(known))) as executor:
+            futures = {
+                data_type: executor.submit(
+                    self._fetch_type,
+                    data_type,
+                    vector_store,
+                    page_size,
+                    full,
+                    watermarks.get(data_type),
+                    progress_callback,
+                )
+                for data_type in known
+            }
+            results = {
+                data_type: future.result()
+                for data_type, future in futures.items()
+            }
 
-            logger.info(f"Processing {data_type}")
-            fetcher = self.fetchers[data_type]
+        return results
 
-            try:
-                # Fetch items from JIRA
-                items = list(
-                    fetcher.fetch()
-                )  # Convert to list to get total count
-                total_items = len(items)
-
-                # Prepare output directory
-                data_dir = self._ensure_directory(
-                    self.config.output_dir / data_type
-                )
-                processed_count = 0
-
-                for item in items:
-                    item_id = item.get("key", item.get("name"))
-                    logger.debug(f"Processing {data_type} item: {item_id}")
-
-                    try:
-                        # Save raw JSON
-                        json_path = data_dir / f"{item_id}.json"
-                        self._save_json(item, json_path)
-
-                        # Convert to markdown and save
-                        markdown = fetcher.to_markdown(item)
-                        md_path = data_dir / f"{item_id}.md"
-                        self._save_markdown(markdown, md_path)
-
-                        # Add to vector store if provided
-                        if vector_store is not None:
-                            # Verify this is a JIRA file before adding
-                            if self._is_jira_file(md_path):
-                                try:
-                                    vector_store.add_files([md_path])
-                                except Exception as e:
-                                    logger.error(
-                                        f"Failed to add file to vector store: {e}"
-                                    )
-                            else:
-                                logger.warning(
-                                    f"Skipping non-JIRA file: {md_path}"
-                                )
-
-                        processed_count += 1
-
-                        # Update progress if callback is provided
-                        if progress_callback:
-                            progress = (processed_count / total_items) * 100
-                            progress_callback(
-                                data_type,
-                                progress,
-                                processed_count,
-                                total_items,
-                            )
-
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing {data_type} item {item_id}: {str(e)}"
+    def _fetch_type(
+        self,
+        data_type: str,
+        vector_store=None,
+        page_size: Optional[int] = None,
+        full: bool = False,
+        watermark: Optional[str] = None,
+        progress_callback: Optional[Callable[..., None]] = None,
+    ) -> int:
+        """Fetch and store one data type, see ``fetch_data``.
+
+        Returns:
+            int: Number of processed items, 0 if the fetch failed
+        """
+        logger.info(f"Processing {data_type}")
+        start_time = time.time()
+        fetcher = self.fetchers[data_type]
+        if page_size is not None:
+            fetcher.page_size = page_size
+        pending: Dict[Path, Dict[str, Any]] = {}
+        updated_since = watermark_jql(watermark) if watermark else None
+        stats = self.stats[data_type] = {
+            "fetched": 0,
+            "changed": 0,
+            "unchanged": 0,
+            "removed": 0,
+            "incremental": updated_since is not None,
+        }
+        if updated_since:
+            logger.info(f"Fetching {data_type} updated since {watermark}")
+        latest = parse_jira_datetime(watermark)
+        seen = set()
+        failed = False
+        processed_count = 0
+
+        try:
+            # Prepare output directory
+            data_dir = self._ensure_directory(
+                self.config.output_dir / data_type
+            )
+
+            # Items arrive while later pages are still downloading
+            for item in fetcher.fetch(updated_since=updated_since):
+                item_id = item.get("key", item.get("name"))
+                logger.debug(f"Processing {data_type} item: {item_id}")
+                seen.add(str(item_id))
+                stats["fetched"] += 1
+
+                try:
+                    json_path = data_dir / f"{item_id}.json"
+                    if not full and self._is_unchanged(item, json_path):
+                        stats["unchanged"] += 1
+                    else:
+                        self._write_item(fetcher, item, data_dir, pending)
+                        stats["changed"] += 1
+
+                    updated = parse_jira_datetime(item.get("updated"))
+                    if updated is not None and (
+                        latest is None or updated > latest
+                    ):
+                        watermark, latest = item["updated"], updated
+
+                    # Add to vector store a page at a time
+                    if len(pending) >= fetcher.page_size:
+                        if not self._add_to_store(vector_store, pending):
+                            failed = True
+
+                    processed_count += 1
+
+                    # Update progress if callback is provided
+                    if progress_callback:
+                        total_items = max(fetcher.total or 0, processed_count)
+                        progress = (processed_count / total_items) * 100
+                        progress_callback(
+                            data_type,
+                            progress,
+                            processed_count,
+                            total_items,
                         )
-                        continue
 
-                results[data_type] = processed_count
-                logger.success(
-                    f"Successfully processed {processed_count} {data_type}"
+                except Exception as e:
+                    logger.error(
+                        f"Error processing {data_type} item {item_id}: {str(e)}"
+                    )
+                    failed = True
+                    continue
+
+            if not self._add_to_store(vector_store, pending):
+                failed = True
+            if full and self.config.max_results is None:
+                stats["removed"] = self._remove_stale(
+                    data_dir, seen, vector_store
                 )
+            # Items that failed are fetched again by the next run
+            if watermark and not failed:
+                self._save_watermark(data_type, watermark)
+            logger.success(
+                f"Successfully processed {processed_count} {data_type}"
+            )
 
-            except Exception as e:
-                logger.error(f"Error processing {data_type}: {str(e)}")
-                results[data_type] = 0
-                continue
-
-        return results
+        except Exception as e:
+            logger.error(f"Error processing {data_type}: {str(e)}")
+            self._add_to_store(vector_store, pending)
+            processed_count = 0
+
+        finally:
+            stats["seconds"] = time.time() - start_time
+            stats.update(fetcher.limiter.stats(fetcher.data_type))
+
+        return processed_count
+
+    def _write_item(
+        self,
+        fetcher: JiraDataFetcher,
+        item: Dict[str, Any],
+        data_dir: Path,
+        pending: Dict[Path, Dict[str, Any]],
+    ) -> None:
+        """Save an item as markdown and queue it for embedding.
+
+        Its raw JSON is saved by ``_add_to_store`` once it is indexed.
+        """
+        item_id = item.get("key", item.get("name"))
+        md_path = data_dir / f"{item_id}.md"
+        self._save_markdown(fetcher.to_markdown(item), md_path)
+        pending[md_path] = item
 
     def bulk_fetch(
         self, vector_store, batch_size: int = None
@@ -789,7 +1267,7 @@ class JiraDataManager:
         logger.info(f"Starting bulk fetch with batch size {batch_size}")
 
         try:
-            results = self.fetch_data(vector_store)
+            results = self.fetch_data(vector_store, page_size=batch_size)
             logger.success("Bulk fetch completed successfully")
             return results
         except Exception as e:
@@ -0,0 +1,332 @@
+"""Persistent BM25 inverted index kept alongside each vector collection.
+
+Dense similarity misses exact identifiers, error codes and ticket keys; this
+index catches them. Postings live in memory for fast scoring and every
+change is written through to a SQLite sidecar so the index survives service
+restarts without re-tokenizing the collection.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Identifiers such as ``get_user``, ``PROJ-123``, ``E1234`` or ``a.b.c``
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[_\-.:][A-Za-z0-9]+)*")
+_SEPARATOR_RE = re.compile(r"[_\-.:]")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+# Terms present in nearly every document add no ranking signal but cost a
+# full pass over their postings, so they are skipped at query time
+MIN_IDF = 0.01
+
+
+@lru_cache(maxsize=65536)
+def _split_token(token: str) -> Tuple[str, ...]:
+    """Return a token followed by its snake, kebab and camel case parts."""
+    lowered = token.lower()
+    terms = [lowered]
+    for part in _SEPARATOR_RE.split(token):
+        for sub in _CAMEL_RE.findall(part):
+            sub = sub.lower()
+            if sub != lowered and len(sub) > 1:
+                terms.append(sub)
+    return tuple(terms)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms.
+
+    Compound identifiers are kept whole (``proj-123``, ``get_user_by_id``)
+    and also split into their snake, kebab and camel case parts so partial
+    matches still score.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        terms.extend(_split_token(token))
+    return terms
+
+
+class BM25Index:
+    """Incrementally updated Okapi BM25 index.
+
+    Attributes:
+        path: SQLite file holding the per-document term frequencies
+        k1: Term frequency saturation parameter
+        b: Document length normalization parameter
+        backfill: Called for ``(doc_id, text)`` pairs when the index is
+            empty on disk, e.g. for collections created before it existed
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        k1: float = 1.2,
+        b: float = 0.75,
+        backfill: Optional[Callable[[], Iterable[Tuple[str, str]]]] = None,
+    ):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+
+        self._doc_index: Dict[str, int] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Per-term BM25 contributions, valid until the next modification
+        self._scored: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs "
+            "(doc_id TEXT PRIMARY KEY, terms TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        # Large indexes take a while to load; do it off the startup path and
+        # make readers and writers wait for it instead
+        self._loaded = threading.Event()
+        threading.Thread(
+            target=self._load, args=(backfill,), daemon=True
+        ).start()
+
+    @classmethod
+    def for_collection(cls, db_path: Path, collection_name: str, **kwargs):
+        """Open the lexical index belonging to a collection."""
+        return cls(
+            Path(db_path) / f"{collection_name}.lexical.sqlite", **kwargs
+        )
+
+    def __len__(self) -> int:
+        self._loaded.wait()
+        return len(self._doc_index)
+
+    def __contains__(self, doc_id: str) -> bool:
+        self._loaded.wait()
+        return doc_id in self._doc_index
+
+    def _load(self, backfill) -> None:
+        """Rebuild the in-memory postings from the SQLite sidecar."""
+        try:
+            with self._lock:
+                self._load_rows()
+                if not self._doc_index and backfill is not None:
+                    logger.info(f"Backfilling lexical index {self.path}")
+                    self._add_many(backfill())
+        except Exception as e:
+            logger.error(f"Failed to load lexical index {self.path}: {e}")
+        finally:
+            self._loaded.set()
+
+    def _load_rows(self) -> None:
+        rows = self._conn.execute("SELECT doc_id, terms FROM docs").fetchall()
+        if not rows:
+            return
+
+        postings = self._postings
+        lengths = np.zeros(max(len(rows), 1024), dtype=np.float32)
+        for slot, (doc_id, terms) in enumerate(rows):
+            counts = json.loads(terms)
+            self._doc_ids.append(doc_id)
+            self._doc_index[doc_id] = slot
+            length = 0
+            for term, tf in counts.items():
+                length += tf
+                term_postings = postings.get(term)
+                if term_postings is None:
+                    postings[term] = {slot: tf}
+                else:
+                    term_postings[slot] = tf
+            lengths[slot] = length
+            self._total_length += length
+        self._lengths = lengths
+        logger.debug(f"Loaded {len(rows)} documents from {self.path}")
+
+    def _insert(self, doc_id: str, counts: Dict[str, int]) -> None:
+        """Add a document's term counts to the in-memory postings."""
+        self._scored.clear()
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._doc_ids[slot] = doc_id
+        else:
+            slot = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            if slot >= len(self._lengths):
+                self._lengths = np.concatenate(
+                    [self._lengths, np.zeros_like(self._lengths)]
+                )
+        self._doc_index[doc_id] = slot
+
+        length = sum(counts.values())
+        self._lengths[slot] = length
+        self._total_length += length
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[slot] = tf
+            self._arrays.pop(term, None)
+
+    def _delete(self, doc_id: str) -> Optional[Counter]:
+        """Remove a document from the in-memory postings."""
+        slot = self._doc_index.pop(doc_id, None)
+        if slot is None:
+            return None
+        self._scored.clear()
+        row = self._conn.execute(
+            "SELECT terms FROM docs WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        counts = Counter(json.loads(row[0])) if row else Counter()
+        for term in counts:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._arrays.pop(term, None)
+
+        self._total_length -= int(self._lengths[slot])
+        self._lengths[slot] = 0
+        self._doc_ids[slot] = None
+        self._free_slots.append(slot)
+        return counts
+
+    def add_many(self, documents: Iterable[Tuple[str, str]]) -> None:
+        """Index or re-index ``(doc_id, text)`` pairs."""
+        self._loaded.wait()
+        self._add_many(documents)
+
+    def _add_many(self, documents: Iterable[Tuple[str, str]]) -> None:
+        with self._lock:
+            rows = []
+            # Last write wins if a document appears more than once
+            for doc_id, text in dict(documents).items():
+                self._delete(doc_id)
+                counts = Counter(tokenize(text or ""))
+                self._insert(doc_id, counts)
+                rows.append((doc_id, json.dumps(counts)))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO docs (doc_id, terms) VALUES (?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index or re-index a single document."""
+        self.add_many([(doc_id, text)])
+
+    def remove(self, doc_ids: Iterable[str]) -> None:
+        """Remove documents from the index."""
+        self._loaded.wait()
+        with self._lock:
+            doc_ids = list(doc_ids)
+            for doc_id in doc_ids:
+                self._delete(doc_id)
+            self._conn.executemany(
+                "DELETE FROM docs WHERE doc_id = ?", [(d,) for d in doc_ids]
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self._loaded.wait()
+        with self._lock:
+            self._conn.execute("DELETE FROM docs")
+            self._conn.commit()
+            self._doc_index.clear()
+            self._doc_ids.clear()
+            self._free_slots.clear()
+            self._lengths[:] = 0
+            self._total_length = 0
+            self._postings.clear()
+            self._arrays.clear()
+            self._scored.clear()
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (slots, tfs) arrays for a term, cached until it changes."""
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return np.empty(0, dtype=np.int64), np.empty(0, np.float32)
+            arrays = (
+                np.fromiter(
+                    postings.keys(), dtype=np.int64, count=len(postings)
+                ),
+                np.fromiter(
+                    postings.values(), dtype=np.float32, count=len(postings)
+                ),
+            )
+            self._arrays[term] = arrays
+        return arrays
+
+    def _term_scores(
+        self, term: str, n_docs: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (slots, BM25 contributions) for a term, cached until the next write."""
+        scored = self._scored.get(term)
+        if scored is not None:
+            return scored
+
+        slots, tfs = self._term_arrays(term)
+        df = len(slots)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) if df else 0.0
+        if idf < MIN_IDF:
+            scored = (np.empty(0, dtype=np.int64), np.empty(0, np.float32))
+        else:
+            avg_length = self._total_length / n_docs or 1.0
+            norm = self.k1 * (
+                1 - self.b + self.b * self._lengths[slots] / avg_length
+            )
+            scored = (slots, idf * tfs * (self.k1 + 1) / (tfs + norm))
+        if df:
+            self._scored[term] = scored
+        return scored
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Return the ``k`` best ``(doc_id, score)`` pairs for a query.
+
+        Args:
+            query: Free text query
+            k: Number of results
+
+        Returns:
+            List of (doc_id, score) sorted by descending score
+        """
+        self._loaded.wait()
+        with self._lock:
+            n_docs = len(self._doc_index)
+            terms = set(tokenize(query))
+            if not n_docs or not terms:
+                return []
+
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+            for term in terms:
+                slots, contributions = self._term_scores(term, n_docs)
+                if len(slots):
+                    scores[slots] += contributions
+
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > k:
+                top = np.argpartition(scores[candidates], -k)[-k:]
+                candidates = candidates[top]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self._doc_ids[i], float(scores[i])) for i in ranked]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._loaded.wait()
+        with self._lock:
+            self._conn.close()
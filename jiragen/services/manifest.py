@@ -0,0 +1,144 @@
+"""Sidecar manifest recording what was indexed in each collection."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+
+class ManifestEntry(BaseModel):
+    """What the vector store holds for a single source file.
+
+    Attributes:
+        path: Absolute path of the source file
+        hash: SHA-256 of the indexed content
+        mtime: File modification time when it was indexed
+        size: File size in bytes when it was indexed
+        chunk_ids: Ids of the documents stored for this file
+        model: Embedding model used for the stored vectors
+    """
+
+    path: str
+    hash: str
+    mtime: float
+    size: int
+    chunk_ids: List[str] = Field(default_factory=list)
+    model: Optional[str] = None
+
+
+def content_hash(content: str) -> str:
+    """Hash file content the way the manifest stores it."""
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class IndexManifest:
+    """SQLite-backed mapping of path to hash, mtime, size, chunk ids and model.
+
+    One manifest lives next to the vector DB for every collection, so the
+    service can tell new, changed and deleted files apart without asking
+    Chroma about each id.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                chunk_ids TEXT NOT NULL,
+                model TEXT,
+                indexed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        logger.debug(f"Opened index manifest at {path}")
+
+    @classmethod
+    def for_collection(cls, db_path: Path, collection_name: str):
+        """Open the manifest belonging to a collection."""
+        return cls(Path(db_path) / f"{collection_name}.manifest.sqlite")
+
+    def _row_to_entry(self, row) -> ManifestEntry:
+        return ManifestEntry(
+            path=row[0],
+            hash=row[1],
+            mtime=row[2],
+            size=row[3],
+            chunk_ids=json.loads(row[4]),
+            model=row[5],
+        )
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """Return the entry for a path, if it was indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, hash, mtime, size, chunk_ids, model "
+                "FROM files WHERE path = ?",
+                (path,),
+            ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def entries(self) -> Dict[str, ManifestEntry]:
+        """Return every entry keyed by path."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, hash, mtime, size, chunk_ids, model FROM files"
+            ).fetchall()
+        return {row[0]: self._row_to_entry(row) for row in rows}
+
+    def upsert(self, entries: Iterable[ManifestEntry]) -> None:
+        """Insert or replace entries."""
+        now = time.time()
+        rows = [
+            (
+                e.path,
+                e.hash,
+                e.mtime,
+                e.size,
+                json.dumps(e.chunk_ids),
+                e.model,
+                now,
+            )
+            for e in entries
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files "
+                "(path, hash, mtime, size, chunk_ids, model, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def remove(self, paths: Iterable[str]) -> None:
+        """Forget the given paths."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM files WHERE path = ?", [(p,) for p in paths]
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Forget every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,161 @@
+"""Adaptive rate limiting of the requests sent to one JIRA site."""
+
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+from requests.exceptions import ConnectionError, Timeout
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # Seconds before the first retry, doubled per attempt
+BACKOFF_MAX = 60.0
+# After a 429 the interval between requests grows by this factor, and every
+# successful request shrinks it again by RECOVERY until there is none
+SLOWDOWN = 2.0
+RECOVERY = 0.95
+MIN_INTERVAL = 0.05  # Seconds, interval set by the first 429
+MAX_INTERVAL = 5.0
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Return the Retry-After header of a failed request in seconds."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Rate shared by every thread sending requests to one JIRA site.
+
+    Requests are sent as fast as allowed until JIRA answers 429. All
+    callers then pause until its Retry-After, and requests are spaced
+    further apart. The spacing shrinks again with every request that
+    succeeds. Transient server and connection errors are retried with
+    exponential backoff.
+
+    Attributes:
+        max_retries: Retries per request before its error is raised
+        interval: Current minimum number of seconds between two requests
+        requests: Number of requests sent, per label
+        throttled: Number of 429 responses received, per label
+        retries: Number of retried requests, per label
+        bytes: Size of the response bodies received, per label
+        waited: Seconds callers spent waiting for the limiter
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES):
+        self.max_retries = max_retries
+        self.interval = 0.0
+        self.requests: Counter = Counter()
+        self.throttled: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.bytes: Counter = Counter()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_at = 0.0
+        self._resume_at = 0.0
+
+    def acquire(self) -> None:
+        """Wait until the next request may be sent."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at, self._resume_at)
+            self._next_at = start + self.interval
+            self.waited += start - now
+        if start > now:
+            time.sleep(start - now)
+
+    def record_bytes(self, size: int) -> None:
+        """Count a response body under the label of the current call.
+
+        Meant to be called from a response hook of the HTTP session, which
+        runs in the thread sending the request.
+        """
+        label = getattr(self._local, "label", "")
+        with self._lock:
+            self.bytes[label] += size
+
+    def _succeeded(self) -> None:
+        with self._lock:
+            self.interval *= RECOVERY
+            if self.interval < MIN_INTERVAL / 2:
+                self.interval = 0.0
+
+    def _throttle(self, delay: float) -> None:
+        with self._lock:
+            self.interval = min(
+                MAX_INTERVAL, max(MIN_INTERVAL, self.interval * SLOWDOWN)
+            )
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def call(
+        self, func: Callable[..., Any], *args, label: str = "", **kwargs
+    ) -> Any:
+        """Send a request through the limiter, retrying transient errors.
+
+        Args:
+            func: Function sending the request
+            *args: Arguments of ``func``
+            label: Name the request is counted under, e.g. its data type
+            **kwargs: Keyword arguments of ``func``
+
+        Returns:
+            Whatever ``func`` returns
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            with self._lock:
+                self.requests[label] += 1
+            self._local.label = label
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                status = getattr(e, "status_code", None)
+                transient = status in RETRYABLE_STATUS or isinstance(
+                    e, (ConnectionError, Timeout)
+                )
+                if not transient or attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)
+                    delay *= random.uniform(0.5, 1.0)
+                with self._lock:
+                    self.retries[label] += 1
+                    if status == 429:
+                        self.throttled[label] += 1
+                if status == 429:
+                    self._throttle(delay)
+                    logger.warning(
+                        f"JIRA rate limit hit, pausing requests for "
+                        f"{delay:.1f}s"
+                    )
+                else:
+                    logger.warning(
+                        f"JIRA request failed ({e}), retrying in {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+                attempt += 1
+                continue
+            finally:
+                self._local.label = ""
+            self._succeeded()
+            return result
+
+    def stats(self, label: str) -> Dict[str, int]:
+        """Return the request counts and received bytes of a label."""
+        with self._lock:
+            return {
+                "requests": self.requests[label],
+                "throttled": self.throttled[label],
+                "retries": self.retries[label],
+                "bytes": self.bytes[label],
+            }
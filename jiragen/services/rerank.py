@@ -0,0 +1,134 @@
+"""Optional cross-encoder re-ranking stage for the query path."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+class CrossEncoderReranker:
+    """Scores (query, document) pairs with a CPU cross-encoder.
+
+    Scoring runs in batches until the per-request time budget is spent;
+    candidates that were not scored in time keep their original order after
+    the scored ones. Scores are cached per (query, document hash) so
+    repeated or overlapping queries only pay for new documents.
+
+    Attributes:
+        model_name: Hugging Face cross-encoder model
+        batch_size: Pairs scored per forward pass
+        max_chars: Documents are truncated to this many characters
+        cache_size: Maximum number of cached scores
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_RERANK_MODEL,
+        batch_size: int = 16,
+        max_chars: int = 2000,
+        cache_size: int = 4096,
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.cache_size = cache_size
+        self._model = None
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        """Load the cross-encoder on first use."""
+        if self._model is None:
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError as e:
+                raise RuntimeError(
+                    "Re-ranking requires the sentence-transformers package"
+                ) from e
+            logger.info(f"Loading cross-encoder model: {self.model_name}")
+            self._model = CrossEncoder(self.model_name, device="cpu")
+        return self._model
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _cache_put(self, key: Tuple[str, str], score: float) -> None:
+        with self._lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def rerank(
+        self,
+        query: str,
+        candidates: Sequence[Tuple[str, str]],
+        budget_ms: Optional[float] = None,
+    ) -> Tuple[List[str], Dict[str, float]]:
+        """Re-order candidate documents by cross-encoder relevance.
+
+        Args:
+            query: Query text
+            candidates: ``(doc_id, text)`` pairs in their current rank order
+            budget_ms: Stop scoring new batches once this much time is spent
+                scoring; loading the model on first use does not count
+
+        Returns:
+            Tuple of re-ranked doc ids and stats ('scored', 'cached',
+            'skipped')
+        """
+        scores: Dict[str, float] = {}
+        pending = []
+        for doc_id, text in candidates:
+            key = (query, hashlib.sha1(text.encode("utf-8")).hexdigest())
+            cached = self._cache_get(key)
+            if cached is not None:
+                scores[doc_id] = cached
+            else:
+                pending.append((doc_id, key, text[: self.max_chars]))
+        cached_count = len(scores)
+
+        if pending:
+            model = self._get_model()
+            deadline = time.time() + budget_ms / 1000 if budget_ms else None
+            for offset in range(0, len(pending), self.batch_size):
+                if deadline is not None and time.time() >= deadline:
+                    break
+                batch = pending[offset : offset + self.batch_size]
+                batch_scores = model.predict(
+                    [(query, text) for _, _, text in batch],
+                    batch_size=self.batch_size,
+                    show_progress_bar=False,
+                )
+                for (doc_id, key, _), score in zip(
+                    batch, batch_scores, strict=False
+                ):
+                    scores[doc_id] = float(score)
+                    self._cache_put(key, float(score))
+
+        scored = sorted(
+            (doc_id for doc_id, _ in candidates if doc_id in scores),
+            key=lambda doc_id: scores[doc_id],
+            reverse=True,
+        )
+        unscored = [doc_id for doc_id, _ in candidates if doc_id not in scores]
+        stats = {
+            "scored": len(scores) - cached_count,
+            "cached": cached_count,
+            "skipped": len(unscored),
+        }
+        if unscored:
+            logger.debug(
+                f"Re-rank budget of {budget_ms} ms exhausted, "
+                f"{len(unscored)} candidates left unscored"
+            )
+        return scored + unscored, stats
@@ -0,0 +1,118 @@
+"""Ranking helpers used by the vector store service query path."""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RRF_K = 60  # Damping constant from the original reciprocal rank fusion paper
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = RRF_K
+) -> List[Tuple[str, float]]:
+    """Fuse several ranked id lists into one.
+
+    Each id scores ``sum(1 / (k + rank))`` over the lists it appears in, so
+    documents ranked well by both the dense and the lexical retriever rise
+    to the top without having to calibrate their raw scores.
+
+    Args:
+        rankings: Ranked lists of document ids, best first
+        k: Damping constant
+
+    Returns:
+        List of (doc_id, fused score) sorted by descending score
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def suppress_near_duplicates(
+    embeddings: np.ndarray, threshold: float
+) -> List[int]:
+    """Drop candidates that are near-duplicates of a better ranked one.
+
+    Args:
+        embeddings: Candidate embeddings in rank order, shape (n, dim)
+        threshold: Cosine similarity above which two candidates are duplicates
+
+    Returns:
+        Indices of the kept candidates, in rank order
+    """
+    if len(embeddings) == 0:
+        return []
+    vectors = _normalize(embeddings)
+    similarity = vectors @ vectors.T
+    # A candidate is dropped if any better ranked candidate is too similar;
+    # only kept candidates may suppress others, hence the greedy pass
+    duplicate_of_earlier = np.triu(similarity > threshold, k=1)
+    kept = np.ones(len(vectors), dtype=bool)
+    for i in range(len(vectors)):
+        if kept[i]:
+            kept[duplicate_of_earlier[i]] = False
+    return np.flatnonzero(kept).tolist()
+
+
+def mmr_select(
+    query_embedding: np.ndarray,
+    embeddings: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+    scores: Optional[Sequence[float]] = None,
+) -> List[int]:
+    """Select candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    ``lambda * rel(d) - (1 - lambda) * max(sim(d, selected))``, where
+    ``rel`` is the cosine similarity to the query.
+
+    Args:
+        query_embedding: Query vector, shape (dim,)
+        embeddings: Candidate embeddings, shape (n, dim)
+        k: Number of candidates to select
+        lambda_mult: 1.0 is pure relevance, 0.0 pure diversity
+        scores: Scores of an earlier ranking stage, e.g. fused hybrid
+            scores, used as relevance instead of the cosine similarity.
+            They are rescaled to the cosine range so the trade-off against
+            redundancy stays the same.
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    n = len(embeddings)
+    if n == 0 or k <= 0:
+        return []
+    vectors = _normalize(embeddings)
+    relevance = vectors @ _normalize(query_embedding)
+    if scores is not None:
+        scores = np.asarray(scores, dtype=np.float32)
+        spread = scores.max() - scores.min()
+        scaled = (scores - scores.min()) / spread if spread else np.ones(n)
+        relevance = relevance.min() + scaled * (
+            relevance.max() - relevance.min()
+        )
+    similarity = vectors @ vectors.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(k, n):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
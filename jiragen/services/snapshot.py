@@ -0,0 +1,168 @@
+"""Portable vector store snapshot bundles.
+
+A snapshot is a single file laid out as::
+
+    MAGIC | version (uint32) | header length (uint64) | header JSON | padding | embeddings
+
+The header holds the ids, metadatas, documents, embedding model and source
+commit. Embeddings are stored as a contiguous little-endian float32 matrix
+aligned to ``DATA_ALIGNMENT`` bytes so they can be memory-mapped on load
+instead of being parsed or re-embedded.
+
+Document ids and ``file_path`` metadata below the exporting repository root
+are stored relative to it, and rebased onto the importing root on load, so
+a bundle built in one checkout matches the files of another.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+SNAPSHOT_MAGIC = b"JGSNAP\x00\x00"
+SNAPSHOT_FORMAT_VERSION = 1
+DATA_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sIQ")
+
+
+def relative_to_root(file_id: str, root: Optional[Path]) -> str:
+    """Return a stored path relative to ``root``, as is if outside of it."""
+    if root is None:
+        return file_id
+    try:
+        return Path(file_id).relative_to(root).as_posix()
+    except ValueError:
+        return file_id
+
+
+def rebase_on_root(file_id: str, root: Optional[Path]) -> str:
+    """Return a bundle path below ``root``; absolute paths are kept."""
+    if root is None:
+        return file_id
+    return str(root / file_id)
+
+
+def rebase_paths(
+    ids: List[str],
+    metadatas: List[Dict[str, Any]],
+    convert: Callable[[str, Optional[Path]], str],
+    root: Optional[Path],
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Convert the ids and ``file_path`` metadata of documents.
+
+    Args:
+        ids: Document ids, which are file paths
+        metadatas: Metadata of each document
+        convert: ``relative_to_root`` or ``rebase_on_root``
+        root: Repository root passed to ``convert``
+
+    Returns:
+        Tuple[List[str], List[Dict[str, Any]]]: Converted ids and metadatas
+    """
+    metadatas = [
+        (
+            {**metadata, "file_path": convert(metadata["file_path"], root)}
+            if metadata and "file_path" in metadata
+            else metadata
+        )
+        for metadata in metadatas
+    ]
+    return [convert(file_id, root) for file_id in ids], metadatas
+
+
+def write_snapshot(
+    path: Path, header: Dict[str, Any], embeddings: np.ndarray
+) -> int:
+    """Write a snapshot bundle atomically.
+
+    Args:
+        path: Destination file
+        header: JSON-serializable header (ids, metadatas, documents, ...)
+        embeddings: Matrix of shape (len(ids), dim)
+
+    Returns:
+        int: Size of the written bundle in bytes
+    """
+    matrix = np.ascontiguousarray(embeddings, dtype="<f4")
+    if matrix.ndim != 2 or matrix.shape[0] != len(header["ids"]):
+        raise ValueError(
+            f"Embeddings shape {matrix.shape} does not match "
+            f"{len(header['ids'])} ids"
+        )
+
+    header = {
+        **header,
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "count": int(matrix.shape[0]),
+        "dim": int(matrix.shape[1]),
+        "dtype": "<f4",
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_offset = _PREAMBLE.size + len(header_bytes)
+    padding = -data_offset % DATA_ALIGNMENT
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _PREAMBLE.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header_bytes)
+            )
+        )
+        f.write(header_bytes)
+        f.write(b"\x00" * padding)
+        f.write(matrix.tobytes())
+    os.replace(tmp_path, path)
+
+    size = path.stat().st_size
+    logger.info(
+        f"Wrote snapshot with {header['count']} vectors to {path} ({size} bytes)"
+    )
+    return size
+
+
+def read_snapshot(path: Path) -> Tuple[Dict[str, Any], np.ndarray]:
+    """Read a snapshot bundle, memory-mapping the embeddings.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Tuple of the header dict and a read-only (count, dim) float32 memmap
+
+    Raises:
+        ValueError: If the file is not a snapshot or has an unsupported version
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise ValueError(f"{path} is not a jiragen snapshot")
+        magic, version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a jiragen snapshot")
+        if version > SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Snapshot format version {version} is newer than the "
+                f"supported version {SNAPSHOT_FORMAT_VERSION}"
+            )
+        header = json.loads(f.read(header_length).decode("utf-8"))
+
+    data_offset = _PREAMBLE.size + header_length
+    data_offset += -data_offset % DATA_ALIGNMENT
+    count, dim = header["count"], header["dim"]
+    if count == 0:
+        return header, np.empty((0, dim), dtype="<f4")
+
+    embeddings = np.memmap(
+        path,
+        dtype=header.get("dtype", "<f4"),
+        mode="r",
+        offset=data_offset,
+        shape=(count, dim),
+    )
+    logger.debug(f"Memory-mapped {count}x{dim} embeddings from {path}")
+    return header, embeddings
@@ -0,0 +1,149 @@
+"""Extractive selection of the line windows of a document matching a query.
+
+Retrieval finds whole files, but the prompt only needs the parts of them
+that relate to the request. Documents are cut into overlapping windows of
+lines, each window is scored against the query and the best non-overlapping
+ones are returned with their line range.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from jiragen.services.lexical import tokenize
+
+DEFAULT_SNIPPET_LINES = 40
+DEFAULT_MAX_SNIPPETS = 3
+SNIPPET_SCORING = ("lexical", "embedding")
+
+# Term frequency saturation, as in BM25
+_K1 = 1.2
+
+
+def line_windows(
+    content: str, window_lines: int = DEFAULT_SNIPPET_LINES
+) -> List[Tuple[int, int, str]]:
+    """Cut a document into windows of lines overlapping by half.
+
+    Args:
+        content: Document text
+        window_lines: Lines per window
+
+    Returns:
+        List of (first line, last line, text), 1-based and inclusive. A
+        document no longer than one window is a single window.
+    """
+    lines = content.splitlines(keepends=True)
+    window_lines = max(1, window_lines)
+    if len(lines) <= window_lines:
+        return [(1, max(1, len(lines)), content)]
+    stride = max(1, window_lines // 2)
+    starts = list(range(0, len(lines) - window_lines, stride))
+    starts.append(len(lines) - window_lines)  # Always cover the tail
+    return [
+        (
+            start + 1,
+            start + window_lines,
+            "".join(lines[start : start + window_lines]),
+        )
+        for start in starts
+    ]
+
+
+def lexical_scores(query: str, texts: Sequence[str]) -> List[float]:
+    """Score texts by the query terms they contain.
+
+    Terms are weighted by how few of the texts contain them, so words found
+    all over a document count for little, and repeats saturate like BM25.
+    """
+    query_terms = set(tokenize(query))
+    counts = [Counter(tokenize(text)) for text in texts]
+    n = len(texts)
+    document_frequency = Counter(
+        term for count in counts for term in query_terms & count.keys()
+    )
+    idf = {
+        term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for term, df in document_frequency.items()
+    }
+    return [
+        sum(
+            weight * count[term] * (_K1 + 1) / (count[term] + _K1)
+            for term, weight in idf.items()
+            if term in count
+        )
+        for count in counts
+    ]
+
+
+def embedding_scores(
+    query_embedding: np.ndarray, embeddings: np.ndarray
+) -> List[float]:
+    """Score window embeddings by cosine similarity to the query."""
+    if len(embeddings) == 0:
+        return []
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.maximum(norms, 1e-12)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+    return (vectors @ query).tolist()
+
+
+def select_snippets(
+    windows: Sequence[Tuple[int, int, str]],
+    scores: Sequence[float],
+    max_snippets: int = DEFAULT_MAX_SNIPPETS,
+) -> List[Dict[str, Any]]:
+    """Pick the best scoring windows that do not overlap.
+
+    Only windows matching the query are kept. When none does, the first is
+    kept instead, as the head of a file usually says what it is about.
+    Adjacent windows are merged.
+
+    Args:
+        windows: Windows from ``line_windows``
+        scores: Score per window
+        max_snippets: Maximum number of windows kept
+
+    Returns:
+        List of snippets with 'start_line', 'end_line', 'content' and
+        'score', in document order
+    """
+    if not windows:
+        return []
+    order = sorted(
+        (i for i in range(len(windows)) if scores[i] > 0),
+        key=lambda i: -scores[i],
+    )
+    if not order:
+        order = [0]
+
+    chosen: List[int] = []
+    for i in order:
+        if len(chosen) >= max_snippets:
+            break
+        start, end, _ = windows[i]
+        if all(end < windows[j][0] or start > windows[j][1] for j in chosen):
+            chosen.append(i)
+
+    snippets: List[Dict[str, Any]] = []
+    for i in sorted(chosen, key=lambda i: windows[i][0]):
+        start, end, text = windows[i]
+        if snippets and snippets[-1]["end_line"] + 1 == start:
+            previous = snippets[-1]
+            previous["end_line"] = end
+            previous["content"] += text
+            previous["score"] = max(previous["score"], float(scores[i]))
+            continue
+        snippets.append(
+            {
+                "start_line": start,
+                "end_line": end,
+                "content": text,
+                "score": float(scores[i]),
+            }
+        )
+    return snippets
@@ -0,0 +1,157 @@
+"""Recall and latency measurements for HNSW index parameters."""
+
+import shutil
+import tempfile
+import time
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import chromadb
+import numpy as np
+from chromadb.config import Settings
+from loguru import logger
+
+# Chroma's defaults, used when a collection does not override them
+DEFAULT_HNSW = {
+    "hnsw_m": 16,
+    "hnsw_construction_ef": 100,
+    "hnsw_search_ef": 100,
+}
+
+HNSW_METADATA_KEYS = {
+    "hnsw_m": "hnsw:M",
+    "hnsw_construction_ef": "hnsw:construction_ef",
+    "hnsw_search_ef": "hnsw:search_ef",
+}
+
+BUILD_BATCH_SIZE = 1000
+
+
+def hnsw_metadata(settings: Dict[str, Optional[int]]) -> Dict[str, int]:
+    """Translate ``hnsw_*`` settings into Chroma collection metadata."""
+    return {
+        HNSW_METADATA_KEYS[key]: int(value)
+        for key, value in settings.items()
+        if key in HNSW_METADATA_KEYS and value is not None
+    }
+
+
+def exact_neighbors(
+    embeddings: np.ndarray, queries: np.ndarray, k: int
+) -> np.ndarray:
+    """Return the indices of the ``k`` nearest embeddings by L2 distance."""
+    # ||q - e||^2 = ||q||^2 - 2 q.e + ||e||^2, the first term is constant
+    distances = (embeddings**2).sum(axis=1)[None, :] - 2 * (
+        queries @ embeddings.T
+    )
+    k = min(k, len(embeddings))
+    top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(distances, top, axis=1).argsort(axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def tune_hnsw(
+    embeddings: np.ndarray,
+    m_values: Sequence[int] = (8, 16, 32),
+    construction_ef_values: Sequence[int] = (100, 200),
+    search_ef_values: Sequence[int] = (10, 50, 100),
+    k: int = 10,
+    n_queries: int = 100,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Build throwaway indexes over the embeddings and measure each setting.
+
+    Queries are stored vectors with a little noise added; the ground truth
+    is an exact search over all embeddings.
+
+    Args:
+        embeddings: Vectors of the collection being tuned, shape (n, dim)
+        m_values: HNSW ``M`` values to try
+        construction_ef_values: ``construction_ef`` values to try
+        search_ef_values: ``search_ef`` values to try
+        k: Neighbors per query for recall@k
+        n_queries: Number of sampled queries
+        seed: Random seed for query sampling
+
+    Returns:
+        One row per combination with recall, p50/p99 latency in ms, on-disk
+        size in bytes and build time in seconds
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if len(embeddings) == 0:
+        raise ValueError("Collection has no embeddings to tune on")
+
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(
+        len(embeddings), size=min(n_queries, len(embeddings)), replace=False
+    )
+    scale = float(embeddings.std()) * 0.05
+    queries = embeddings[sample] + rng.normal(
+        0, scale, size=(len(sample), embeddings.shape[1])
+    ).astype(np.float32)
+    truth = exact_neighbors(embeddings, queries, k)
+    ids = [str(i) for i in range(len(embeddings))]
+
+    rows = []
+    # search_ef is fixed once an index is loaded, so every combination gets
+    # its own build
+    for m, construction_ef, search_ef in product(
+        m_values, construction_ef_values, search_ef_values
+    ):
+        work_dir = Path(tempfile.mkdtemp(prefix="jiragen-tune-"))
+        try:
+            client = chromadb.PersistentClient(
+                path=str(work_dir),
+                settings=Settings(anonymized_telemetry=False),
+            )
+            build_start = time.time()
+            collection = client.create_collection(
+                name="tuning",
+                embedding_function=None,
+                metadata=hnsw_metadata(
+                    {
+                        "hnsw_m": m,
+                        "hnsw_construction_ef": construction_ef,
+                        "hnsw_search_ef": search_ef,
+                    }
+                ),
+            )
+            for offset in range(0, len(ids), BUILD_BATCH_SIZE):
+                end = offset + BUILD_BATCH_SIZE
+                collection.add(
+                    ids=ids[offset:end], embeddings=embeddings[offset:end]
+                )
+            build_seconds = time.time() - build_start
+
+            latencies, hits = [], 0
+            for query, expected in zip(queries, truth, strict=False):
+                query_start = time.perf_counter()
+                result = collection.query(
+                    query_embeddings=[query], n_results=k, include=[]
+                )
+                latencies.append((time.perf_counter() - query_start) * 1000)
+                found = {int(i) for i in result["ids"][0]}
+                hits += len(found & set(expected.tolist()))
+
+            rows.append(
+                {
+                    "hnsw_m": m,
+                    "hnsw_construction_ef": construction_ef,
+                    "hnsw_search_ef": search_ef,
+                    "recall": hits / truth.size,
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p99_ms": float(np.percentile(latencies, 99)),
+                    "size": _dir_size(work_dir),
+                    "build_s": build_seconds,
+                }
+            )
+            logger.debug(f"HNSW tuning result: {rows[-1]}")
+            del collection, client
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return rows
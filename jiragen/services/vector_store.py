@@ -5,17 +5,60 @@ import socket
 import sys
 import threading
 import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 from loguru import logger
 
+from jiragen.services.embeddings import (
+    HASHING_MODEL_NAME,
+    HashingEmbeddingFunction,
+)
+from jiragen.services.filters import document_metadata
+from jiragen.services.lexical import BM25Index
+from jiragen.services.manifest import (
+    IndexManifest,
+    ManifestEntry,
+    content_hash,
+)
+from jiragen.services.rerank import CrossEncoderReranker
+from jiragen.services.retrieval import (
+    mmr_select,
+    reciprocal_rank_fusion,
+    suppress_near_duplicates,
+)
+from jiragen.services.snapshot import (
+    read_snapshot,
+    rebase_on_root,
+    rebase_paths,
+    relative_to_root,
+    write_snapshot,
+)
+from jiragen.services.snippets import (
+    DEFAULT_MAX_SNIPPETS,
+    DEFAULT_SNIPPET_LINES,
+    embedding_scores,
+    lexical_scores,
+    line_windows,
+    select_snippets,
+)
+from jiragen.services.tuning import DEFAULT_HNSW, hnsw_metadata, tune_hnsw
+
 SOCKET_TIMEOUT = 30  # 30 seconds timeout
 BUFFER_SIZE = 16384  # 16KB buffer size
+SNAPSHOT_BATCH_SIZE = 1000  # Documents per upsert() call when importing
+RERANK_FETCH_K = 50  # Candidates over-fetched for the cross-encoder
+WHERE_LEXICAL_FETCH = 4  # BM25 over-fetch factor when a filter applies
+DEFAULT_RERANK_BUDGET_MS = 250  # Per-request cross-encoder time budget
+DEFAULT_MMR_LAMBDA = 0.5  # Relevance vs. diversity trade-off for MMR
+QUERY_EMBEDDING_CACHE_SIZE = 256  # Recently embedded query texts kept
+TUNE_MAX_VECTORS = 20000  # Embeddings sampled from a collection for tuning
 
 
 def setup_logging(log_path: Path):
@@ -34,7 +77,16 @@ class VectorStoreService:
         self.sock = None
         self.client = None
         self.collections = {}
+        self.manifests = {}
+        self.lexical_indexes = {}
+        # Configured HNSW collection metadata, per collection
+        self.hnsw_settings = {}
+        self.reranker = None
+        self.query_embeddings = OrderedDict()
+        self.query_embeddings_lock = threading.Lock()
+        self.init_lock = threading.Lock()
         self.embedding_function = None
+        self.embedding_model = None
         self.initialized = False
         self.db_path = None
 
@@ -71,6 +123,12 @@ class VectorStoreService:
 
     def initialize_store(self, config: Dict[str, Any]) -> None:
         """Initialize the vector store with the given configuration"""
+        # Clients initialize their collections concurrently; the shared
+        # ChromaDB client and embedding function must only be created once
+        with self.init_lock:
+            self._initialize_store(config)
+
+    def _initialize_store(self, config: Dict[str, Any]) -> None:
         try:
             logger.debug("Starting store initialization")
             collection_name = config.get(
@@ -95,16 +153,20 @@ class VectorStoreService:
                 logger.debug(
                     f"Initializing embedding function with device: {device}"
                 )
-                self.embedding_function = (
-                    # https://huggingface.co/Alibaba-NLP/gte-modernbert-base
-                    embedding_functions.SentenceTransformerEmbeddingFunction(
-                        model_name=config.get(
-                            "embedding_model", "all-MiniLM-L6-v2"
-                        ),
-                        trust_remote_code=True,
-                        device=device,
-                    )
+                self.embedding_model = config.get(
+                    "embedding_model", "all-MiniLM-L6-v2"
                 )
+                if self.embedding_model == HASHING_MODEL_NAME:
+                    self.embedding_function = HashingEmbeddingFunction()
+                else:
+                    self.embedding_function = (
+                        # https://huggingface.co/Alibaba-NLP/gte-modernbert-base
+                        embedding_functions.SentenceTransformerEmbeddingFunction(
+                            model_name=self.embedding_model,
+                            trust_remote_code=True,
+                            device=device,
+                        )
+                    )
 
                 # Initialize ChromaDB client
                 logger.debug(f"Initializing ChromaDB client at {self.db_path}")
@@ -120,6 +182,8 @@ class VectorStoreService:
 
             # Get or create collection
             logger.debug(f"Getting/Creating collection: {collection_name}")
+            hnsw = hnsw_metadata(config)
+            self.hnsw_settings[collection_name] = hnsw
             try:
                 collection = self.client.get_collection(
                     name=collection_name,
@@ -128,6 +192,7 @@ class VectorStoreService:
                 logger.info(
                     f"Retrieved existing collection: {collection_name}"
                 )
+                self._apply_hnsw_settings(collection, hnsw)
             except Exception as e:
                 logger.warning(
                     f"Collection not found, creating a new one: {e}"
@@ -135,10 +200,20 @@ class VectorStoreService:
                 collection = self.client.create_collection(
                     name=collection_name,
                     embedding_function=self.embedding_function,
+                    metadata=hnsw or None,
+                )
+                logger.info(
+                    f"Created new collection: {collection_name} "
+                    f"with HNSW settings {hnsw or 'defaults'}"
                 )
-                logger.info(f"Created new collection: {collection_name}")
 
             self.collections[collection_name] = collection
+            self.manifests[collection_name] = IndexManifest.for_collection(
+                self.db_path, collection_name
+            )
+            self.lexical_indexes[collection_name] = self._open_lexical_index(
+                collection_name, collection
+            )
             logger.info(
                 f"Collection {collection_name} initialized successfully"
             )
@@ -147,6 +222,151 @@ class VectorStoreService:
             logger.exception("Failed to initialize store")
             raise RuntimeError("Failed to initialize vector store") from e
 
+    def _apply_hnsw_settings(self, collection, hnsw: Dict[str, int]) -> None:
+        """Bring an existing collection in line with the configured HNSW settings.
+
+        ``search_ef`` can change in place; ``M`` and ``construction_ef`` are
+        fixed when the graph is built, so differences are only reported.
+        """
+        current = collection.metadata or {}
+        changed = {k: v for k, v in hnsw.items() if current.get(k) != v}
+        if not changed:
+            return
+
+        search_ef = changed.pop("hnsw:search_ef", None)
+        if changed:
+            logger.warning(
+                f"Collection {collection.name} was built with different "
+                f"HNSW settings than configured ({changed}); export, clean "
+                f"and re-import or re-add it to apply them"
+            )
+        if search_ef is not None:
+            try:
+                collection.modify(
+                    metadata={**current, "hnsw:search_ef": search_ef}
+                )
+                collection.modify(
+                    configuration={"hnsw": {"ef_search": search_ef}}
+                )
+                logger.info(
+                    f"Set search_ef={search_ef} on {collection.name}, "
+                    f"effective after the service restarts"
+                )
+            except Exception as e:
+                logger.warning(f"Could not update search_ef: {e}")
+
+    def _open_lexical_index(self, collection_name: str, collection):
+        """Open a collection's BM25 index, backfilling it if it is new."""
+
+        def backfill():
+            data = collection.get(include=["documents"])
+            return zip(data["ids"], data["documents"], strict=False)
+
+        return BM25Index.for_collection(
+            self.db_path, collection_name, backfill=backfill
+        )
+
+    def _index_file(
+        self,
+        collection_name: str,
+        path: Path,
+        force: bool = False,
+        root: Optional[Path] = None,
+    ) -> str:
+        """Embed a single file unless the manifest shows it is unchanged.
+
+        Args:
+            collection_name: Collection to write to
+            path: File to index
+            force: Re-embed even if the content hash is unchanged
+            root: Directory the stored path segments are relative to
+
+        Returns:
+            str: 'added', 'updated' or 'unchanged'
+        """
+        collection = self.collections[collection_name]
+        manifest = self.manifests[collection_name]
+        file_id = str(path)
+        stat = path.stat()
+        entry = manifest.get(file_id)
+
+        if (
+            entry is not None
+            and not force
+            and entry.model == self.embedding_model
+            and entry.mtime == stat.st_mtime
+            and entry.size == stat.st_size
+        ):
+            return "unchanged"
+
+        logger.debug(f"Reading file: {path}")
+        content = path.read_text()
+        file_hash = content_hash(content)
+
+        if (
+            entry is not None
+            and not force
+            and entry.model == self.embedding_model
+            and entry.hash == file_hash
+        ):
+            # Touched but not modified, only refresh the stat fields and
+            # metadata, which does not need a new embedding
+            collection.update(
+                ids=[file_id], metadatas=[document_metadata(path, root)]
+            )
+            manifest.upsert(
+                [
+                    entry.model_copy(
+                        update={"mtime": stat.st_mtime, "size": stat.st_size}
+                    )
+                ]
+            )
+            return "unchanged"
+
+        collection.upsert(
+            documents=[content],
+            metadatas=[document_metadata(path, root)],
+            ids=[file_id],
+        )
+        self.lexical_indexes[collection_name].add(file_id, content)
+        stale_ids = set(entry.chunk_ids) - {file_id} if entry else set()
+        if stale_ids:
+            collection.delete(ids=list(stale_ids))
+            self.lexical_indexes[collection_name].remove(stale_ids)
+
+        manifest.upsert(
+            [
+                ManifestEntry(
+                    path=file_id,
+                    hash=file_hash,
+                    mtime=stat.st_mtime,
+                    size=stat.st_size,
+                    chunk_ids=[file_id],
+                    model=self.embedding_model,
+                )
+            ]
+        )
+        return "updated" if entry is not None else "added"
+
+    def _is_stale(self, entry: ManifestEntry, path: Path) -> bool:
+        """Check whether an indexed file needs to be re-embedded."""
+        if entry.model != self.embedding_model:
+            return True
+        stat = path.stat()
+        if entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            return False
+        return entry.hash != content_hash(path.read_text())
+
+    def _remove_file(self, collection_name: str, file_id: str) -> None:
+        """Delete a file's documents and forget it in the manifest."""
+        collection = self.collections[collection_name]
+        manifest = self.manifests[collection_name]
+        entry = manifest.get(file_id)
+        chunk_ids = entry.chunk_ids if entry else [file_id]
+        collection.delete(ids=chunk_ids)
+        self.lexical_indexes[collection_name].remove(chunk_ids)
+        manifest.remove([file_id])
+
     def handle_add_files(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle adding files to the vector store"""
         logger.debug("Handling add_files")
@@ -162,37 +382,29 @@ class VectorStoreService:
                 }
 
             paths = [Path(p) for p in params["paths"]]
+            root = Path(params["root"]) if params.get("root") else None
             added_files = set()
+            unchanged = 0
 
             for path in paths:
                 if path.is_file():
                     try:
-                        logger.debug(f"Reading file: {path}")
-                        content = path.read_text()
-                        file_id = str(path)
-
-                        # Try to delete existing document first
-                        try:
-                            collection.delete(ids=[file_id])
-                        except Exception as e:
-                            logger.debug(
-                                f"File not found in collection or error removing {path}: {e}"
-                            )
-                            pass
-
-                        # Add the document
-                        collection.add(
-                            documents=[content],
-                            metadatas=[{"file_path": str(path)}],
-                            ids=[file_id],
+                        status = self._index_file(
+                            collection_name,
+                            path,
+                            force=params.get("force", False),
+                            root=root,
                         )
-
+                        if status == "unchanged":
+                            unchanged += 1
                         added_files.add(str(path))
-                        logger.debug(f"Successfully added file: {path}")
+                        logger.debug(f"File {path}: {status}")
 
                     except Exception as e:
                         logger.error(f"Failed to add file {path}: {e}")
 
+            if unchanged:
+                logger.info(f"Skipped {unchanged} unchanged files")
             return {"status": "success", "data": list(added_files)}
 
         except Exception as e:
@@ -221,7 +433,7 @@ class VectorStoreService:
                     file_id = str(path)
                     # Try to delete the document
                     try:
-                        collection.delete(ids=[file_id])
+                        self._remove_file(collection_name, file_id)
                         removed_files.add(str(path))
                         logger.debug(f"Successfully removed file: {path}")
                     except Exception as e:
@@ -240,6 +452,105 @@ class VectorStoreService:
                 "Failed to remove files from vector store"
             ) from e
 
+    def handle_sync(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle mirroring a set of working tree files into a collection.
+
+        Compares the given files against the manifest in a single pass and
+        applies only the difference: new files are embedded, modified files
+        re-embedded and manifest entries under ``scopes`` that are no longer
+        present are deleted. A scope ending in ``/*`` only covers the files
+        directly in its directory. Files that cannot be read are reported as
+        failed and left as they are.
+        """
+        logger.debug("Handling sync")
+        collection_name = params.get("collection_name", "repository_content")
+        try:
+            if collection_name not in self.collections:
+                return {
+                    "error": f"Collection {collection_name} not initialized"
+                }
+
+            start_time = time.time()
+            manifest = self.manifests[collection_name]
+            known = manifest.entries()
+            current = {str(Path(p)) for p in params["paths"]}
+            scopes = [str(Path(s)) for s in params.get("scopes", [])]
+            dry_run = params.get("dry_run", False)
+            root = Path(params["root"]) if params.get("root") else None
+
+            def in_scope(file_id: str) -> bool:
+                for scope in scopes:
+                    if scope.endswith("/*"):
+                        if str(Path(file_id).parent) == scope[:-2]:
+                            return True
+                    elif file_id == scope or file_id.startswith(
+                        scope.rstrip("/") + "/"
+                    ):
+                        return True
+                return False
+
+            plan = {
+                "added": [],
+                "updated": [],
+                "deleted": [],
+                "failed": [],
+                "unchanged": 0,
+            }
+            for file_id in sorted(set(known) - current):
+                if in_scope(file_id):
+                    plan["deleted"].append(file_id)
+
+            for file_id in sorted(current):
+                path = Path(file_id)
+                entry = known.get(file_id)
+                if entry is None:
+                    if not dry_run:
+                        try:
+                            self._index_file(collection_name, path, root=root)
+                        except Exception as e:
+                            logger.error(f"Failed to sync file {path}: {e}")
+                            plan["failed"].append(file_id)
+                            continue
+                    plan["added"].append(file_id)
+                    continue
+
+                try:
+                    if dry_run:
+                        stale = self._is_stale(entry, path)
+                        status = "updated" if stale else "unchanged"
+                    else:
+                        status = self._index_file(
+                            collection_name, path, root=root
+                        )
+                except Exception as e:
+                    logger.error(f"Failed to sync file {path}: {e}")
+                    plan["failed"].append(file_id)
+                    continue
+                if status == "updated":
+                    plan["updated"].append(file_id)
+                else:
+                    plan["unchanged"] += 1
+
+            if not dry_run:
+                for file_id in plan["deleted"]:
+                    try:
+                        self._remove_file(collection_name, file_id)
+                    except Exception as e:
+                        logger.error(f"Failed to delete {file_id}: {e}")
+
+            duration = time.time() - start_time
+            logger.info(
+                f"Synced {collection_name} in {duration:.2f} seconds: "
+                f"{len(plan['added'])} added, {len(plan['updated'])} updated, "
+                f"{len(plan['deleted'])} deleted, "
+                f"{plan['unchanged']} unchanged, {len(plan['failed'])} failed"
+            )
+            return {"status": "success", "data": plan}
+
+        except Exception as e:
+            logger.exception(f"Failed to sync collection {collection_name}")
+            raise RuntimeError(f"Failed to sync files: {str(e)}") from e
+
     def handle_get_stored_files(
         self, params: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -321,8 +632,57 @@ class VectorStoreService:
             logger.exception("Error in get_stored_files")
             return {"error": str(e)}
 
+    def _embed_query(self, text: str) -> np.ndarray:
+        """Embed query text, reusing recent results for the same text"""
+        key = (self.embedding_model, text)
+        with self.query_embeddings_lock:
+            embedding = self.query_embeddings.get(key)
+            if embedding is not None:
+                self.query_embeddings.move_to_end(key)
+                return embedding
+
+        embedding = np.asarray(
+            self.embedding_function([text])[0], dtype=np.float32
+        )
+        with self.query_embeddings_lock:
+            self.query_embeddings[key] = embedding
+            while len(self.query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self.query_embeddings.popitem(last=False)
+        return embedding
+
+    def handle_embed_query(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle embedding query text with the collection embedding model"""
+        try:
+            embedding = self._embed_query(params["text"])
+            return {
+                "status": "success",
+                "data": embedding.tolist(),
+                "model": self.embedding_model,
+            }
+        except Exception as e:
+            logger.exception("Failed to embed query")
+            raise RuntimeError(f"Failed to embed query: {str(e)}") from e
+
     def handle_query_similar(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle querying similar documents"""
+        """Handle querying similar documents
+
+        Candidates come from the dense index, optionally fused with the BM25
+        index (``hybrid``). A precomputed query ``embedding`` may be passed
+        to skip embedding ``text``, and a Chroma ``where`` filter restricts
+        both indexes; BM25 hits are over-fetched and checked against it by
+        id. Near-duplicates above ``dedup_threshold`` cosine
+        similarity are dropped and ``mmr`` selects a diverse subset using the
+        stored embeddings, before an optional cross-encoder re-rank
+        (``rerank``) within ``rerank_budget_ms``. Per-stage timings are
+        returned with the results, and every document carries its vector
+        ``distance`` to the query.
+
+        Unless ``full_document`` is set, each document's 'content' is reduced
+        to its best matching windows of ``snippet_lines`` lines, listed with
+        their line ranges under 'snippets'. Windows are scored by lexical
+        overlap with the query or, with ``snippet_scoring="embedding"``, by
+        the similarity of their embedding to the query embedding.
+        """
         try:
             collection_name = params.get(
                 "collection_name", "repository_content"
@@ -335,26 +695,174 @@ class VectorStoreService:
 
             text = params["text"]
             n_results = params.get("n_results", 5)
+            hybrid = params.get("hybrid", False)
+            rerank = params.get("rerank", False)
+            mmr = params.get("mmr", False)
+            dedup_threshold = params.get("dedup_threshold")
+            where = params.get("where") or None
+            use_embeddings = mmr or dedup_threshold is not None
+            timings = {}
+
+            fetch_k = params.get("fetch_k") or (
+                n_results * 4 if hybrid or use_embeddings else n_results
+            )
+            if rerank:
+                fetch_k = max(fetch_k, RERANK_FETCH_K)
+            fetch_k = max(fetch_k, n_results)
+
+            include = ["documents", "metadatas"]
+            if use_embeddings:
+                include.append("embeddings")
 
             logger.debug(
                 f"Querying collection {collection_name} with text: {text}"
             )
-            results = collection.query(query_texts=[text], n_results=n_results)
+            stage_start = time.time()
+            query_embedding = params.get("embedding")
+            if query_embedding is None:
+                query_embedding = self._embed_query(text)
+            query_embedding = np.asarray(query_embedding, dtype=np.float32)
+            timings["embed_ms"] = (time.time() - stage_start) * 1000
+
+            stage_start = time.time()
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=fetch_k,
+                where=where,
+                include=[*include, "distances"],
+            )
+            timings["vector_ms"] = (time.time() - stage_start) * 1000
+            ids = results["ids"][0]
+            documents = dict(zip(ids, results["documents"][0], strict=False))
+            metadatas = dict(zip(ids, results["metadatas"][0], strict=False))
+            distances = dict(zip(ids, results["distances"][0], strict=False))
+            embeddings = {}
+            if use_embeddings:
+                embeddings.update(
+                    zip(ids, results["embeddings"][0], strict=False)
+                )
 
-            return {
-                "status": "success",
-                "data": [
-                    {
-                        "content": doc,
-                        "metadata": meta,
-                    }
-                    for doc, meta in zip(
-                        results["documents"][0],
-                        results["metadatas"][0],
-                        strict=False,
+            if hybrid:
+                stage_start = time.time()
+                lexical_hits = self.lexical_indexes[collection_name].search(
+                    text, k=fetch_k * WHERE_LEXICAL_FETCH if where else fetch_k
+                )
+                lexical_ids = [doc_id for doc_id, _ in lexical_hits]
+                if where:
+                    # Only the over-fetched BM25 candidates are checked
+                    # against the filter, dense results already match it
+                    unchecked = [
+                        doc_id
+                        for doc_id in lexical_ids
+                        if doc_id not in documents
+                    ]
+                    if unchecked:
+                        matched = collection.get(
+                            ids=unchecked, where=where, include=include
+                        )
+                        documents.update(
+                            zip(
+                                matched["ids"],
+                                matched["documents"],
+                                strict=False,
+                            )
+                        )
+                        metadatas.update(
+                            zip(
+                                matched["ids"],
+                                matched["metadatas"],
+                                strict=False,
+                            )
+                        )
+                        if use_embeddings:
+                            embeddings.update(
+                                zip(
+                                    matched["ids"],
+                                    matched["embeddings"],
+                                    strict=False,
+                                )
+                            )
+                    lexical_ids = [
+                        doc_id for doc_id in lexical_ids if doc_id in documents
+                    ][:fetch_k]
+                fused = reciprocal_rank_fusion([ids, lexical_ids])
+                ids = [doc_id for doc_id, _ in fused[:fetch_k]]
+                fused_scores = dict(fused)
+                timings["lexical_ms"] = (time.time() - stage_start) * 1000
+
+            missing = [doc_id for doc_id in ids if doc_id not in documents]
+            if missing:
+                extra = collection.get(ids=missing, include=include)
+                documents.update(
+                    zip(extra["ids"], extra["documents"], strict=False)
+                )
+                metadatas.update(
+                    zip(extra["ids"], extra["metadatas"], strict=False)
+                )
+                if use_embeddings:
+                    embeddings.update(
+                        zip(extra["ids"], extra["embeddings"], strict=False)
                     )
-                ],
-            }
+            ids = [doc_id for doc_id in ids if doc_id in documents]
+
+            if use_embeddings and ids:
+                stage_start = time.time()
+                matrix = np.asarray(
+                    [embeddings[doc_id] for doc_id in ids], dtype=np.float32
+                )
+                if dedup_threshold is not None:
+                    kept = suppress_near_duplicates(matrix, dedup_threshold)
+                    ids = [ids[i] for i in kept]
+                    matrix = matrix[kept]
+                if mmr:
+                    # Leave the cross-encoder a few diverse candidates to
+                    # choose from instead of only re-ordering the final ones
+                    mmr_k = n_results * 3 if rerank else n_results
+                    selected = mmr_select(
+                        query_embedding,
+                        matrix,
+                        k=mmr_k,
+                        lambda_mult=params.get(
+                            "mmr_lambda", DEFAULT_MMR_LAMBDA
+                        ),
+                        # Keep the lexical evidence of hybrid ranking
+                        scores=[fused_scores[doc_id] for doc_id in ids]
+                        if hybrid
+                        else None,
+                    )
+                    ids = [ids[i] for i in selected]
+                timings["diversity_ms"] = (time.time() - stage_start) * 1000
+
+            if rerank and ids:
+                stage_start = time.time()
+                if self.reranker is None:
+                    self.reranker = CrossEncoderReranker()
+                ids, rerank_stats = self.reranker.rerank(
+                    text,
+                    [(doc_id, documents[doc_id]) for doc_id in ids],
+                    budget_ms=params.get(
+                        "rerank_budget_ms", DEFAULT_RERANK_BUDGET_MS
+                    ),
+                )
+                timings["rerank_ms"] = (time.time() - stage_start) * 1000
+                logger.debug(f"Re-rank stats: {rerank_stats}")
+
+            ids = ids[:n_results]
+            data = [
+                {
+                    "content": documents[doc_id],
+                    "metadata": metadatas[doc_id],
+                    # None for documents only found by the lexical index
+                    "distance": distances.get(doc_id),
+                }
+                for doc_id in ids
+            ]
+            if not params.get("full_document", False):
+                stage_start = time.time()
+                self._extract_snippets(text, query_embedding, data, params)
+                timings["snippets_ms"] = (time.time() - stage_start) * 1000
+
+            return {"status": "success", "data": data, "timings": timings}
 
         except Exception as e:
             logger.exception(
@@ -364,6 +872,273 @@ class VectorStoreService:
                 f"Failed to query similar documents: {str(e)}"
             ) from e
 
+    def _extract_snippets(
+        self,
+        text: str,
+        query_embedding: np.ndarray,
+        docs: List[Dict[str, Any]],
+        params: Dict[str, Any],
+    ) -> None:
+        """Replace each document's content by its best matching line windows.
+
+        Args:
+            text: Query text
+            query_embedding: Query vector
+            docs: Documents to reduce in place
+            params: Query parameters holding the snippet options
+        """
+        snippet_lines = params.get("snippet_lines") or DEFAULT_SNIPPET_LINES
+        max_snippets = params.get("max_snippets") or DEFAULT_MAX_SNIPPETS
+        windows = [line_windows(doc["content"], snippet_lines) for doc in docs]
+        # Single-window documents are kept whole and need no scoring
+        texts = [
+            window[2]
+            for doc_windows in windows
+            if len(doc_windows) > 1
+            for window in doc_windows
+        ]
+        if params.get("snippet_scoring") == "embedding" and texts:
+            scores = iter(
+                embedding_scores(
+                    query_embedding, self.embedding_function(texts)
+                )
+            )
+        else:
+            scores = iter(lexical_scores(text, texts) if texts else [])
+
+        for doc, doc_windows in zip(docs, windows, strict=True):
+            if len(doc_windows) > 1:
+                doc_scores = [next(scores) for _ in doc_windows]
+            else:
+                doc_scores = [1.0]
+            snippets = select_snippets(doc_windows, doc_scores, max_snippets)
+            doc["content"] = "".join(
+                snippet["content"] for snippet in snippets
+            )
+            doc["snippets"] = [
+                {k: v for k, v in snippet.items() if k != "content"}
+                for snippet in snippets
+            ]
+            doc["total_lines"] = doc_windows[-1][1]
+
+    def handle_export_snapshot(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle exporting a collection to a portable snapshot bundle"""
+        collection_name = params.get("collection_name", "repository_content")
+        try:
+            collection = self.collections.get(collection_name)
+            if not collection:
+                return {
+                    "error": f"Collection {collection_name} not initialized"
+                }
+
+            start_time = time.time()
+            data = collection.get(
+                include=["embeddings", "metadatas", "documents"]
+            )
+            ids = list(data["ids"])
+            embeddings = data.get("embeddings")
+            if embeddings is None or len(ids) == 0:
+                embeddings = np.empty((0, 0), dtype=np.float32)
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            root = Path(params["root"]) if params.get("root") else None
+            ids, metadatas = rebase_paths(
+                ids, list(data.get("metadatas") or []), relative_to_root, root
+            )
+
+            header = {
+                "collection_name": collection_name,
+                "embedding_model": self.embedding_model,
+                "source_commit": params.get("source_commit"),
+                "created_at": time.time(),
+                "ids": ids,
+                "metadatas": metadatas,
+                "documents": list(data.get("documents") or []),
+            }
+            path = Path(params["path"])
+            size = write_snapshot(path, header, embeddings)
+
+            duration = time.time() - start_time
+            logger.info(
+                f"Exported {len(ids)} documents from {collection_name} "
+                f"in {duration:.2f} seconds"
+            )
+            return {
+                "status": "success",
+                "data": {"path": str(path), "count": len(ids), "size": size},
+            }
+
+        except Exception as e:
+            logger.exception(f"Failed to export collection {collection_name}")
+            raise RuntimeError(f"Failed to export snapshot: {str(e)}") from e
+
+    def _record_imported_files(
+        self,
+        collection_name: str,
+        ids: List[str],
+        documents: List[str],
+        model: Optional[str],
+    ) -> None:
+        """Add manifest entries for imported documents matching local files.
+
+        Only files whose local content hashes to the snapshot's document are
+        recorded, so a later sync re-embeds exactly what differs locally.
+        """
+        entries = []
+        for file_id, document in zip(ids, documents, strict=False):
+            path = Path(file_id)
+            try:
+                if not path.is_file():
+                    continue
+                if content_hash(path.read_text()) != content_hash(document):
+                    continue
+                stat = path.stat()
+            except Exception as e:
+                logger.debug(f"Not recording imported file {path}: {e}")
+                continue
+            entries.append(
+                ManifestEntry(
+                    path=file_id,
+                    hash=content_hash(document),
+                    mtime=stat.st_mtime,
+                    size=stat.st_size,
+                    chunk_ids=[file_id],
+                    model=model,
+                )
+            )
+        self.manifests[collection_name].upsert(entries)
+        logger.debug(f"Recorded {len(entries)} imported files in manifest")
+
+    def handle_import_snapshot(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle loading a snapshot bundle into a collection without re-embedding"""
+        collection_name = params.get("collection_name", "repository_content")
+        try:
+            if collection_name not in self.collections:
+                return {
+                    "error": f"Collection {collection_name} not initialized"
+                }
+
+            start_time = time.time()
+            header, embeddings = read_snapshot(Path(params["path"]))
+
+            model = header.get("embedding_model")
+            if model != self.embedding_model and not params.get("force"):
+                return {
+                    "error": f"Snapshot was built with embedding model {model}, "
+                    f"but the service uses {self.embedding_model}"
+                }
+
+            if params.get("replace"):
+                logger.info(f"Replacing collection {collection_name}")
+                self.client.delete_collection(name=collection_name)
+                self.collections[
+                    collection_name
+                ] = self.client.create_collection(
+                    name=collection_name,
+                    embedding_function=self.embedding_function,
+                    metadata=self.hnsw_settings.get(collection_name) or None,
+                )
+                self.manifests[collection_name].clear()
+                self.lexical_indexes[collection_name].clear()
+            collection = self.collections[collection_name]
+
+            root = Path(params["root"]) if params.get("root") else None
+            ids, metadatas = rebase_paths(
+                header["ids"], header["metadatas"], rebase_on_root, root
+            )
+            documents = header["documents"]
+            for start in range(0, len(ids), SNAPSHOT_BATCH_SIZE):
+                end = start + SNAPSHOT_BATCH_SIZE
+                collection.upsert(
+                    ids=ids[start:end],
+                    embeddings=np.asarray(embeddings[start:end]),
+                    metadatas=metadatas[start:end] or None,
+                    documents=documents[start:end] or None,
+                )
+            self.lexical_indexes[collection_name].add_many(
+                zip(ids, documents, strict=False)
+            )
+            self._record_imported_files(collection_name, ids, documents, model)
+
+            duration = time.time() - start_time
+            logger.info(
+                f"Imported {len(ids)} documents into {collection_name} "
+                f"in {duration:.2f} seconds"
+            )
+            return {
+                "status": "success",
+                "data": {
+                    "count": len(ids),
+                    "embedding_model": model,
+                    "source_commit": header.get("source_commit"),
+                },
+            }
+
+        except Exception as e:
+            logger.exception(
+                f"Failed to import snapshot into {collection_name}"
+            )
+            raise RuntimeError(f"Failed to import snapshot: {str(e)}") from e
+
+    def handle_tune_index(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle measuring HNSW settings on a sample of a collection"""
+        collection_name = params.get("collection_name", "repository_content")
+        try:
+            collection = self.collections.get(collection_name)
+            if not collection:
+                return {
+                    "error": f"Collection {collection_name} not initialized"
+                }
+
+            data = collection.get(
+                include=["embeddings"],
+                limit=params.get("max_vectors") or TUNE_MAX_VECTORS,
+            )
+            embeddings = data.get("embeddings")
+            if embeddings is None or len(data["ids"]) == 0:
+                raise ValueError(f"Collection {collection_name} is empty")
+
+            grid = {
+                key: params[key]
+                for key in (
+                    "m_values",
+                    "construction_ef_values",
+                    "search_ef_values",
+                    "k",
+                    "n_queries",
+                )
+                if params.get(key)
+            }
+            start_time = time.time()
+            rows = tune_hnsw(np.asarray(embeddings), **grid)
+            logger.info(
+                f"Tuned {len(rows)} HNSW settings on {len(data['ids'])} "
+                f"vectors of {collection_name} in "
+                f"{time.time() - start_time:.2f} seconds"
+            )
+
+            metadata = collection.metadata or {}
+            current = {
+                key: metadata.get(f"hnsw:{name}", DEFAULT_HNSW[key])
+                for key, name in (
+                    ("hnsw_m", "M"),
+                    ("hnsw_construction_ef", "construction_ef"),
+                    ("hnsw_search_ef", "search_ef"),
+                )
+            }
+            return {
+                "status": "success",
+                "data": {
+                    "rows": rows,
+                    "current": current,
+                    "vectors": len(data["ids"]),
+                    "total": collection.count(),
+                },
+            }
+
+        except Exception as e:
+            logger.exception(f"Failed to tune collection {collection_name}")
+            raise RuntimeError(f"Failed to tune index: {str(e)}") from e
+
     def handle_client(self, conn: socket.socket) -> None:
         """Handle a client connection"""
         try:
@@ -419,6 +1194,16 @@ class VectorStoreService:
                 response = self.handle_remove_files(params)
             elif command == "query_similar":
                 response = self.handle_query_similar(params)
+            elif command == "embed_query":
+                response = self.handle_embed_query(params)
+            elif command == "sync":
+                response = self.handle_sync(params)
+            elif command == "export_snapshot":
+                response = self.handle_export_snapshot(params)
+            elif command == "import_snapshot":
+                response = self.handle_import_snapshot(params)
+            elif command == "tune_index":
+                response = self.handle_tune_index(params)
             elif command == "restart":
                 logger.info("Handling restart command")
                 self.cleanup()
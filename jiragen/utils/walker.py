@@ -0,0 +1,231 @@
+"""Gitignore-aware directory walker for jiragen."""
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+import pathspec
+from loguru import logger
+
+# Always ignored, regardless of the repository's own ignore files
+DEFAULT_IGNORE_PATTERNS = [".git/", ".gitignore"]
+
+
+class IgnoreRules:
+    """Stack of gitignore pattern sets scoped to the directory that declared them.
+
+    Mirrors git's precedence rules: patterns from a deeper ``.gitignore``
+    override those of its parents, which in turn override
+    ``.git/info/exclude`` and the built-in defaults.
+
+    Attributes:
+        root: Repository root all patterns are evaluated against
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        specs: Optional[List[Tuple[str, pathspec.PathSpec]]] = None,
+    ):
+        self.root = root
+        self._specs = specs or []
+
+    @classmethod
+    def for_root(cls, root: Path) -> "IgnoreRules":
+        """Create rules seeded with defaults, ``.git/info/exclude`` and the root ``.gitignore``."""
+        specs = [
+            (
+                "",
+                pathspec.PathSpec.from_lines(
+                    "gitwildmatch", DEFAULT_IGNORE_PATTERNS
+                ),
+            )
+        ]
+        exclude_path = root / ".git" / "info" / "exclude"
+        if exclude_path.is_file():
+            logger.info(f"Reading exclude file from {exclude_path}")
+            specs.append(("", _read_spec(exclude_path)))
+
+        rules = cls(root, specs)
+        return rules.descend("")
+
+    def descend(self, rel_dir: str) -> "IgnoreRules":
+        """Return the rules in effect inside ``rel_dir``.
+
+        Picks up the directory's own ``.gitignore`` if it has one, otherwise
+        returns ``self`` unchanged so siblings can share the same instance.
+        """
+        gitignore_path = self.root / rel_dir / ".gitignore"
+        if not gitignore_path.is_file():
+            return self
+        logger.debug(f"Reading .gitignore file from {gitignore_path}")
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        return IgnoreRules(
+            self.root, self._specs + [(prefix, _read_spec(gitignore_path))]
+        )
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check whether a root-relative POSIX path is ignored.
+
+        Args:
+            rel_path: Path relative to the root, using ``/`` separators
+            is_dir: Whether the path is a directory (enables ``dir/`` patterns)
+
+        Returns:
+            bool: True if the last matching pattern excludes the path
+        """
+        for prefix, spec in reversed(self._specs):
+            if prefix and not rel_path.startswith(prefix):
+                continue
+            candidate = rel_path[len(prefix) :]
+            if is_dir:
+                candidate += "/"
+            result = spec.check_file(candidate)
+            if result.include is not None:
+                return result.include
+        return False
+
+
+def _read_spec(path: Path) -> pathspec.PathSpec:
+    """Parse a gitignore-style file into a PathSpec."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return pathspec.PathSpec.from_lines("gitwildmatch", f)
+    except OSError as e:
+        logger.warning(f"Could not read ignore file {path}: {e}")
+        return pathspec.PathSpec([])
+
+
+def _rules_for(root: Path, rel_dir: str) -> IgnoreRules:
+    """Build the rules in effect for a directory below the root."""
+    rules = IgnoreRules.for_root(root)
+    if not rel_dir:
+        return rules
+    current = ""
+    for part in rel_dir.split("/"):
+        current = f"{current}/{part}" if current else part
+        rules = rules.descend(current)
+    return rules
+
+
+def _is_ignored_below_root(root: Path, rel_path: str, is_dir: bool) -> bool:
+    """Check a path and every parent directory, as git would when descending."""
+    parts = rel_path.split("/")
+    rules = IgnoreRules.for_root(root)
+    current = ""
+    for i, part in enumerate(parts):
+        current = f"{current}/{part}" if current else part
+        last = i == len(parts) - 1
+        if rules.is_ignored(current, is_dir=is_dir or not last):
+            return True
+        if not last:
+            rules = rules.descend(current)
+    return False
+
+
+def _walk_dir(
+    root: Path, rel_dir: str, rules: IgnoreRules, recursive: bool
+) -> Iterator[Path]:
+    """Yield non-ignored files below ``rel_dir``, pruning ignored directories."""
+    stack = [(rel_dir, rules)]
+    while stack:
+        current_dir, current_rules = stack.pop()
+        abs_dir = root / current_dir if current_dir else root
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.warning(f"Could not scan directory {abs_dir}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = (
+                f"{current_dir}/{entry.name}" if current_dir else entry.name
+            )
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = entry.is_file()
+            except OSError:
+                continue
+
+            if is_dir:
+                if recursive and not current_rules.is_ignored(
+                    rel_path, is_dir=True
+                ):
+                    subdirs.append(rel_path)
+            elif is_file and not current_rules.is_ignored(rel_path):
+                yield Path(entry.path)
+
+        # Reverse so directories are visited in sorted order
+        for subdir in reversed(subdirs):
+            stack.append((subdir, current_rules.descend(subdir)))
+
+
+def iter_files(root: Path, path_strs: Iterable[str]) -> Iterator[Path]:
+    """Lazily yield the files selected by ``jiragen add``-style path arguments.
+
+    ``.`` and ``**`` select everything below ``root``, ``*`` selects the files
+    directly in ``root`` and anything else is treated as a file or directory
+    relative to ``root``. Ignored directories are pruned before they are
+    scanned, nested ``.gitignore`` files and ``.git/info/exclude`` are
+    honored, and every file is yielded at most once even when arguments
+    overlap (e.g. ``jiragen add . src``).
+
+    Args:
+        root: Repository root used to resolve arguments and ignore files
+        path_strs: Path arguments as given on the command line
+
+    Yields:
+        Path: Absolute path of each selected file
+    """
+    seen: Set[Path] = set()
+    walked_dirs: List[Path] = []
+
+    for path_str in path_strs:
+        if path_str in (".", "**"):
+            target, recursive = root, True
+        elif path_str == "*":
+            target, recursive = root, False
+        else:
+            target, recursive = (root / Path(path_str)).resolve(), True
+
+        if not target.exists():
+            logger.warning(f"Path does not exist: {path_str}")
+            continue
+
+        try:
+            rel_target = target.relative_to(root).as_posix()
+        except ValueError:
+            logger.warning(f"Skipping path outside of {root}: {path_str}")
+            continue
+        if rel_target == ".":
+            rel_target = ""
+
+        if target.is_file():
+            if target not in seen and not _is_ignored_below_root(
+                root, rel_target, is_dir=False
+            ):
+                seen.add(target)
+                yield target
+            continue
+
+        if any(
+            target == walked or walked in target.parents
+            for walked in walked_dirs
+        ):
+            logger.debug(f"Skipping already walked directory: {target}")
+            continue
+        if rel_target and _is_ignored_below_root(
+            root, rel_target, is_dir=True
+        ):
+            logger.debug(f"Skipping ignored directory: {target}")
+            continue
+        if recursive:
+            walked_dirs.append(target)
+
+        rules = _rules_for(root, rel_target)
+        for path in _walk_dir(root, rel_target, rules, recursive):
+            if path not in seen:
+                seen.add(path)
+                yield path
@@ -0,0 +1,137 @@
+"""Unit tests for batch ticket generation."""
+
+import httpx
+import litellm
+import pytest
+
+from jiragen.cli import batch
+from jiragen.cli.batch import load_batch, load_completed
+from jiragen.core.metadata import IssueMetadata
+from jiragen.core.retry import retry_delay
+
+
+def _rate_limit_error(headers=None):
+    response = httpx.Response(
+        429,
+        headers=headers or {},
+        request=httpx.Request("POST", "https://llm.example"),
+    )
+    return litellm.RateLimitError(
+        "slow down", llm_provider="openai", model="test", response=response
+    )
+
+
+def test_load_batch_assigns_ids_and_skips_duplicates(tmp_path):
+    """Test that lines without an id get one and duplicate ids are dropped."""
+    path = tmp_path / "batch.jsonl"
+    path.write_text(
+        '{"id": "a", "message": "first"}\n'
+        "\n"
+        '{"message": "second"}\n'
+        '{"id": "a", "message": "again"}\n'
+    )
+    assert load_batch(path) == [
+        {"id": "a", "message": "first"},
+        {"id": "line-3", "message": "second"},
+    ]
+
+
+def test_load_batch_rejects_lines_without_message(tmp_path):
+    """Test that a line without a message is reported with its number."""
+    path = tmp_path / "batch.jsonl"
+    path.write_text('{"id": "a"}\n')
+    with pytest.raises(ValueError, match="batch.jsonl:1"):
+        load_batch(path)
+
+
+def test_load_completed_uses_the_latest_status(tmp_path):
+    """Test that items that failed and later succeeded count as done."""
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        '{"id": "a", "status": "error"}\n'
+        '{"id": "b", "status": "ok"}\n'
+        '{"id": "a", "status": "ok"}\n'
+        '{"id": "c", "status": "error"}\n'
+        '{"id": "d", "sta'
+    )
+    assert load_completed(path) == {"a", "b"}
+    assert load_completed(tmp_path / "missing.jsonl") == set()
+
+
+def test_retry_delay_for_rate_limits_only():
+    """Test that rate limits are retried, honouring Retry-After."""
+    wrapped = RuntimeError("Failed to generate ticket")
+    wrapped.__cause__ = _rate_limit_error()
+    delay = retry_delay(wrapped, attempt=0, base=batch.BACKOFF_BASE)
+    assert 0 < delay <= batch.BACKOFF_BASE
+    assert retry_delay(_rate_limit_error({"retry-after": "7"}), 0) == 7
+    assert retry_delay(ValueError("bad template"), attempt=0) is None
+
+
+def test_generate_item_retries_after_rate_limit(monkeypatch):
+    """Test that an item hitting a rate limit is retried and succeeds."""
+    calls = []
+    shared = []
+
+    class FakeGenerator:
+        def __init__(self, store, config, stores):
+            shared.append(stores)
+            self.timings = {}
+
+        def generate(self, message, **kwargs):
+            calls.append(message)
+            if len(calls) == 1:
+                raise RuntimeError("LLM failed") from _rate_limit_error()
+            return "ticket"
+
+    class InstantGate:
+        def wait(self):
+            return True
+
+        def back_off(self, delay):
+            self.delay = delay
+
+    monkeypatch.setattr(batch, "IssueGenerator", FakeGenerator)
+    monkeypatch.setattr(
+        batch,
+        "generate_with_metadata",
+        lambda generator, message: (
+            generator.generate(message),
+            IssueMetadata(issue_type="Story", priority="Medium"),
+        ),
+    )
+    config = type("Config", (), {"llm_config": None, "response_cache": None})
+    gate = InstantGate()
+
+    stores = {"jira": object(), "codebase": object()}
+
+    record = batch._generate_item(
+        None, config, stores, {"id": "a", "message": "Add dark mode"}, gate
+    )
+
+    assert record["status"] == "ok"
+    assert record["attempts"] == 2
+    assert record["content"] == "ticket"
+    assert record["metadata"]["issue_type"] == "Story"
+    assert gate.delay > 0
+    # Every attempt retrieves through the batch's store clients
+    assert shared == [stores, stores]
+
+
+def test_generate_item_skips_work_once_the_batch_stopped(monkeypatch):
+    """Test that a stopped batch does not start queued items."""
+
+    def fail(*args):
+        raise AssertionError("generator created after the batch stopped")
+
+    monkeypatch.setattr(batch, "IssueGenerator", fail)
+    gate = batch._RateGate()
+    gate.back_off(60)
+    gate.stop()
+
+    record = batch._generate_item(
+        None, None, {}, {"id": "a", "message": "Add dark mode"}, gate
+    )
+
+    assert record["status"] == "cancelled"
+    assert record["attempts"] == 0
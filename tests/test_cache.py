@@ -0,0 +1,85 @@
+"""Unit tests for the LLM response cache."""
+
+from types import SimpleNamespace
+
+from jiragen.core import generator
+from jiragen.core.cache import ResponseCache, cache_key
+from jiragen.core.generator import LiteLLMClient, LLMConfig
+from jiragen.core.metadata import IssueMetadata
+
+
+def test_cache_key_covers_model_params_schema_and_prompt():
+    """Test that every part of the request changes the fingerprint."""
+    base = cache_key("openai/a", {"temperature": 0.3}, "prompt")
+    assert base == cache_key("openai/a", {"temperature": 0.3}, "prompt")
+    assert base != cache_key("openai/b", {"temperature": 0.3}, "prompt")
+    assert base != cache_key("openai/a", {"temperature": 0.7}, "prompt")
+    assert base != cache_key("openai/a", {"temperature": 0.3}, "prompt 2")
+    assert base != cache_key(
+        "openai/a", {"temperature": 0.3}, "prompt", IssueMetadata
+    )
+
+
+def test_expired_entries_are_not_served(tmp_path, monkeypatch):
+    """Test that entries older than the TTL count as misses."""
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl_seconds=60)
+    now = 1000.0
+    monkeypatch.setattr("jiragen.core.cache.time.time", lambda: now)
+    cache.set("key", "response")
+    assert cache.get("key") == "response"
+
+    now += 61
+    assert cache.get("key") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0, "bytes": 0}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    """Test that writes beyond the size limit evict the oldest reads first."""
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=20)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(
+        "jiragen.core.cache.time.time", lambda: float(next(clock))
+    )
+    cache.set("a", "x" * 8)
+    cache.set("b", "y" * 8)
+    cache.get("a")
+    cache.set("c", "z" * 8)
+
+    assert cache.get("a") == "x" * 8
+    assert cache.get("b") is None
+    assert cache.get("c") == "z" * 8
+
+
+def test_client_serves_repeated_requests_from_cache(tmp_path, monkeypatch):
+    """Test that only the first identical request reaches the provider."""
+    calls = []
+
+    def completion(messages, stream=False, **params):
+        calls.append(stream)
+        if stream:
+            return iter(
+                [
+                    SimpleNamespace(
+                        choices=[
+                            SimpleNamespace(
+                                delta=SimpleNamespace(content="ticket")
+                            )
+                        ]
+                    )
+                ]
+            )
+        message = SimpleNamespace(content="ticket")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(generator, "completion", completion)
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    client = LiteLLMClient(LLMConfig(model="openai/test"), cache)
+
+    assert client.generate("prompt", temperature=0.3) == "ticket"
+    assert client.generate("prompt", temperature=0.3) == "ticket"
+    assert list(client.generate_stream("prompt", temperature=0.3)) == [
+        "ticket"
+    ]
+    assert client.generate("prompt", temperature=0.5) == "ticket"
+    assert calls == [False, False]
+    assert cache.stats()["hits"] == 2
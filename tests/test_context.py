@@ -0,0 +1,82 @@
+"""Unit tests for token-aware context packing."""
+
+from jiragen.core import context
+from jiragen.core.context import ContextPacker, format_document
+
+
+class WordPacker(ContextPacker):
+    """Packer counting whitespace separated words as tokens."""
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+def _doc(path, words):
+    return {
+        "content": "\n".join(f"{path} line {i}" for i in range(words // 3)),
+        "metadata": {"file_path": path},
+    }
+
+
+def test_small_relevant_documents_beat_one_huge_file():
+    """Test that a huge top-ranked file is truncated rather than crowding others out."""
+    packer = WordPacker("test-model")
+    packed = packer.pack(
+        {
+            "codebase": [
+                _doc("huge.py", 3000),
+                _doc("a.py", 30),
+                _doc("b.py", 30),
+            ]
+        },
+        budget=200,
+    )
+    context = packed["codebase"]
+    assert "a.py line 0" in context and "b.py line 0" in context
+    assert "huge.py line 0" in context
+    assert "huge.py line 999" not in context
+    assert packer.count_tokens(context) <= 200
+
+
+def test_sections_keep_rank_order_and_fallback_text():
+    """Test that output keeps rank order and reports empty sections."""
+    packer = WordPacker("test-model")
+    packed = packer.pack(
+        {"jira": [], "codebase": [_doc("a.py", 9), _doc("b.py", 9)]},
+        budget=1000,
+    )
+    assert packed["jira"] == "No relevant context found"
+    assert packed["codebase"].index("a.py") < packed["codebase"].index("b.py")
+
+
+def test_budget_subtracts_prompt_and_completion():
+    """Test that the budget falls back to the configured window."""
+    packer = ContextPacker("unknown-provider/unknown-model", 1000)
+    assert packer.budget(prompt_tokens=300, completion_tokens=200) == 500
+
+
+def test_budget_is_capped_by_max_context_length(monkeypatch):
+    """Test that a large model window does not lift the configured cap."""
+    monkeypatch.setattr(context, "get_context_window", lambda model: 200000)
+    packer = ContextPacker("openai/large", 8000)
+    assert packer.budget(prompt_tokens=300, completion_tokens=200) == 8000
+    assert ContextPacker("openai/large", 500000).budget(300, 200) == 199500
+
+
+def test_snippets_are_labelled_with_their_line_ranges():
+    """Test that documents cut to line windows show where they come from."""
+    doc = {
+        "content": "a = 1\nb = 2\nz = 26\n",
+        "metadata": {"file_path": "big.py"},
+        "snippets": [
+            {"start_line": 1, "end_line": 2, "score": 1.0},
+            {"start_line": 26, "end_line": 26, "score": 0.5},
+        ],
+        "total_lines": 40,
+    }
+    assert format_document(doc) == (
+        "File: big.py (lines 1-2)\na = 1\nb = 2\n\n"
+        "File: big.py (lines 26-26)\nz = 26"
+    )
+    whole = {**doc, "snippets": [doc["snippets"][0]], "total_lines": 2}
+    assert format_document(whole).startswith("File: big.py\n")
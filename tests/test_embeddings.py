@@ -0,0 +1,88 @@
+"""Unit tests for the hashing embeddings and query embedding reuse."""
+
+import numpy as np
+
+from jiragen.services.embeddings import (
+    HASHING_MODEL_NAME,
+    HashingEmbeddingFunction,
+)
+from jiragen.services.vector_store import VectorStoreService
+
+
+def test_hashing_embeddings_are_deterministic_and_normalized():
+    """Test that equal texts embed equally and vectors have unit length."""
+    embed = HashingEmbeddingFunction(dimensions=64)
+    first, second, other = embed(
+        ["refresh the session token", "refresh the session token", "render"]
+    )
+    assert np.allclose(first, second)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+    assert first @ other < first @ second
+
+
+def _indexed_service(tmp_path):
+    path = tmp_path / "session.py"
+    path.write_text("def refresh_session_token():\n    pass\n")
+    service = VectorStoreService(tmp_path / "test.sock", tmp_path / "runtime")
+    service.initialize_store(
+        {
+            "collection_name": "repository_content",
+            "db_path": str(tmp_path / "vector_db"),
+            "embedding_model": HASHING_MODEL_NAME,
+        }
+    )
+    service.handle_add_files(
+        {"collection_name": "repository_content", "paths": [str(path)]}
+    )
+    return service
+
+
+def _count_embedding_calls(monkeypatch):
+    calls = []
+    embed = HashingEmbeddingFunction.__call__
+
+    def counting(self, texts):
+        calls.append(list(texts))
+        return embed(self, texts)
+
+    monkeypatch.setattr(HashingEmbeddingFunction, "__call__", counting)
+    return calls
+
+
+def test_query_embeddings_are_cached_per_text(tmp_path, monkeypatch):
+    """Test that embedding the same query text again hits the cache."""
+    service = _indexed_service(tmp_path)
+    try:
+        calls = _count_embedding_calls(monkeypatch)
+
+        first = service.handle_embed_query({"text": "refresh the token"})
+        second = service.handle_embed_query({"text": "refresh the token"})
+        service.handle_embed_query({"text": "render"})
+
+        assert first["data"] == second["data"]
+        assert calls == [["refresh the token"], ["render"]]
+    finally:
+        service.cleanup()
+
+
+def test_precomputed_query_embedding_is_not_recomputed(tmp_path, monkeypatch):
+    """Test that a query with an embedding never calls the model."""
+    service = _indexed_service(tmp_path)
+    try:
+        embedding = service.handle_embed_query({"text": "session token"})
+        calls = _count_embedding_calls(monkeypatch)
+
+        response = service.handle_query_similar(
+            {
+                "collection_name": "repository_content",
+                "text": "a different text",
+                "embedding": embedding["data"],
+                "hybrid": True,
+                "dedup_threshold": 0.95,
+            }
+        )
+
+        assert len(response["data"]) == 1
+        assert calls == []
+    finally:
+        service.cleanup()
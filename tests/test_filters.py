@@ -0,0 +1,123 @@
+"""Unit tests for document metadata and query scopes."""
+
+import json
+
+import pytest
+
+from jiragen.services.embeddings import HASHING_MODEL_NAME
+from jiragen.services.filters import document_metadata, parse_scopes
+from jiragen.services.vector_store import VectorStoreService
+
+
+def test_code_metadata_has_language_and_path_segments(tmp_path):
+    """Test that code files get language and root-relative path segments."""
+    path = tmp_path / "src" / "api" / "users.py"
+    metadata = document_metadata(path, root=tmp_path)
+    assert metadata["language"] == "python"
+    assert metadata["extension"] == "py"
+    assert [metadata[f"path_{i}"] for i in range(3)] == [
+        "src",
+        "api",
+        "users.py",
+    ]
+
+
+def test_jira_metadata_read_from_json_sidecar(tmp_path):
+    """Test that JIRA documents get type, status, components and updated."""
+    tickets = tmp_path / "tickets"
+    tickets.mkdir()
+    (tickets / "PROJ-1.json").write_text(
+        json.dumps(
+            {
+                "key": "PROJ-1",
+                "status": "Done",
+                "components": ["Backend", "API"],
+                "updated": "2024-01-31T10:00:00.000+0000",
+            }
+        )
+    )
+    metadata = document_metadata(tickets / "PROJ-1.md", root=tmp_path)
+    assert metadata["type"] == "ticket"
+    assert metadata["status"] == "Done"
+    assert metadata["components"] == ["Backend", "API"]
+    assert metadata["updated"] == 1706695200.0
+
+
+def test_parse_scopes_splits_filters_per_collection():
+    """Test that scopes become Chroma where filters per collection."""
+    filters = parse_scopes(
+        ["path=src/api", "language=python", "status=Done", "status=Closed"]
+    )
+    assert filters["codebase"] == {
+        "$and": [
+            {"$and": [{"path_0": "src"}, {"path_1": "api"}]},
+            {"language": "python"},
+        ]
+    }
+    assert filters["jira"] == {"status": {"$in": ["Done", "Closed"]}}
+    assert parse_scopes([]) == {"codebase": None, "jira": None}
+
+
+def test_parse_scopes_rejects_unknown_keys():
+    """Test that malformed or unknown scopes raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_scopes(["colour=blue"])
+    with pytest.raises(ValueError):
+        parse_scopes(["status"])
+
+
+def test_hybrid_search_filters_lexical_candidates_by_metadata(tmp_path):
+    """Test that a filter is applied to BM25 hits without a full scan."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    paths = []
+    for i in range(12):
+        path = repo / f"notes_{i}.js"
+        path.write_text(f"// parse_user_token helper copy {i}\n")
+        paths.append(path)
+    target = repo / "tokens.py"
+    target.write_text("def parse_user_token(raw):\n    return raw\n")
+    paths.append(target)
+    service = VectorStoreService(tmp_path / "test.sock", tmp_path / "runtime")
+    try:
+        service.initialize_store(
+            {
+                "collection_name": "repository_content",
+                "db_path": str(tmp_path / "vector_db"),
+                "embedding_model": HASHING_MODEL_NAME,
+            }
+        )
+        service.handle_sync(
+            {
+                "collection_name": "repository_content",
+                "paths": [str(path) for path in paths],
+                "scopes": [str(repo)],
+                "root": str(repo),
+            }
+        )
+        collection = service.collections["repository_content"]
+        gets = []
+        original_get = collection.get
+
+        def get(**kwargs):
+            gets.append(kwargs)
+            return original_get(**kwargs)
+
+        collection.get = get
+
+        results = service.handle_query_similar(
+            {
+                "collection_name": "repository_content",
+                "text": "parse_user_token",
+                "n_results": 2,
+                "hybrid": True,
+                "where": {"language": "python"},
+                "full_document": True,
+            }
+        )["data"]
+
+        assert [doc["metadata"]["language"] for doc in results] == ["python"]
+        # Candidates are looked up by id, the filter never scans everything
+        assert all(call.get("ids") for call in gets)
+    finally:
+        service.cleanup()
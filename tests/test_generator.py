@@ -0,0 +1,150 @@
+"""Unit tests for the LiteLLM client and issue generator."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from jiragen.core import generator
+from jiragen.core.client import VectorStoreConfig
+from jiragen.core.generator import (
+    GeneratorConfig,
+    IssueGenerator,
+    LiteLLMClient,
+    LLMConfig,
+)
+
+PIECES = ["## Summary\n", "", "Add dark ", "mode ", "support", None]
+
+
+def _chunk(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
+    )
+
+
+def _fake_completion(calls):
+    def completion(messages, stream=False, **params):
+        calls.append(stream)
+        if stream:
+            return iter(_chunk(text) for text in PIECES)
+        message = SimpleNamespace(content="".join(p for p in PIECES if p))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    return completion
+
+
+def test_stream_matches_non_streaming_result(monkeypatch):
+    """Test that joined stream chunks equal the non-streaming response."""
+    calls = []
+    monkeypatch.setattr(generator, "completion", _fake_completion(calls))
+    client = LiteLLMClient(LLMConfig(model="openai/test"))
+
+    streamed = list(client.generate_stream("prompt"))
+
+    assert streamed == ["## Summary\n", "Add dark ", "mode ", "support"]
+    assert "".join(streamed) == client.generate("prompt")
+    assert calls == [True, False]
+    assert client.stream_stats["tokens"] > 0
+    assert client.stream_stats["ttft_ms"] >= 0
+
+
+def test_stream_errors_raise_runtime_error(monkeypatch):
+    """Test that failures while streaming surface as RuntimeError."""
+
+    def failing_stream():
+        yield _chunk("partial")
+        raise ConnectionError("connection reset")
+
+    monkeypatch.setattr(
+        generator, "completion", lambda **kwargs: failing_stream()
+    )
+    client = LiteLLMClient(LLMConfig(model="openai/test"))
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        list(client.generate_stream("prompt"))
+
+
+class SlowStore:
+    """Vector store client whose initialization and queries take a while."""
+
+    delay = 0.2
+
+    def __init__(self, config, connect=True):
+        self.config = config
+        self.last_query_timings = {}
+        self.connected = False
+        if connect:
+            self.connect()
+
+    def connect(self):
+        time.sleep(self.delay)
+        self.connected = True
+
+    def embed_query(self, text):
+        return [0.0, 1.0]
+
+    def query_similar(self, text, **kwargs):
+        time.sleep(self.delay)
+        name = self.config.collection_name
+        return [{"content": f"{name} doc", "metadata": {"file_path": name}}]
+
+
+def test_generate_overlaps_store_setup_and_retrieval(monkeypatch, tmp_path):
+    """Test that both collections are initialized and queried concurrently."""
+    monkeypatch.setattr(generator, "VectorStoreClient", SlowStore)
+    prompts = []
+    monkeypatch.setattr(
+        LiteLLMClient,
+        "generate",
+        lambda self, prompt, **kwargs: prompts.append(prompt) or "ticket",
+    )
+    monkeypatch.setattr(LiteLLMClient, "warm_up", lambda self: None)
+    template = tmp_path / "template.md"
+    template.write_text("## Summary")
+    store = SlowStore(
+        VectorStoreConfig(db_path=tmp_path / "codebase_data" / "vector_db"),
+        connect=False,
+    )
+    issue_generator = IssueGenerator(
+        store,
+        GeneratorConfig(
+            template_path=template,
+            llm_config=LLMConfig(model="openai/test"),
+        ),
+    )
+
+    assert issue_generator.generate("Add dark mode") == "ticket"
+
+    timings = issue_generator.timings
+    assert "jira_content doc" in prompts[0]
+    assert "codebase_content doc" in prompts[0]
+    # Run in sequence, setup and retrieval would take four delays
+    assert timings["gather_ms"] < 3 * SlowStore.delay * 1000
+    for stage in ("template_ms", "jira_init_ms", "codebase_init_ms", "llm_ms"):
+        assert stage in timings
+
+
+def test_generate_reuses_connected_stores(monkeypatch, tmp_path):
+    """Test that stores passed to the generator are not set up again."""
+    monkeypatch.setattr(generator, "VectorStoreClient", SlowStore)
+    monkeypatch.setattr(
+        LiteLLMClient, "generate", lambda self, prompt, **kwargs: "ticket"
+    )
+    monkeypatch.setattr(LiteLLMClient, "warm_up", lambda self: None)
+    template = tmp_path / "template.md"
+    template.write_text("## Summary")
+    stores = generator.open_retrieval_stores(tmp_path)
+    assert all(store.connected for store in stores.values())
+    config = GeneratorConfig(
+        template_path=template, llm_config=LLMConfig(model="openai/test")
+    )
+
+    for _ in range(2):
+        issue_generator = IssueGenerator(stores["codebase"], config, stores)
+        assert issue_generator.generate("Add dark mode") == "ticket"
+        assert "jira_init_ms" not in issue_generator.timings
+        # Only retrieval remains, both collections at once
+        assert (
+            issue_generator.timings["gather_ms"] < 2 * SlowStore.delay * 1000
+        )
@@ -0,0 +1,221 @@
+"""Unit tests for fetching JIRA data."""
+
+from types import SimpleNamespace
+
+from jira.client import ResultList
+
+from jiragen.services.jira import (
+    JiraConfig,
+    JiraDataFetcher,
+    JiraDataManager,
+    JiraFetchConfig,
+    TicketFetcher,
+    watermark_jql,
+)
+
+UPDATED = "2024-01-15T10:30:00.000+0100"
+
+
+class FakeJira:
+    """JIRA client serving issues in pages of at most ``server_limit``."""
+
+    def __init__(self, count, server_limit=100):
+        self.issues = [
+            SimpleNamespace(key=f"PROJ-{i}", updated=UPDATED)
+            for i in range(count)
+        ]
+        self.server_limit = server_limit
+        self.requests = []
+        self.queries = []
+        self.fields = []
+        self._session = SimpleNamespace(hooks={"response": []})
+
+    def projects(self):
+        return [SimpleNamespace(name="Project", key="PROJ")]
+
+    def search_issues(
+        self, jql, startAt=0, maxResults=50, fields=None, expand=None
+    ):
+        self.requests.append((startAt, maxResults))
+        self.queries.append(jql)
+        self.fields.append((fields, expand))
+        for hook in self._session.hooks["response"]:
+            hook(SimpleNamespace(content=b"x" * 10 * maxResults))
+        issues = self.issues
+        if "updated >=" in jql:
+            issues = [i for i in issues if i.updated > UPDATED]
+        end = startAt + min(maxResults, self.server_limit)
+        return ResultList(
+            issues[startAt:end],
+            _startAt=startAt,
+            _maxResults=maxResults,
+            _total=len(issues),
+        )
+
+
+class KeyFetcher(JiraDataFetcher):
+    """Fetcher yielding the key of every issue of the project."""
+
+    def fetch(self, updated_since=None):
+        jql = f'project = "{self.project_key}"'
+        if updated_since:
+            jql += f' AND updated >= "{updated_since}"'
+        for issue in self._search(jql):
+            yield {"key": issue.key, "updated": issue.updated}
+
+    def to_markdown(self, data):
+        return f"# {data['key']}"
+
+
+def _manager(jira, tmp_path, **config):
+    """Return a manager fetching tickets with a ``KeyFetcher``."""
+    manager = JiraDataManager(
+        JiraConfig(
+            url="https://jira", username="", api_token="", default_project="p"
+        ),
+        JiraFetchConfig(output_dir=tmp_path, data_types=["tickets"], **config),
+        jira=jira,
+    )
+    manager.fetchers = {
+        "tickets": KeyFetcher(
+            jira, "PROJ", page_size=manager.config.batch_size
+        )
+    }
+    return manager
+
+
+def test_search_walks_every_page():
+    """Test that projects beyond a single request are fetched entirely."""
+    jira = FakeJira(2500, server_limit=50)
+    fetcher = KeyFetcher(jira, "PROJ", page_size=100)
+
+    keys = [item["key"] for item in fetcher.fetch()]
+
+    assert keys == [f"PROJ-{i}" for i in range(2500)]
+    assert fetcher.total == 2500
+    # Later pages are only as large as the server allows
+    assert sorted(jira.requests)[:3] == [(0, 100), (50, 50), (100, 50)]
+    assert len(jira.requests) == 50
+
+
+def test_search_stops_at_max_results():
+    """Test that a result cap is honoured without extra requests."""
+    jira = FakeJira(250)
+    fetcher = KeyFetcher(jira, "PROJ", page_size=100, max_results=120)
+
+    items = fetcher.fetch()
+    assert next(items)["key"] == "PROJ-0"
+    assert fetcher.total == 120
+    assert len(list(items)) == 119
+    assert sorted(jira.requests) == [(0, 100), (100, 20)]
+
+
+def test_fetch_data_writes_and_indexes_page_by_page(tmp_path):
+    """Test that items are stored and added to the store in pages."""
+
+    class Store:
+        batches = []
+
+        def add_files(self, paths):
+            self.batches.append(len(paths))
+
+    manager = _manager(FakeJira(25), tmp_path, batch_size=10)
+    progress = []
+    manager.progress_callback = lambda *args: progress.append(args)
+
+    results = manager.fetch_data(Store())
+
+    assert results == {"tickets": 25}
+    assert Store.batches == [10, 10, 5]
+    assert (tmp_path / "tickets" / "PROJ-24.md").read_text() == "# PROJ-24"
+    assert progress[-1] == ("tickets", 100.0, 25, 25)
+
+
+def test_later_fetches_only_rewrite_changed_issues(tmp_path):
+    """Test that the watermark limits the fetch to updated issues."""
+
+    class Store:
+        added = []
+        removed = []
+
+        def add_files(self, paths):
+            self.added.extend(path.stem for path in paths)
+
+        def remove_files(self, paths):
+            self.removed.extend(path.stem for path in paths)
+
+    jira = FakeJira(3)
+    manager = _manager(jira, tmp_path)
+    manager.fetch_data(Store())
+    assert manager.load_watermarks() == {"tickets": UPDATED}
+    assert manager.stats["tickets"]["incremental"] is False
+
+    jira.issues[1].updated = "2024-01-16T08:00:00.000+0100"
+    Store.added.clear()
+    manager.fetch_data(Store())
+
+    assert f'updated >= "{watermark_jql(UPDATED)}"' in jira.queries[-1]
+    assert watermark_jql(UPDATED) == "2024/01/14 19:30"
+    assert Store.added == ["PROJ-1"]
+    assert manager.stats["tickets"]["changed"] == 1
+    assert manager.load_watermarks()["tickets"].startswith("2024-01-16")
+
+    # A full fetch rewrites everything and drops deleted issues
+    del jira.issues[0]
+    Store.added.clear()
+    manager.fetch_data(Store(), full=True)
+
+    assert "updated >=" not in jira.queries[-1]
+    assert Store.added == ["PROJ-1", "PROJ-2"]
+    assert Store.removed == ["PROJ-0"]
+    assert not (tmp_path / "tickets" / "PROJ-0.json").exists()
+
+
+def test_searches_request_only_the_needed_fields(tmp_path):
+    """Test that fetchers project fields and count the payload size."""
+    jira = FakeJira(0)
+    manager = JiraDataManager(
+        JiraConfig(
+            url="https://jira", username="", api_token="", default_project="p"
+        ),
+        JiraFetchConfig(
+            output_dir=tmp_path,
+            data_types=["tickets"],
+            extra_fields={"tickets": ["customfield_10020", "summary"]},
+        ),
+        jira=jira,
+    )
+
+    manager.fetch_data(vector_store=None)
+
+    fields, expand = jira.fields[-1]
+    assert fields == [*TicketFetcher.fields, "customfield_10020"]
+    assert "customfield_10014" in fields and "*all" not in fields
+    assert expand is None
+    assert manager.stats["tickets"]["bytes"] == 1000
+
+
+def test_store_failure_keeps_items_for_the_next_fetch(tmp_path):
+    """Test that items the store failed to index are fetched again."""
+
+    class Store:
+        fail = True
+        added = []
+
+        def add_files(self, paths):
+            if self.fail:
+                raise RuntimeError("store unavailable")
+            self.added.extend(path.stem for path in paths)
+
+    manager = _manager(FakeJira(3), tmp_path)
+    manager.fetch_data(Store())
+
+    assert manager.load_watermarks() == {}
+    assert not (tmp_path / "tickets" / "PROJ-0.json").exists()
+
+    Store.fail = False
+    manager.fetch_data(Store())
+
+    assert Store.added == ["PROJ-0", "PROJ-1", "PROJ-2"]
+    assert manager.load_watermarks() == {"tickets": UPDATED}
+    assert (tmp_path / "tickets" / "PROJ-0.json").exists()
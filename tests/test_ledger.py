@@ -0,0 +1,93 @@
+"""Unit tests for the token, latency and cost ledger."""
+
+import time
+from types import SimpleNamespace
+
+from jiragen.core import generator, ledger
+from jiragen.core.generator import LiteLLMClient, LLMConfig
+from jiragen.core.ledger import Ledger, configure_ledger, summarize
+
+
+def test_records_are_appended_and_read_back(tmp_path):
+    """Test that records survive a partial last line."""
+    path = tmp_path / "ledger.jsonl"
+    book = Ledger(path, command="generate")
+    book.record("llm", model="openai/test", latency_ms=12.0)
+    book.record("retrieval", collection="jira_content", latency_ms=3.0)
+    with open(path, "a") as f:
+        f.write('{"kind": "ll')
+
+    entries = list(book.read())
+
+    assert [e["kind"] for e in entries] == ["llm", "retrieval"]
+    assert entries[0]["command"] == "generate"
+    assert list(book.read(since=time.time() + 60)) == []
+    Ledger(path, enabled=False).record("llm")
+    assert len(list(book.read())) == 2
+
+
+def test_summary_groups_with_percentiles():
+    """Test that records are aggregated per group."""
+    day = time.mktime((2026, 3, 2, 12, 0, 0, 0, 0, -1))
+    entries = [
+        {
+            "time": day,
+            "kind": "llm",
+            "model": "openai/gpt-4o",
+            "prompt_tokens": 100,
+            "completion_tokens": 20,
+            "cost": 0.01,
+            "latency_ms": float(latency),
+        }
+        for latency in range(1, 101)
+    ] + [
+        {
+            "time": day,
+            "kind": "llm",
+            "model": "ollama/llama3",
+            "cache_hit": True,
+            "latency_ms": 1.0,
+        },
+        {
+            "time": day,
+            "kind": "llm",
+            "model": "ollama/llama3",
+            "status": "error",
+        },
+    ]
+
+    by_model = {row["model"]: row for row in summarize(entries, by="model")}
+    gpt = by_model["openai/gpt-4o"]
+    assert gpt["calls"] == 100
+    assert gpt["prompt_tokens"] == 10000
+    assert round(gpt["cost"], 2) == 1.0
+    assert round(gpt["p50_ms"]) == 50 and round(gpt["p99_ms"]) == 99
+    assert by_model["ollama/llama3"]["cache_hits"] == 1
+    assert by_model["ollama/llama3"]["errors"] == 1
+    assert [row["day"] for row in summarize(entries)] == ["2026-03-02"]
+
+
+def test_llm_calls_are_recorded(tmp_path, monkeypatch):
+    """Test that the client records tokens, cost and latency per call."""
+
+    def completion(messages, **params):
+        message = SimpleNamespace(content="ticket")
+        usage = SimpleNamespace(prompt_tokens=1000, completion_tokens=200)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)], usage=usage
+        )
+
+    monkeypatch.setattr(generator, "completion", completion)
+    # Restored after the test, so other tests record nothing
+    monkeypatch.setattr(ledger, "_ledger", ledger.get_ledger())
+    book = configure_ledger("generate", path=tmp_path / "ledger.jsonl")
+
+    LiteLLMClient(LLMConfig(model="openai/gpt-4o-mini")).generate("hi")
+
+    (entry,) = book.read()
+    assert entry["kind"] == "llm"
+    assert entry["command"] == "generate"
+    assert entry["prompt_tokens"] == 1000
+    assert entry["completion_tokens"] == 200
+    assert entry["cost"] > 0
+    assert entry["cache_hit"] is False
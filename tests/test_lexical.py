@@ -0,0 +1,56 @@
+"""Unit tests for the BM25 lexical index and rank fusion."""
+
+from jiragen.services.lexical import BM25Index, tokenize
+from jiragen.services.retrieval import reciprocal_rank_fusion
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    """Test that compound identifiers are indexed whole and split."""
+    terms = tokenize("Fix PROJ-123 in getUserById")
+    assert "proj-123" in terms
+    assert "getuserbyid" in terms
+    assert {"get", "user", "by", "id"} <= set(terms)
+
+
+def test_bm25_ranks_exact_identifier_first(tmp_path):
+    """Test that a rare identifier outranks common words."""
+    index = BM25Index(tmp_path / "lexical.sqlite")
+    index.add_many(
+        [
+            ("a", "user login handler"),
+            ("b", "raise ERR_4711 when the user token expired"),
+            ("c", "user profile page"),
+        ]
+    )
+    assert index.search("ERR_4711 user", k=3)[0][0] == "b"
+
+
+def test_bm25_updates_and_persists(tmp_path):
+    """Test incremental removal and reloading from disk."""
+    path = tmp_path / "lexical.sqlite"
+    index = BM25Index(path)
+    index.add_many([("a", "alpha beta"), ("b", "beta gamma")])
+    index.remove(["a"])
+    index.add("b", "delta")
+    index.close()
+
+    reopened = BM25Index(path)
+    assert len(reopened) == 1
+    assert reopened.search("alpha") == []
+    assert reopened.search("delta")[0][0] == "b"
+
+
+def test_bm25_backfills_empty_index(tmp_path):
+    """Test that an empty index is built from the backfill source."""
+    index = BM25Index(
+        tmp_path / "lexical.sqlite",
+        backfill=lambda: [("a", "alpha"), ("b", "beta")],
+    )
+    assert len(index) == 2
+    assert index.search("beta")[0][0] == "b"
+
+
+def test_reciprocal_rank_fusion_prefers_consensus():
+    """Test that documents ranked by both retrievers win."""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "d"]])
+    assert {doc_id for doc_id, _ in fused[:2]} == {"b", "c"}
@@ -0,0 +1,121 @@
+"""Unit tests for the collection index manifest."""
+
+from jiragen.services.embeddings import HASHING_MODEL_NAME
+from jiragen.services.manifest import (
+    IndexManifest,
+    ManifestEntry,
+    content_hash,
+)
+from jiragen.services.vector_store import VectorStoreService
+
+
+def test_manifest_persists_entries(tmp_path):
+    """Test that entries survive reopening the manifest."""
+    manifest = IndexManifest.for_collection(tmp_path, "codebase_content")
+    manifest.upsert(
+        [
+            ManifestEntry(
+                path="/repo/a.py",
+                hash=content_hash("print('a')"),
+                mtime=1.0,
+                size=10,
+                chunk_ids=["/repo/a.py"],
+                model="all-MiniLM-L6-v2",
+            )
+        ]
+    )
+    manifest.close()
+
+    reopened = IndexManifest.for_collection(tmp_path, "codebase_content")
+    entry = reopened.get("/repo/a.py")
+    assert entry is not None
+    assert entry.chunk_ids == ["/repo/a.py"]
+    assert entry.hash == content_hash("print('a')")
+
+
+def test_manifest_remove(tmp_path):
+    """Test that removed paths are forgotten."""
+    manifest = IndexManifest(tmp_path / "manifest.sqlite")
+    manifest.upsert(
+        [
+            ManifestEntry(path=p, hash="h", mtime=0.0, size=0)
+            for p in ("/repo/a.py", "/repo/b.py")
+        ]
+    )
+    manifest.remove(["/repo/a.py"])
+    assert list(manifest.entries()) == ["/repo/b.py"]
+
+
+def test_sync_of_top_level_files_keeps_subdirectories(tmp_path):
+    """Test that a '*' scope only deletes files directly in its directory."""
+    repo = tmp_path / "repo"
+    (repo / "sub").mkdir(parents=True)
+    top, deep = repo / "top.py", repo / "sub" / "deep.py"
+    top.write_text("print('top')")
+    deep.write_text("print('deep')")
+    service = VectorStoreService(tmp_path / "test.sock", tmp_path / "runtime")
+    try:
+        service.initialize_store(
+            {
+                "collection_name": "repository_content",
+                "db_path": str(tmp_path / "vector_db"),
+                "embedding_model": HASHING_MODEL_NAME,
+            }
+        )
+
+        def sync(paths, scope):
+            return service.handle_sync(
+                {
+                    "collection_name": "repository_content",
+                    "paths": [str(path) for path in paths],
+                    "scopes": [str(scope)],
+                    "root": str(repo),
+                }
+            )["data"]
+
+        # A new file that cannot be read does not stop the others
+        plan = sync([top, deep, repo / "gone.py"], repo)
+        assert plan["added"] == [str(deep), str(top)]
+        assert plan["failed"] == [str(repo / "gone.py")]
+
+        top.write_text("print('changed')")
+        plan = sync([top], repo / "*")
+        assert plan["updated"] == [str(top)]
+        assert plan["deleted"] == []
+        assert str(deep) in service.manifests["repository_content"].entries()
+    finally:
+        service.cleanup()
+
+
+def test_dry_run_reports_unreadable_files_as_failed(tmp_path):
+    """Test that a file vanishing before a dry run does not abort it."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    kept, gone = repo / "kept.py", repo / "gone.py"
+    kept.write_text("print('kept')")
+    gone.write_text("print('gone')")
+    service = VectorStoreService(tmp_path / "test.sock", tmp_path / "runtime")
+    try:
+        service.initialize_store(
+            {
+                "collection_name": "repository_content",
+                "db_path": str(tmp_path / "vector_db"),
+                "embedding_model": HASHING_MODEL_NAME,
+            }
+        )
+        params = {
+            "collection_name": "repository_content",
+            "paths": [str(kept), str(gone)],
+            "scopes": [str(repo)],
+            "root": str(repo),
+        }
+        service.handle_sync(params)
+        gone.unlink()
+
+        plan = service.handle_sync({**params, "dry_run": True})["data"]
+
+        assert plan["failed"] == [str(gone)]
+        assert plan["unchanged"] == 1
+        assert plan["updated"] == []
+    finally:
+        service.cleanup()
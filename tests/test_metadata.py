@@ -0,0 +1,200 @@
+"""Unit tests for issue metadata generation and extraction."""
+
+import json
+
+from jiragen.cli import generate as generate_cli
+from jiragen.core import metadata
+from jiragen.core.generator import LiteLLMClient, LLMConfig
+from jiragen.core.metadata import (
+    GeneratedIssue,
+    IssueMetadataExtractor,
+    IssuePriority,
+    IssueType,
+    generate_with_metadata,
+)
+from jiragen.core.predictor import MetadataPrediction
+from jiragen.core.routing import ModelRouter, StageRoute
+
+METADATA = {
+    "issue_type": "Story",
+    "priority": "Medium",
+    "labels": ["frontend"],
+    "story_points": 3,
+    "components": ["UI"],
+}
+
+
+class FakeGenerator:
+    """Generator returning canned responses and recording its calls."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.timings = {}
+        self.config = type(
+            "Config",
+            (),
+            {
+                "llm_config": LLMConfig(model="openai/test"),
+                "response_cache": None,
+                "metadata_predictor": None,
+                "metadata_confidence_threshold": 0.6,
+                "router": None,
+            },
+        )
+
+    def generate(self, message, response_format=None, deadline=None):
+        self.calls.append(response_format)
+        return self.responses.pop(0)
+
+
+def test_combined_response_yields_content_and_metadata(monkeypatch):
+    """Test that structured models need a single call."""
+    monkeypatch.setattr(metadata, "supports_structured_output", lambda m: True)
+    generator = FakeGenerator(
+        [json.dumps({"content": "## Summary\nDark mode", **METADATA})]
+    )
+
+    content, issue_metadata = generate_with_metadata(generator, "dark mode")
+
+    assert generator.calls == [GeneratedIssue]
+    assert content == "## Summary\nDark mode"
+    assert issue_metadata.issue_type == IssueType.STORY
+    assert issue_metadata.components == ["UI"]
+    assert issue_metadata.description == content
+
+
+def test_falls_back_to_separate_extraction(monkeypatch):
+    """Test that other models get the content and metadata in two calls."""
+    monkeypatch.setattr(
+        metadata, "supports_structured_output", lambda m: False
+    )
+    prompts = []
+    monkeypatch.setattr(
+        LiteLLMClient,
+        "generate",
+        lambda self, prompt, **kwargs: prompts.append(prompt)
+        or json.dumps(METADATA),
+    )
+    generator = FakeGenerator(["## Summary\nDark mode"])
+
+    content, issue_metadata = generate_with_metadata(generator, "dark mode")
+
+    assert generator.calls == [None]
+    assert content == "## Summary\nDark mode"
+    assert issue_metadata.labels == ["frontend"]
+    assert "metadata_ms" in generator.timings
+    assert "## Summary\nDark mode" in prompts[0]
+
+
+def test_invalid_combined_response_falls_back(monkeypatch):
+    """Test that an unusable structured response is not fatal."""
+    monkeypatch.setattr(metadata, "supports_structured_output", lambda m: True)
+    monkeypatch.setattr(
+        LiteLLMClient,
+        "generate",
+        lambda self, prompt, **kwargs: json.dumps(METADATA),
+    )
+    invalid = json.dumps({"content": "Dark mode", "priority": "Urgent!"})
+    generator = FakeGenerator([invalid, '{"content": "cut \\"short'])
+
+    for expected in ("Dark mode", 'cut "short'):
+        content, issue_metadata = generate_with_metadata(
+            generator, "dark mode"
+        )
+
+        # The content is kept, only the metadata is asked for again
+        assert generator.calls.pop() == GeneratedIssue
+        assert generator.calls == []
+        assert content == expected
+        assert issue_metadata.story_points == 3
+
+
+def test_metadata_models_without_schema_support_get_the_prompt_only(
+    monkeypatch,
+):
+    """Test that response_format is only sent to models supporting it."""
+    monkeypatch.setattr(
+        metadata, "supports_structured_output", lambda m: m == "openai/test"
+    )
+    formats = []
+
+    def generate(self, prompt, response_format=None, **kwargs):
+        formats.append((self.config.model, response_format))
+        if self.config.model == "openai/test":
+            raise RuntimeError("LiteLLM API request failed: overloaded")
+        return json.dumps(METADATA)
+
+    monkeypatch.setattr(LiteLLMClient, "generate", generate)
+    router = ModelRouter(
+        {"metadata": StageRoute(models=["openai/test", "ollama/local"])}
+    )
+    extractor = IssueMetadataExtractor(
+        LLMConfig(model="openai/test"), router=router
+    )
+
+    assert "Story" in extractor.extract_metadata("Add dark mode")
+    assert formats == [
+        ("openai/test", metadata.IssueMetadata),
+        ("ollama/local", None),
+    ]
+
+
+def test_analysis_prompt_contains_the_content():
+    """Test that the extractor sends the issue content to the model."""
+    extractor = IssueMetadataExtractor(LLMConfig(model="openai/test"))
+    prompt = extractor._create_analysis_prompt("Add dark mode to settings")
+    assert "Add dark mode to settings" in prompt
+    assert "{content}" not in prompt
+
+
+def test_cli_extraction_shares_the_run_deadline(monkeypatch):
+    """Test that metadata extracted after generation uses its deadline."""
+    deadlines = []
+    monkeypatch.setattr(
+        IssueMetadataExtractor,
+        "extract_metadata",
+        lambda self, content, deadline=None: deadlines.append(deadline)
+        or json.dumps(METADATA),
+    )
+    generator = FakeGenerator([])
+    generator.deadline = object()
+
+    issue_metadata = generate_cli._extract_and_display_metadata(
+        "Dark mode", generator
+    )
+
+    assert deadlines == [generator.deadline]
+    assert issue_metadata.priority == "Medium"
+
+
+def test_confident_predictions_are_merged_as_validated_metadata(monkeypatch):
+    """Test that predicted values override the LLM with enum types."""
+    monkeypatch.setattr(
+        LiteLLMClient,
+        "generate",
+        lambda self, prompt, **kwargs: json.dumps(METADATA),
+    )
+
+    class FakePredictor:
+        def predict(self, content):
+            return MetadataPrediction(
+                values={
+                    "issue_type": "Bug",
+                    "priority": "High",
+                    "labels": ["backend"],
+                },
+                confidence={"issue_type": 0.9, "priority": 0.9, "labels": 0.3},
+                neighbors=5,
+            )
+
+    extractor = IssueMetadataExtractor(
+        LLMConfig(model="openai/test"), predictor=FakePredictor()
+    )
+
+    issue_metadata = extractor.extract_metadata("Fix the login crash")
+
+    assert issue_metadata.issue_type is IssueType.BUG
+    assert issue_metadata.priority is IssuePriority.HIGH
+    assert issue_metadata.labels == ["frontend"]
+    assert issue_metadata.model_dump(mode="json")["issue_type"] == "Bug"
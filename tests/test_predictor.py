@@ -0,0 +1,180 @@
+"""Unit tests for local metadata prediction."""
+
+import json
+
+from jiragen.core.generator import LiteLLMClient, LLMConfig
+from jiragen.core.metadata import (
+    IssueMetadata,
+    IssueMetadataExtractor,
+    IssuePriority,
+    IssueType,
+)
+from jiragen.core.predictor import MetadataPredictor
+
+
+def _ticket(distance, **fields):
+    return {"content": "", "metadata": fields, "distance": distance}
+
+
+class FakeStore:
+    """Store returning canned neighbors and recording the filters used."""
+
+    def __init__(self, neighbors):
+        self.neighbors = neighbors
+        self.where = None
+        self.full_document = None
+
+    def query_similar(
+        self,
+        text,
+        n_results=5,
+        embedding=None,
+        where=None,
+        full_document=False,
+    ):
+        self.where = where
+        self.full_document = full_document
+        return self.neighbors[:n_results]
+
+
+AGREEING = [
+    _ticket(
+        0.1,
+        issue_type="Bug",
+        priority="High",
+        labels=["backend"],
+        components=["API"],
+        story_points=3.0,
+    ),
+    _ticket(
+        0.12,
+        issue_type="Bug",
+        priority="High",
+        labels=["backend"],
+        components=["API"],
+        story_points=3.0,
+    ),
+    _ticket(
+        0.15,
+        issue_type="Bug",
+        priority="High",
+        labels=["backend", "urgent"],
+        components=["API"],
+        story_points=3.0,
+    ),
+]
+
+
+def test_neighbors_vote_weighted_by_distance():
+    """Test that the closest tickets outweigh a larger, distant group."""
+    store = FakeStore(
+        [
+            _ticket(0.1, issue_type="Story", priority="Medium"),
+            _ticket(0.1, issue_type="Story", priority="Medium"),
+            _ticket(0.9, issue_type="Bug", priority="Low"),
+            _ticket(0.9, issue_type="Bug", priority="Low"),
+            _ticket(0.9, issue_type="Bug", priority="Low"),
+        ]
+    )
+    prediction = MetadataPredictor(store, k=5).predict("Add dark mode")
+
+    assert prediction.values["issue_type"] == "Story"
+    assert prediction.values["priority"] == "Medium"
+    assert prediction.confidence["issue_type"] > 0.99
+    assert prediction.neighbors == 5
+    assert store.where == {"type": {"$in": ["ticket", "epic"]}}
+
+
+def test_multi_valued_fields_keep_the_majority_values():
+    """Test that rare labels are dropped and lower the confidence."""
+    prediction = MetadataPredictor(FakeStore(AGREEING)).predict("API crash")
+
+    assert prediction.values["labels"] == ["backend"]
+    assert prediction.values["components"] == ["API"]
+    assert prediction.values["story_points"] == 3
+    assert prediction.confidence["components"] == 1.0
+    assert 0.5 < prediction.confidence["labels"] < 1.0
+
+
+def test_missing_and_invalid_values_are_left_out():
+    """Test that unknown types are ignored and absent fields stay empty."""
+    store = FakeStore(
+        [
+            _ticket(0.1, issue_type="Incident", priority="High"),
+            _ticket(0.2, issue_type="Task", priority="High"),
+        ]
+    )
+    prediction = MetadataPredictor(store).predict("Rotate keys")
+
+    assert prediction.values["issue_type"] == "Task"
+    assert prediction.values["story_points"] is None
+    assert prediction.values["labels"] == []
+    assert prediction.uncertain_fields(0.6) == []
+
+
+def test_excluded_key_is_filtered_out():
+    """Test that evaluation can leave the ticket itself out of the vote."""
+    store = FakeStore(AGREEING)
+    MetadataPredictor(store).predict("API crash", exclude_key="PROJ-1")
+    # Neighbors are only voted on, their snippets are never needed
+    assert store.full_document is True
+    assert store.where == {
+        "$and": [
+            {"type": {"$in": ["ticket", "epic"]}},
+            {"key": {"$ne": "PROJ-1"}},
+        ]
+    }
+
+
+def test_confident_prediction_skips_the_llm(monkeypatch):
+    """Test that the LLM is not called when every field is confident."""
+
+    def fail(self, prompt, **kwargs):
+        raise AssertionError("LLM should not be called")
+
+    monkeypatch.setattr(LiteLLMClient, "generate", fail)
+    extractor = IssueMetadataExtractor(
+        LLMConfig(model="openai/test"),
+        predictor=MetadataPredictor(FakeStore(AGREEING)),
+    )
+
+    metadata = extractor.extract_metadata("The API crashes")
+
+    assert isinstance(metadata, IssueMetadata)
+    assert metadata.issue_type == IssueType.BUG
+    assert metadata.priority == IssuePriority.HIGH
+    assert metadata.components == ["API"]
+
+
+def test_uncertain_prediction_asks_the_llm(monkeypatch):
+    """Test that the LLM fills uncertain fields and confident ones win."""
+    calls = []
+    monkeypatch.setattr(
+        LiteLLMClient,
+        "generate",
+        lambda self, prompt, **kwargs: calls.append(prompt)
+        or json.dumps(
+            {
+                "issue_type": "Story",
+                "priority": "Low",
+                "labels": [],
+                "story_points": 5,
+            }
+        ),
+    )
+    store = FakeStore(
+        [
+            _ticket(0.1, issue_type="Bug", priority="High"),
+            _ticket(0.1, issue_type="Bug", priority="Low"),
+        ]
+    )
+    extractor = IssueMetadataExtractor(
+        LLMConfig(model="openai/test"), predictor=MetadataPredictor(store)
+    )
+
+    metadata = extractor.extract_metadata("The page crashes")
+
+    assert len(calls) == 1
+    assert metadata.issue_type == IssueType.BUG
+    assert metadata.priority == IssuePriority.LOW
+    assert metadata.story_points == 5
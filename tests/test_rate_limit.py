@@ -0,0 +1,70 @@
+"""Unit tests for the adaptive JIRA rate limiter."""
+
+from types import SimpleNamespace
+
+import pytest
+from jira.exceptions import JIRAError
+
+from jiragen.services import rate_limit
+from jiragen.services.rate_limit import AdaptiveRateLimiter
+
+
+def _rate_limited(retry_after="2"):
+    return JIRAError(
+        status_code=429,
+        response=SimpleNamespace(headers={"retry-after": retry_after}),
+    )
+
+
+def test_rate_limit_pauses_and_slows_down(monkeypatch):
+    """Test that a 429 honours Retry-After and spaces out requests."""
+    sleeps = []
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+    responses = [_rate_limited(), "page"]
+
+    def search():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    limiter = AdaptiveRateLimiter()
+
+    assert limiter.call(search, label="tickets") == "page"
+    assert limiter.stats("tickets") == {
+        "requests": 2,
+        "throttled": 1,
+        "retries": 1,
+        "bytes": 0,
+    }
+    assert sleeps and sleeps[0] == pytest.approx(2.0, abs=0.1)
+    assert limiter.interval > 0
+
+    for _ in range(100):
+        limiter.call(lambda: None, label="epics")
+    assert limiter.interval == 0.0
+    assert limiter.stats("epics")["throttled"] == 0
+
+
+def test_permanent_errors_are_not_retried(monkeypatch):
+    """Test that client errors other than 429 surface immediately."""
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+    calls = []
+
+    def search():
+        calls.append(1)
+        raise JIRAError(status_code=400, text="Invalid JQL")
+
+    limiter = AdaptiveRateLimiter(max_retries=3)
+
+    with pytest.raises(JIRAError, match="Invalid JQL"):
+        limiter.call(search)
+    assert len(calls) == 1
+
+    def unavailable():
+        calls.append(1)
+        raise JIRAError(status_code=503)
+
+    with pytest.raises(JIRAError):
+        limiter.call(unavailable)
+    assert len(calls) == 1 + 4
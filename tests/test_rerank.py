@@ -0,0 +1,66 @@
+"""Unit tests for the cross-encoder re-ranking stage."""
+
+import time
+
+from jiragen.services.rerank import CrossEncoderReranker
+
+
+class FakeCrossEncoder:
+    """Scores a pair by how often the query appears in the document."""
+
+    def __init__(self):
+        self.pairs_scored = 0
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=None):
+        self.pairs_scored += len(pairs)
+        return [doc.count(query) for query, doc in pairs]
+
+
+def _reranker(batch_size=2):
+    reranker = CrossEncoderReranker(batch_size=batch_size)
+    reranker._model = FakeCrossEncoder()
+    return reranker
+
+
+def test_rerank_orders_by_score_and_caches():
+    """Test that candidates are re-ordered and scores are reused."""
+    reranker = _reranker()
+    candidates = [("a", "x"), ("b", "foo foo"), ("c", "foo")]
+
+    ranked, stats = reranker.rerank("foo", candidates)
+    assert ranked == ["b", "c", "a"]
+    assert stats == {"scored": 3, "cached": 0, "skipped": 0}
+
+    ranked, stats = reranker.rerank("foo", candidates)
+    assert ranked == ["b", "c", "a"]
+    assert stats["cached"] == 3
+    assert reranker._model.pairs_scored == 3
+
+
+def test_rerank_respects_budget():
+    """Test that unscored candidates keep their order once the budget is spent."""
+    reranker = _reranker()
+    candidates = [("a", "x"), ("b", "y"), ("c", "foo")]
+
+    ranked, stats = reranker.rerank("foo", candidates, budget_ms=1e-9)
+    assert ranked == ["a", "b", "c"]
+    assert stats["skipped"] == 3
+
+
+def test_model_loading_does_not_use_the_budget(monkeypatch):
+    """Test that the first request scores candidates despite a slow load."""
+    reranker = CrossEncoderReranker(batch_size=2)
+    model = FakeCrossEncoder()
+
+    def load():
+        time.sleep(0.05)
+        reranker._model = model
+        return model
+
+    monkeypatch.setattr(reranker, "_get_model", load)
+
+    ranked, stats = reranker.rerank(
+        "foo", [("a", "x"), ("b", "foo")], budget_ms=20
+    )
+    assert ranked == ["b", "a"]
+    assert stats["scored"] == 2
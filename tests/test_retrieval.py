@@ -0,0 +1,21 @@
+"""Unit tests for diversity-aware candidate selection."""
+
+import numpy as np
+
+from jiragen.services.retrieval import mmr_select, suppress_near_duplicates
+
+
+def test_suppress_near_duplicates_keeps_best_ranked():
+    """Test that only the first of a group of near-identical vectors is kept."""
+    embeddings = np.array(
+        [[1.0, 0.0], [0.999, 0.01], [0.0, 1.0], [1.0, 0.001]]
+    )
+    assert suppress_near_duplicates(embeddings, 0.99) == [0, 2]
+
+
+def test_mmr_prefers_diverse_candidates():
+    """Test that MMR skips a duplicate in favour of a new direction."""
+    query = np.array([1.0, 0.05])
+    embeddings = np.array([[1.0, 0.1], [1.0, 0.11], [0.6, 0.8]])
+    assert mmr_select(query, embeddings, k=2, lambda_mult=0.3) == [0, 2]
+    assert set(mmr_select(query, embeddings, k=2, lambda_mult=1.0)) == {0, 1}
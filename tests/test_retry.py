@@ -0,0 +1,80 @@
+"""Unit tests for LLM retries, deadlines and client sharing."""
+
+from types import SimpleNamespace
+
+import httpx
+import litellm
+import pytest
+
+from jiragen.core import generator
+from jiragen.core.generator import LiteLLMClient, LLMConfig, get_llm_client
+from jiragen.core.retry import Deadline, DeadlineExceeded
+
+
+def _server_error(status=503):
+    response = httpx.Response(
+        status, request=httpx.Request("POST", "https://llm.example")
+    )
+    return litellm.ServiceUnavailableError(
+        "overloaded", llm_provider="openai", model="test", response=response
+    )
+
+
+def _flaky_completion(failures, calls):
+    def completion(messages, timeout=None, **params):
+        calls.append(timeout)
+        if len(calls) <= failures:
+            raise _server_error()
+        message = SimpleNamespace(content="ticket")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    return completion
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    """Test that 5xx responses are retried with the request timeout."""
+    calls, sleeps = [], []
+    monkeypatch.setattr(generator, "completion", _flaky_completion(2, calls))
+    monkeypatch.setattr(generator.time, "sleep", sleeps.append)
+    client = LiteLLMClient(LLMConfig(model="openai/test", timeout=5))
+
+    assert client.generate("prompt") == "ticket"
+    assert calls == [5, 5, 5]
+    assert len(sleeps) == 2 and all(delay > 0 for delay in sleeps)
+
+
+def test_retries_stop_after_max_retries(monkeypatch):
+    """Test that persistent errors surface once the retries are used up."""
+    calls = []
+    monkeypatch.setattr(generator, "completion", _flaky_completion(9, calls))
+    monkeypatch.setattr(generator.time, "sleep", lambda delay: None)
+    client = LiteLLMClient(LLMConfig(model="openai/test", max_retries=1))
+
+    with pytest.raises(RuntimeError, match="overloaded"):
+        client.generate("prompt")
+    assert len(calls) == 2
+
+
+def test_deadline_caps_timeouts_and_stops_calls(monkeypatch):
+    """Test that calls sharing a deadline never run past it."""
+    calls = []
+    monkeypatch.setattr(generator, "completion", _flaky_completion(0, calls))
+    client = LiteLLMClient(LLMConfig(model="openai/test", timeout=60))
+
+    client.generate("prompt", deadline=Deadline(10))
+    assert 9 < calls[0] <= 10
+
+    expired = Deadline(0)
+    with pytest.raises(RuntimeError) as error:
+        client.generate("prompt", deadline=expired)
+    assert isinstance(error.value.__cause__, DeadlineExceeded)
+    assert len(calls) == 1
+
+
+def test_clients_are_shared_per_configuration():
+    """Test that equal configurations get the same client."""
+    config = LLMConfig(model="openai/test")
+    client = get_llm_client(config)
+    assert get_llm_client(LLMConfig(model="openai/test")) is client
+    assert get_llm_client(LLMConfig(model="openai/other")) is not client
+    assert litellm.client_session is not None
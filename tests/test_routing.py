@@ -0,0 +1,116 @@
+"""Unit tests for per-stage model routing."""
+
+from jiragen.core import ledger, routing
+from jiragen.core.config import ConfigManager
+from jiragen.core.generator import (
+    LiteLLMClient,
+    LLMConfig,
+    stage_llm_configs,
+)
+from jiragen.core.metadata import IssueMetadataExtractor
+from jiragen.core.routing import ModelRouter, StageRoute
+
+ROUTES = {
+    "generate": StageRoute(
+        models=["openai/slow", "openai/fast"], budget_ms=1000
+    ),
+    "metadata": StageRoute(models=["openai/small", "ollama/local"]),
+}
+
+
+def test_slow_model_moves_behind_its_fallback(monkeypatch, tmp_path):
+    """Test that a p95 over budget in the ledger picks the next model."""
+    monkeypatch.setattr(ledger, "_ledger", ledger.get_ledger())
+    book = ledger.configure_ledger("generate", path=tmp_path / "l.jsonl")
+    for latency in (800, 900, 3000, 950):
+        book.record(
+            "llm", stage="generate", model="openai/slow", latency_ms=latency
+        )
+    book.record("llm", stage="metadata", model="openai/fast", latency_ms=9e4)
+    router = ModelRouter(ROUTES)
+
+    assert router.p95("generate", "openai/slow") > 1000
+    assert router.p95("generate", "openai/fast") is None
+    assert router.candidates("generate") == ["openai/fast", "openai/slow"]
+    # Without a budget the chain order is kept
+    assert router.select("metadata") == "openai/small"
+
+    for _ in range(20):
+        router.observe("generate", "openai/slow", 100.0)
+    router.observe("generate", "openai/slow", 5000.0, cache_hit=True)
+    assert router.select("generate") == "openai/slow"
+
+
+def test_slow_model_is_probed_and_recovers(monkeypatch, tmp_path):
+    """Test that a demoted model is tried again and promoted when fast."""
+    monkeypatch.setattr(ledger, "_ledger", ledger.get_ledger())
+    ledger.configure_ledger("generate", path=tmp_path / "l.jsonl")
+    router = ModelRouter(ROUTES)
+    for _ in range(3):
+        router.observe("generate", "openai/slow", 5000.0)
+    assert router.candidates("generate") == ["openai/fast", "openai/slow"]
+
+    monkeypatch.setattr(routing, "PROBE_SECONDS", 0)
+    assert router.select("generate") == "openai/slow"
+    assert router.candidates("generate")[0] == "openai/slow"
+
+    router.observe("generate", "openai/slow", 500.0)
+    monkeypatch.setattr(routing, "PROBE_SECONDS", 3600)
+    assert router.p95("generate", "openai/slow") is None
+    assert router.candidates("generate") == ["openai/slow", "openai/fast"]
+
+
+def test_fallback_configs_keep_settings_of_their_provider():
+    """Test that endpoints are only kept for the configured provider."""
+    config = LLMConfig(
+        model="openai/small", api_base="https://proxy", temperature=0.2
+    )
+    fast, local = stage_llm_configs(config, ModelRouter(ROUTES), "metadata")
+
+    assert fast is config
+    assert local.model == "ollama/local"
+    assert local.api_base == "http://localhost:11434"
+    assert local.temperature == 0.2
+    assert stage_llm_configs(config, None, "metadata") == [config]
+
+
+def test_metadata_falls_back_on_errors(monkeypatch):
+    """Test that a failing model hands the call to the next one."""
+    calls = []
+
+    def generate(self, prompt, **kwargs):
+        calls.append((self.config.model, kwargs["stage"]))
+        if self.config.model == "openai/small":
+            raise RuntimeError("LiteLLM API request failed: overloaded")
+        return '{"issue_type": "Bug", "priority": "High"}'
+
+    monkeypatch.setattr(LiteLLMClient, "generate", generate)
+    extractor = IssueMetadataExtractor(
+        LLMConfig(model="openai/small"), router=ModelRouter(ROUTES)
+    )
+
+    assert "Bug" in extractor.extract_metadata("Crash on save")
+    assert calls == [
+        ("openai/small", "metadata"),
+        ("ollama/local", "metadata"),
+    ]
+    assert extractor.model == "ollama/local"
+
+
+def test_routes_from_config(tmp_path):
+    """Test that stage models default to the configured model."""
+    manager = ConfigManager(tmp_path / "config.ini")
+    manager.update_config(
+        "llm",
+        model="openai/gpt-4o",
+        metadata_model="openai/gpt-4o-mini",
+        generate_fallback="anthropic/claude, openai/gpt-4o",
+        generate_budget_ms="4000",
+    )
+
+    routes = manager.get_routes()
+
+    assert routes["generate"].models == ["openai/gpt-4o", "anthropic/claude"]
+    assert routes["generate"].budget_ms == 4000
+    assert routes["metadata"].models == ["openai/gpt-4o-mini"]
+    assert routes["metadata"].budget_ms is None
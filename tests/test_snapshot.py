@@ -0,0 +1,123 @@
+"""Unit tests for vector store snapshot bundles."""
+
+import numpy as np
+import pytest
+
+from jiragen.services.embeddings import HASHING_MODEL_NAME
+from jiragen.services.snapshot import read_snapshot, write_snapshot
+from jiragen.services.vector_store import VectorStoreService
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that a snapshot is read back with identical content."""
+    embeddings = np.random.default_rng(0).random((3, 8), dtype=np.float32)
+    header = {
+        "collection_name": "codebase_content",
+        "embedding_model": "all-MiniLM-L6-v2",
+        "source_commit": "abc123",
+        "ids": ["a", "b", "c"],
+        "metadatas": [{"file_path": p} for p in "abc"],
+        "documents": ["first", "second", "third"],
+    }
+    path = tmp_path / "index.jgsnap"
+    write_snapshot(path, header, embeddings)
+
+    loaded_header, loaded = read_snapshot(path)
+
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, embeddings)
+    assert loaded_header["ids"] == header["ids"]
+    assert loaded_header["source_commit"] == "abc123"
+    assert loaded_header["count"] == 3
+    assert loaded_header["dim"] == 8
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Test that arbitrary files are not accepted as snapshots."""
+    path = tmp_path / "not_a_snapshot.bin"
+    path.write_bytes(b"hello world, this is not a snapshot")
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+
+
+def _service(tmp_path, name, **settings):
+    """Return a service with an empty collection, as on its own machine."""
+    service = VectorStoreService(
+        tmp_path / f"{name}.sock", tmp_path / f"{name}_runtime"
+    )
+    service.initialize_store(
+        {
+            "collection_name": "repository_content",
+            "db_path": str(tmp_path / f"{name}_db"),
+            "embedding_model": HASHING_MODEL_NAME,
+            **settings,
+        }
+    )
+    return service
+
+
+def test_snapshot_paths_follow_the_repository_root(tmp_path):
+    """Test that a bundle from one checkout matches the files of another."""
+    params = {"collection_name": "repository_content"}
+    ci_root, dev_root = tmp_path / "ci", tmp_path / "dev"
+    for root in (ci_root, dev_root):
+        (root / "src").mkdir(parents=True)
+        (root / "src" / "app.py").write_text("print('app')")
+    dev_file = str(dev_root / "src" / "app.py")
+    bundle = tmp_path / "index.jgsnap"
+
+    ci = _service(tmp_path, "ci")
+    try:
+        ci.handle_add_files(
+            {
+                **params,
+                "paths": [str(ci_root / "src" / "app.py")],
+                "root": str(ci_root),
+            }
+        )
+        ci.handle_export_snapshot(
+            {**params, "path": str(bundle), "root": str(ci_root)}
+        )
+    finally:
+        ci.cleanup()
+
+    header, _ = read_snapshot(bundle)
+    assert header["ids"] == ["src/app.py"]
+    assert header["metadatas"][0]["file_path"] == "src/app.py"
+
+    dev = _service(tmp_path, "dev")
+    try:
+        dev.handle_import_snapshot(
+            {**params, "path": str(bundle), "root": str(dev_root)}
+        )
+
+        assert list(dev.manifests["repository_content"].entries()) == [
+            dev_file
+        ]
+        stored = dev.collections["repository_content"].get()
+        assert stored["ids"] == [dev_file]
+        assert stored["metadatas"][0]["file_path"] == dev_file
+    finally:
+        dev.cleanup()
+
+
+def test_replacing_import_keeps_hnsw_settings(tmp_path):
+    """Test that a replaced collection is rebuilt with the configured HNSW."""
+    params = {"collection_name": "repository_content"}
+    path = tmp_path / "app.py"
+    path.write_text("print('app')")
+    bundle = tmp_path / "index.jgsnap"
+    service = _service(tmp_path, "dev", hnsw_m=24, hnsw_construction_ef=64)
+    try:
+        service.handle_add_files({**params, "paths": [str(path)]})
+        service.handle_export_snapshot({**params, "path": str(bundle)})
+
+        service.handle_import_snapshot(
+            {**params, "path": str(bundle), "replace": True}
+        )
+
+        metadata = service.collections["repository_content"].metadata
+        assert metadata["hnsw:M"] == 24
+        assert metadata["hnsw:construction_ef"] == 64
+    finally:
+        service.cleanup()
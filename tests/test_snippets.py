@@ -0,0 +1,92 @@
+"""Unit tests for extractive snippet selection."""
+
+from jiragen.services.embeddings import HASHING_MODEL_NAME
+from jiragen.services.snippets import (
+    lexical_scores,
+    line_windows,
+    select_snippets,
+)
+from jiragen.services.vector_store import VectorStoreService
+
+
+def _source(lines, match_at=()):
+    return "".join(
+        "def parse_invoice_total(invoice):\n"
+        if i in match_at
+        else f"value_{i} = compute({i})\n"
+        for i in range(lines)
+    )
+
+
+def test_windows_overlap_and_cover_the_tail():
+    """Test that windows overlap by half and the last lines are included."""
+    windows = line_windows(_source(100), window_lines=40)
+    assert [(start, end) for start, end, _ in windows] == [
+        (1, 40),
+        (21, 60),
+        (41, 80),
+        (61, 100),
+    ]
+    assert line_windows("one\ntwo\n", window_lines=40) == [
+        (1, 2, "one\ntwo\n")
+    ]
+
+
+def test_best_windows_are_selected_without_overlap():
+    """Test that matching windows win and overlapping ones are skipped."""
+    windows = line_windows(_source(200, match_at={150}), window_lines=20)
+    scores = lexical_scores("invoice total", [text for _, _, text in windows])
+
+    snippets = select_snippets(windows, scores, max_snippets=3)
+
+    assert len(snippets) == 1
+    assert snippets[0]["start_line"] <= 151 <= snippets[0]["end_line"]
+    assert "parse_invoice_total" in snippets[0]["content"]
+
+
+def test_no_match_keeps_the_head_of_the_document():
+    """Test that the first window is kept when nothing matches the query."""
+    windows = line_windows(_source(100), window_lines=20)
+    scores = lexical_scores("dark mode", [text for _, _, text in windows])
+    assert [
+        (s["start_line"], s["end_line"])
+        for s in select_snippets(windows, scores)
+    ] == [(1, 20)]
+
+
+def test_service_returns_snippets_unless_full_document(tmp_path):
+    """Test that query results carry line ranges instead of whole files."""
+    path = tmp_path / "repo" / "billing.py"
+    path.parent.mkdir()
+    path.write_text(_source(300, match_at={10, 250}))
+    service = VectorStoreService(tmp_path / "test.sock", tmp_path / "runtime")
+    try:
+        service.initialize_store(
+            {
+                "collection_name": "repository_content",
+                "db_path": str(tmp_path / "vector_db"),
+                "embedding_model": HASHING_MODEL_NAME,
+            }
+        )
+        service.handle_add_files(
+            {
+                "collection_name": "repository_content",
+                "paths": [str(path)],
+                "root": str(tmp_path / "repo"),
+            }
+        )
+        query = {"text": "parse invoice total", "snippet_lines": 20}
+
+        doc = service.handle_query_similar(query)["data"][0]
+        full = service.handle_query_similar({**query, "full_document": True})[
+            "data"
+        ][0]
+
+        assert full["content"] == path.read_text()
+        assert "snippets" not in full
+        assert doc["total_lines"] == 300
+        assert len(doc["snippets"]) == 2
+        assert doc["content"].count("parse_invoice_total") == 2
+        assert len(doc["content"].splitlines()) == 40
+    finally:
+        service.cleanup()
@@ -0,0 +1,36 @@
+"""Unit tests for HNSW tuning helpers."""
+
+import numpy as np
+
+from jiragen.services.tuning import exact_neighbors, hnsw_metadata, tune_hnsw
+
+
+def test_hnsw_metadata_skips_unset_values():
+    """Test that only configured settings become collection metadata."""
+    assert hnsw_metadata(
+        {"hnsw_m": 32, "hnsw_search_ef": None, "collection_name": "x"}
+    ) == {"hnsw:M": 32}
+
+
+def test_exact_neighbors_orders_by_distance():
+    """Test the brute-force ground truth."""
+    embeddings = np.array([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0]])
+    queries = np.array([[0.9, 0.0]])
+    assert exact_neighbors(embeddings, queries, 2).tolist() == [[1, 0]]
+
+
+def test_tune_hnsw_reports_each_setting():
+    """Test that each combination is measured against exact search."""
+    embeddings = np.random.default_rng(0).normal(size=(300, 8))
+    rows = tune_hnsw(
+        embeddings,
+        m_values=(8,),
+        construction_ef_values=(100,),
+        search_ef_values=(10, 100),
+        k=5,
+        n_queries=20,
+    )
+    assert [row["hnsw_search_ef"] for row in rows] == [10, 100]
+    assert all(0.0 <= row["recall"] <= 1.0 for row in rows)
+    assert rows[1]["recall"] > 0.9
+    assert all(row["size"] > 0 for row in rows)
@@ -0,0 +1,64 @@
+"""Unit tests for the gitignore-aware directory walker."""
+
+from pathlib import Path
+
+import pytest
+
+from jiragen.utils.walker import iter_files
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a small repository with nested ignore files."""
+    root = tmp_path.resolve()
+    files = [
+        "README.md",
+        "src/main.py",
+        "src/app.log",
+        "src/generated/client.py",
+        "src/generated/keep.py",
+        "node_modules/pkg/index.js",
+        "build/out.txt",
+        "docs/guide.md",
+    ]
+    for rel in files:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+
+    (root / ".gitignore").write_text("node_modules/\n*.log\n")
+    (root / "src" / "generated" / ".gitignore").write_text("*\n!keep.py\n")
+    (root / ".git" / "info").mkdir(parents=True)
+    (root / ".git" / "info" / "exclude").write_text("build/\n")
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    return root
+
+
+def _rel(root: Path, paths) -> list:
+    return sorted(p.relative_to(root).as_posix() for p in paths)
+
+
+def test_walker_honors_nested_ignores(repo):
+    """Test that root, nested and info/exclude patterns are all applied."""
+    assert _rel(repo, iter_files(repo, ["."])) == [
+        "README.md",
+        "docs/guide.md",
+        "src/generated/keep.py",
+        "src/main.py",
+    ]
+
+
+def test_walker_deduplicates_overlapping_paths(repo):
+    """Test that overlapping arguments yield each file once."""
+    paths = list(iter_files(repo, [".", "src", "src/main.py"]))
+    assert len(paths) == len(set(paths)) == 4
+
+
+def test_walker_top_level_only(repo):
+    """Test that '*' does not descend into subdirectories."""
+    assert _rel(repo, iter_files(repo, ["*"])) == ["README.md"]
+
+
+def test_walker_skips_explicitly_ignored_paths(repo):
+    """Test that ignored files and directories are skipped when named."""
+    assert list(iter_files(repo, ["node_modules", "src/app.log"])) == []